@@ -1,42 +1,241 @@
+use pyo3::buffer::PyBuffer;
 use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyDict, PyString};
 use std::fs::File;
+use std::io::{self, Read};
+use std::path::PathBuf;
 
-/// Parse a `.duc` file path into a Python dict (ExportedDataState).
-#[pyfunction]
-fn parse_duc(py: Python<'_>, path: &str) -> PyResult<PyObject> {
-    let session = duc::session::DucSession::open_path(path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let state = session
-        .read_document_state()
+/// Open a read session from a filesystem path or any object exposing the
+/// buffer protocol (`bytes`, `bytearray`, `memoryview`, `mmap`) and run `read`
+/// on it.
+///
+/// Contiguous buffers are read in place, without copying them into Rust.
+/// Decompression and every SQLite query run with the GIL released; only the
+/// argument extraction needs it.
+fn read_source<T, F>(py: Python<'_>, source: &Bound<'_, PyAny>, read: F) -> PyResult<T>
+where
+    T: Send,
+    F: FnOnce(&duc::session::DucSession) -> duc::parse::ParseResult<T> + Send,
+{
+    let result = if let Ok(buffer) = PyBuffer::<u8>::get(source) {
+        if buffer.is_c_contiguous() {
+            // SAFETY: the buffer is C-contiguous and `buffer` keeps the
+            // exporter's view alive (and its memory pinned) until it is
+            // dropped after `allow_threads` returns.
+            let bytes = unsafe {
+                std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes())
+            };
+            py.allow_threads(|| {
+                duc::session::DucSession::open_reader(bytes).and_then(|session| read(&session))
+            })
+        } else {
+            let bytes = buffer.to_vec(py)?;
+            py.allow_threads(|| {
+                duc::session::DucSession::open_reader(bytes.as_slice())
+                    .and_then(|session| read(&session))
+            })
+        }
+    } else {
+        let path: PathBuf = source.extract().map_err(|_| {
+            pyo3::exceptions::PyTypeError::new_err(
+                "expected a path or a bytes-like object (bytes, memoryview, mmap)",
+            )
+        })?;
+        py.allow_threads(|| {
+            duc::session::DucSession::open_path(path).and_then(|session| read(&session))
+        })
+    };
+    result.map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+}
+
+/// Where the bytes of a streamed external file revision come from.
+enum BlobSource {
+    Path(PathBuf),
+    Reader(PyReader),
+}
+
+/// `std::io::Read` over a Python binary file object (anything with
+/// `read(n) -> bytes`). The GIL is re-acquired for each chunk only.
+struct PyReader(Py<PyAny>);
+
+impl Read for PyReader {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        Python::with_gil(|py| {
+            let chunk = self
+                .0
+                .call_method1(py, "read", (buf.len(),))
+                .map_err(|e| io::Error::new(io::ErrorKind::Other, e.to_string()))?;
+            let chunk = chunk.downcast_bound::<PyBytes>(py).map_err(|_| {
+                io::Error::new(
+                    io::ErrorKind::InvalidData,
+                    "external file stream read() must return bytes",
+                )
+            })?;
+            let bytes = chunk.as_bytes();
+            if bytes.len() > buf.len() {
+                return Err(io::Error::new(
+                    io::ErrorKind::InvalidData,
+                    "external file stream returned more bytes than requested",
+                ));
+            }
+            buf[..bytes.len()].copy_from_slice(bytes);
+            Ok(bytes.len())
+        })
+    }
+}
+
+/// Collect `{revision_id: path | binary file object}` into owned sources.
+fn blob_sources(sources: Option<&Bound<'_, PyDict>>) -> PyResult<Vec<(String, BlobSource)>> {
+    let Some(sources) = sources else {
+        return Ok(Vec::new());
+    };
+    let mut out = Vec::with_capacity(sources.len());
+    for (revision_id, source) in sources.iter() {
+        let revision_id: String = revision_id.extract()?;
+        let source = if source.is_instance_of::<PyString>() {
+            BlobSource::Path(source.extract()?)
+        } else if source.hasattr("read")? {
+            BlobSource::Reader(PyReader(source.unbind()))
+        } else {
+            BlobSource::Path(source.extract().map_err(|_| {
+                pyo3::exceptions::PyTypeError::new_err(format!(
+                    "external file source for {revision_id} must be a path or a binary file object"
+                ))
+            })?)
+        };
+        out.push((revision_id, source));
+    }
+    Ok(out)
+}
+
+/// Build export options from the optional Python keyword arguments.
+fn session_options(
+    compression_level: Option<u32>,
+    chunk_size: Option<usize>,
+    page_size: Option<u32>,
+) -> PyResult<duc::session::DucSessionOptions> {
+    let options = match chunk_size {
+        Some(chunk_size) => duc::session::DucSessionOptions::with_chunk_size(chunk_size),
+        None => Ok(duc::session::DucSessionOptions::default()),
+    };
+    options
+        .and_then(|options| match compression_level {
+            Some(level) => options.compression_level(level),
+            None => Ok(options),
+        })
+        .and_then(|options| match page_size {
+            Some(page_size) => options.page_size(page_size),
+            None => Ok(options),
+        })
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+}
+
+/// Write `state` into a fresh export session, stream `sources` into their
+/// revisions chunk by chunk, and hand the session to `finish`, with the GIL
+/// released (readers re-acquire it per chunk).
+fn export_state<T, F>(
+    py: Python<'_>,
+    data: &Bound<'_, PyAny>,
+    sources: Option<&Bound<'_, PyDict>>,
+    options: duc::session::DucSessionOptions,
+    finish: F,
+) -> PyResult<T>
+where
+    T: Send,
+    F: FnOnce(duc::session::DucSession) -> duc::serialize::SerializeResult<T> + Send,
+{
+    let state: duc::types::ExportedDataState = pythonize::depythonize(data)
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+    let sources = blob_sources(sources)?;
+    py.allow_threads(move || {
+        let mut session = duc::session::DucSession::create_export_session_with_options(options)?;
+        session.write_document_state(&state)?;
+        for (revision_id, source) in sources {
+            match source {
+                BlobSource::Path(path) => {
+                    let mut file = File::open(&path)?;
+                    session.write_external_file_revision_data(&revision_id, &mut file)?;
+                }
+                BlobSource::Reader(mut reader) => {
+                    session.write_external_file_revision_data(&revision_id, &mut reader)?;
+                }
+            }
+        }
+        finish(session)
+    })
+    .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+}
+
+/// Parse a `.duc` file path or bytes-like buffer into a Python dict (ExportedDataState).
+///
+/// `include` / `exclude` select top-level sections by name (e.g. `elements`,
+/// `layers`, `thumbnail`); unselected tables are never queried.
+#[pyfunction]
+#[pyo3(signature = (source, include=None, exclude=None))]
+fn parse_duc(
+    py: Python<'_>,
+    source: &Bound<'_, PyAny>,
+    include: Option<Vec<String>>,
+    exclude: Option<Vec<String>>,
+) -> PyResult<PyObject> {
+    let sections =
+        duc::parse::DocumentSections::from_selection(include.as_deref(), exclude.as_deref())
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+    let state = read_source(py, source, |session| {
+        session.read_document_sections(&sections)
+    })?;
     pythonize::pythonize(py, &state)
         .map(|b| b.unbind())
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
 }
 
 /// Serialize a Python dict (ExportedDataState) directly to a `.duc` output path.
+///
+/// `file_sources` maps revision ids to a path or binary file object whose
+/// bytes are streamed into the file instead of being passed in `filesData`.
+/// `compression_level` (0 = raw SQLite, 1-9 = gzip), `chunk_size` (external
+/// file chunks) and `page_size` (SQLite) default to the session defaults.
 #[pyfunction]
-fn serialize_duc(data: &Bound<'_, pyo3::types::PyAny>, output_path: &str) -> PyResult<()> {
-    let state: duc::types::ExportedDataState = pythonize::depythonize(data)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let mut session = duc::session::DucSession::create_export_session()
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    session
-        .write_document_state(&state)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    session
-        .finish_to_path(output_path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+#[pyo3(signature = (data, output_path, file_sources=None, compression_level=None, chunk_size=None, page_size=None))]
+fn serialize_duc(
+    py: Python<'_>,
+    data: &Bound<'_, pyo3::types::PyAny>,
+    output_path: &str,
+    file_sources: Option<&Bound<'_, PyDict>>,
+    compression_level: Option<u32>,
+    chunk_size: Option<usize>,
+    page_size: Option<u32>,
+) -> PyResult<()> {
+    let options = session_options(compression_level, chunk_size, page_size)?;
+    export_state(py, data, file_sources, options, |session| {
+        session.finish_to_path(output_path)
+    })
+}
+
+/// Serialize a Python dict (ExportedDataState) to in-memory `.duc` bytes.
+#[pyfunction]
+#[pyo3(signature = (data, file_sources=None, compression_level=None, chunk_size=None, page_size=None))]
+fn serialize_duc_to_bytes<'py>(
+    py: Python<'py>,
+    data: &Bound<'py, pyo3::types::PyAny>,
+    file_sources: Option<&Bound<'py, PyDict>>,
+    compression_level: Option<u32>,
+    chunk_size: Option<usize>,
+    page_size: Option<u32>,
+) -> PyResult<Bound<'py, PyBytes>> {
+    let options = session_options(compression_level, chunk_size, page_size)?;
+    let out = export_state(py, data, file_sources, options, |session| {
+        let mut out = Vec::new();
+        session.finish_to_writer(&mut out)?;
+        Ok(out)
+    })?;
+    Ok(PyBytes::new(py, &out))
 }
 
 /// List metadata for all external files without loading data blobs.
 #[pyfunction]
-fn list_external_files(py: Python<'_>, path: &str) -> PyResult<PyObject> {
-    let session = duc::session::DucSession::open_path(path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let meta = session
-        .list_external_files()
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+fn list_external_files(py: Python<'_>, source: &Bound<'_, PyAny>) -> PyResult<PyObject> {
+    let meta = read_source(py, source, |session| session.list_external_files())?;
     pythonize::pythonize(py, &meta)
         .map(|b| b.unbind())
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
@@ -44,43 +243,56 @@ fn list_external_files(py: Python<'_>, path: &str) -> PyResult<PyObject> {
 
 #[pyfunction]
 fn stream_external_file_revision_to_path(
+    py: Python<'_>,
     path: &str,
     revision_id: &str,
     output_path: &str,
 ) -> PyResult<u64> {
-    let session = duc::session::DucSession::open_path(path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let mut out = File::create(output_path)
-        .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
-    session
-        .stream_external_file_revision_to_writer(revision_id, &mut out)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+    py.allow_threads(|| {
+        let session = duc::session::DucSession::open_path(path)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+        let mut out = File::create(output_path)
+            .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
+        session
+            .stream_external_file_revision_to_writer(revision_id, &mut out)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+    })
 }
 
 #[pyfunction]
 fn stream_checkpoint_data_to_path(
+    py: Python<'_>,
     path: &str,
     checkpoint_id: &str,
     output_path: &str,
 ) -> PyResult<u64> {
-    let session = duc::session::DucSession::open_path(path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let mut out = File::create(output_path)
-        .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
-    session
-        .stream_checkpoint_data_to_writer(checkpoint_id, &mut out)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+    py.allow_threads(|| {
+        let session = duc::session::DucSession::open_path(path)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+        let mut out = File::create(output_path)
+            .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
+        session
+            .stream_checkpoint_data_to_writer(checkpoint_id, &mut out)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+    })
 }
 
 #[pyfunction]
-fn stream_delta_changeset_to_path(path: &str, delta_id: &str, output_path: &str) -> PyResult<u64> {
-    let session = duc::session::DucSession::open_path(path)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
-    let mut out = File::create(output_path)
-        .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
-    session
-        .stream_delta_changeset_to_writer(delta_id, &mut out)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+fn stream_delta_changeset_to_path(
+    py: Python<'_>,
+    path: &str,
+    delta_id: &str,
+    output_path: &str,
+) -> PyResult<u64> {
+    py.allow_threads(|| {
+        let session = duc::session::DucSession::open_path(path)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))?;
+        let mut out = File::create(output_path)
+            .map_err(|e| pyo3::exceptions::PyOSError::new_err(format!("{e}")))?;
+        session
+            .stream_delta_changeset_to_writer(delta_id, &mut out)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("{e}")))
+    })
 }
 
 /// Returns the current DUC schema version as a semver string (e.g. "3.0.0").
@@ -127,6 +339,7 @@ fn get_migrations(_py: Python<'_>) -> PyResult<Vec<(i64, i64, String)>> {
 fn ducpy_native(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(parse_duc, m)?)?;
     m.add_function(wrap_pyfunction!(serialize_duc, m)?)?;
+    m.add_function(wrap_pyfunction!(serialize_duc_to_bytes, m)?)?;
     m.add_function(wrap_pyfunction!(list_external_files, m)?)?;
     m.add_function(wrap_pyfunction!(stream_external_file_revision_to_path, m)?)?;
     m.add_function(wrap_pyfunction!(stream_checkpoint_data_to_path, m)?)?;
@@ -17,18 +17,47 @@ Search:
     Query/search elements and files programmatically via the
     ``duc.search`` API.
 
+Query:
+    Stream elements page by page straight from the SQLite tables with
+    ``duc.query`` (e.g. ``duc.iter_elements``), without parsing the
+    whole document; read file metadata cheaply with ``duc.peek_duc``.
+
+Geometry:
+    Vectorized, rotation-aware element bounds with ``duc.geometry``
+    (e.g. ``duc.compute_bounds``) and columnar NumPy export with
+    ``duc.to_columns``; requires the ``geometry`` extra.
+
 File I/O:
     Read and write ``.duc`` files using the ``duc.parse`` 
-    and ``duc.serialize`` modules.
+    and ``duc.serialize`` modules. ``duc.cache.ParseCache`` memoizes
+    ``parse_duc`` results for hot documents, ``duc.DucHandleCache`` keeps
+    ``DucSQL`` handles of many documents open, ``duc.parse_many`` parses
+    whole directories on a worker pool, and ``duc.aio`` offers awaitable
+    versions (``parse_duc_async`` …) backed by a configurable executor.
+    ``serialize_duc(..., validation_cache=True)`` skips embedded-code
+    validations that passed before (``duc.validation.ValidationCache``), and
+    ``duc.ValidationWorkerPool`` runs model code in warm, pre-imported
+    worker processes.
+
+Instrumentation:
+    Time each phase of those calls (conversion, validation, native write …)
+    with ``duc.instrumentation.set_hook`` or ``duc.instrumentation.record``.
 """
 
 from .builders import *
 from .classes import *
 from .enums import *
-from .parse import (DucData, list_external_files, parse_duc,
+from .parse import (DUC_SECTIONS, DucData, LazyDucData, list_external_files, parse_duc,
                     stream_checkpoint_data_to_path,
                     stream_delta_changeset_to_path,
                     stream_external_file_revision_to_path)
-from .serialize import DUC_SCHEMA_VERSION, DucSerializationValidationError, serialize_duc
+from .bulk import ParseOutcome, parse_many
+from .cache import DucHandleCache, DucHandleCacheStats, ParseCache, ParseCacheStats
+from .serialize import (DUC_SCHEMA_VERSION, DucSerializationValidationError, serialize_duc,
+                        serialize_duc_to_bytes)
+from .validation import *
 from .search import *
+from .query import *
+from .geometry import *
 from .utils import *
+from . import aio, instrumentation
@@ -0,0 +1,169 @@
+"""asyncio wrappers around the blocking ``.duc`` I/O functions.
+
+Each coroutine runs its synchronous counterpart in an executor, so the event
+loop keeps serving requests while a document is read or written. The native
+extension releases the GIL for decompression, SQLite and compression work, so
+several calls overlap on a thread pool.
+
+Calls use the loop's default executor unless one is configured with
+:func:`set_executor` or passed per call as ``executor=``.
+
+Usage::
+
+    from concurrent.futures import ThreadPoolExecutor
+    import ducpy.aio as duc_aio
+
+    duc_aio.set_executor(ThreadPoolExecutor(max_workers=8, thread_name_prefix="duc"))
+
+    async def handler(body: bytes):
+        data = await duc_aio.parse_duc_async(body, include=("elements",))
+        return await duc_aio.serialize_duc_to_bytes_async("copy", elements=...)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, TypeVar, Union
+
+from . import parse as _parse
+from . import serialize as _serialize
+from .parse import DucData, DucInput, LazyDucData, PathInput, SectionInput
+
+__all__ = [
+    "get_executor",
+    "list_external_files_async",
+    "parse_duc_async",
+    "serialize_duc_async",
+    "serialize_duc_to_bytes_async",
+    "set_executor",
+    "stream_checkpoint_data_to_path_async",
+    "stream_delta_changeset_to_path_async",
+    "stream_external_file_revision_to_path_async",
+]
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+
+def set_executor(executor: Optional[Executor]) -> None:
+    """Use *executor* for every ``ducpy.aio`` call (``None`` = the loop default).
+
+    The previous executor is not shut down; its owner stays responsible for it.
+    """
+    global _executor
+    _executor = executor
+
+
+def get_executor() -> Optional[Executor]:
+    """Return the executor configured with :func:`set_executor`, if any."""
+    return _executor
+
+
+async def _run(
+    func: Callable[..., T],
+    *args: Any,
+    executor: Optional[Executor] = None,
+    **kwargs: Any,
+) -> T:
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(executor or _executor, call)
+
+
+async def parse_duc_async(
+    source: DucInput,
+    lazy: bool = False,
+    include: SectionInput = None,
+    exclude: SectionInput = None,
+    *,
+    executor: Optional[Executor] = None,
+) -> Union[DucData, LazyDucData]:
+    """Awaitable :func:`ducpy.parse_duc`."""
+    return await _run(
+        _parse.parse_duc, source, lazy=lazy, include=include, exclude=exclude, executor=executor
+    )
+
+
+async def list_external_files_async(
+    source: DucInput,
+    *,
+    executor: Optional[Executor] = None,
+) -> List[DucData]:
+    """Awaitable :func:`ducpy.list_external_files`."""
+    return await _run(_parse.list_external_files, source, executor=executor)
+
+
+async def serialize_duc_async(
+    name: str,
+    *args: Any,
+    executor: Optional[Executor] = None,
+    **kwargs: Any,
+) -> str:
+    """Awaitable :func:`ducpy.serialize_duc`; takes the same arguments."""
+    return await _run(_serialize.serialize_duc, name, *args, executor=executor, **kwargs)
+
+
+async def serialize_duc_to_bytes_async(
+    name: str,
+    *args: Any,
+    executor: Optional[Executor] = None,
+    **kwargs: Any,
+) -> bytes:
+    """Awaitable :func:`ducpy.serialize_duc_to_bytes`; takes the same arguments."""
+    return await _run(
+        _serialize.serialize_duc_to_bytes, name, *args, executor=executor, **kwargs
+    )
+
+
+async def stream_external_file_revision_to_path_async(
+    source: PathInput,
+    revision_id: str,
+    output_path: PathInput,
+    *,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Awaitable :func:`ducpy.stream_external_file_revision_to_path`."""
+    return await _run(
+        _parse.stream_external_file_revision_to_path,
+        source,
+        revision_id,
+        output_path,
+        executor=executor,
+    )
+
+
+async def stream_checkpoint_data_to_path_async(
+    source: PathInput,
+    checkpoint_id: str,
+    output_path: PathInput,
+    *,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Awaitable :func:`ducpy.stream_checkpoint_data_to_path`."""
+    return await _run(
+        _parse.stream_checkpoint_data_to_path,
+        source,
+        checkpoint_id,
+        output_path,
+        executor=executor,
+    )
+
+
+async def stream_delta_changeset_to_path_async(
+    source: PathInput,
+    delta_id: str,
+    output_path: PathInput,
+    *,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Awaitable :func:`ducpy.stream_delta_changeset_to_path`."""
+    return await _run(
+        _parse.stream_delta_changeset_to_path,
+        source,
+        delta_id,
+        output_path,
+        executor=executor,
+    )
@@ -5,5 +5,6 @@ User-friendly helper functions for creating DUC elements without verbose datacla
 from .element_builders import *
 from .mutate_builder import *
 from .sql_builder import *
+from .sql_pool import *
 from .state_builders import *
 from .style_builders import *
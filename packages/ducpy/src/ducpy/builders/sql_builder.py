@@ -14,6 +14,17 @@ Usage::
         rows = db.sql("SELECT id, label FROM elements WHERE element_type = ?", "rectangle")
         db.sql("UPDATE elements SET label = ? WHERE id = ?", "new-label", rows[0]["id"])
 
+    # Edit a compressed .duc in place: recompressed and swapped in on exit
+    with duc.DucSQL("drawing.duc", write_back=True, compression_threads=4) as db:
+        db.sql("UPDATE elements SET label = ? WHERE id = ?", "checked", "r1")
+
+    # Many concurrent, journal-free readers of one uncompressed .duc
+    viewer = duc.DucSQL.open_readonly("drawing.duc")
+
+    # Store identical external file revisions once, written back on exit
+    with duc.DucSQL("drawing.duc", write_back=True, compression_level=9) as db:
+        stats = db.dedupe_external_files()
+
     # Create new .duc from scratch
     with duc.DucSQL.new() as db:
         db.sql("INSERT INTO elements (id, element_type, x, y, width, height) VALUES (?,?,?,?,?,?)",
@@ -24,20 +35,31 @@ Usage::
     with duc.DucSQL.from_bytes(raw) as db:
         print(db.sql("SELECT COUNT(*) AS n FROM elements")[0]["n"])
         modified = db.to_bytes()
+
+    # Entirely in memory: no temp files (Python 3.11+)
+    with duc.DucSQL.from_bytes(raw, in_memory=True) as db:
+        db.sql("UPDATE elements SET label = ?", "checked")
+        body = db.to_bytes(compressed=True)
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
+import shutil
 import sqlite3
+import struct
 import tempfile
 import zlib
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional, Sequence, Union
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Sequence, Union
 
 import ducpy_native
 
-__all__ = ["DucSQL", "quote_sql_identifier"]
+__all__ = ["DucSQL", "ExternalFileDedupeStats", "quote_sql_identifier"]
 SQLITE_HEADER_MAGIC = b"SQLite format 3\x00"
 
 
@@ -52,13 +74,18 @@ def _is_sqlite_bytes(data: bytes) -> bool:
     return data.startswith(SQLITE_HEADER_MAGIC)
 
 
-def _normalize_sqlite_image(data: bytes) -> bytes:
-    image = bytearray(data)
+def _normalize_sqlite_header(image: bytearray) -> None:
+    """Switch a WAL-mode header (read/write version 2) back to rollback mode, in place."""
     if len(image) > 19:
         if image[18] == 2:
             image[18] = 1
         if image[19] == 2:
             image[19] = 1
+
+
+def _normalize_sqlite_image(data: bytes) -> bytes:
+    image = bytearray(data)
+    _normalize_sqlite_header(image)
     return bytes(image)
 
 
@@ -80,11 +107,210 @@ def _decompress_duc_bytes(data: bytes) -> bytes:
     return _normalize_sqlite_image(inflated)
 
 
-def _compress_duc_bytes(data: bytes) -> bytes:
-    compressor = zlib.compressobj(level=-1, wbits=16 + zlib.MAX_WBITS)  # gzip
+def _compress_duc_bytes(data: bytes, level: int = -1) -> bytes:
+    compressor = zlib.compressobj(level=level, wbits=16 + zlib.MAX_WBITS)  # gzip
     return compressor.compress(data) + compressor.flush()
 
 
+_COPY_CHUNK_SIZE = 1024 * 1024
+# Same default as the native serializer.
+_DEFAULT_COMPRESSION_LEVEL = 6
+# open_readonly defaults: map up to 1 GiB, cache 64 MiB of pages.
+_READONLY_MMAP_SIZE = 1024 * 1024 * 1024
+_READONLY_CACHE_SIZE = 64 * 1024 * 1024
+
+
+_DEFLATE_WINDOW = 32 * 1024
+# Minimal gzip header: deflate, no flags, no mtime, unknown OS.
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+def _file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as src:
+        yield from iter(lambda: src.read(_COPY_CHUNK_SIZE), b"")
+
+
+def _image_chunks(image: bytes) -> Iterator[memoryview]:
+    view = memoryview(image)
+    for start in range(0, len(view), _COPY_CHUNK_SIZE):
+        yield view[start:start + _COPY_CHUNK_SIZE]
+
+
+def _deflate_block(block: bytes, window: bytes, level: int) -> bytes:
+    if window:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=window)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _gzip_chunks(chunks: Iterable[bytes], level: int, threads: int = 1) -> Iterator[bytes]:
+    """gzip *chunks* as a single gzip member, compressing up to *threads* blocks at once.
+
+    With several threads each 1 MiB block is deflated independently, primed
+    with the previous block's last 32 KiB and ended on a sync flush (as pigz
+    does), so the pieces concatenate into one deflate stream that any gzip
+    reader, including the native one, accepts. zlib releases the GIL while
+    compressing.
+    """
+    if threads <= 1:
+        compressor = zlib.compressobj(level=level, wbits=16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.flush()
+        return
+
+    crc = 0
+    size = 0
+    window = b""
+    pending: deque[Future[bytes]] = deque()
+    yield _GZIP_HEADER
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ducsql-gzip") as executor:
+        for chunk in chunks:
+            block = bytes(chunk)
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            pending.append(executor.submit(_deflate_block, block, window, level))
+            window = (window + block)[-_DEFLATE_WINDOW:]
+            if len(pending) >= 2 * threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    yield zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS).flush()  # final empty block
+    yield struct.pack("<II", crc & 0xFFFFFFFF, size & 0xFFFFFFFF)
+
+
+def _gzip_file(source: str, target: str, level: int) -> None:
+    """gzip *source* into *target* in 1 MiB chunks."""
+    with open(target, "wb") as dst:
+        for piece in _gzip_chunks(_file_chunks(source), level):
+            dst.write(piece)
+
+
+def _write_atomic(target: str, pieces: Iterable[bytes]) -> None:
+    """Write *pieces* to a sibling of *target*, then rename it over *target*."""
+    directory, name = os.path.split(os.path.abspath(target))
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            for piece in pieces:
+                dst.write(piece)
+            dst.flush()
+            os.fsync(dst.fileno())
+        if os.path.exists(target):
+            shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _with_rollback_header(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield *chunks* with a WAL-mode SQLite header switched back to rollback mode."""
+    first = True
+    for chunk in chunks:
+        if first:
+            chunk = bytearray(chunk)
+            _normalize_sqlite_header(chunk)
+            first = False
+        yield chunk
+
+
+def _check_write_options(compression_level: Optional[int], page_size: Optional[int]) -> None:
+    if compression_level is not None and not 0 <= compression_level <= 9:
+        raise ValueError(f"compression_level must be between 0 and 9, got {compression_level}")
+    if page_size is not None and (
+        not 512 <= page_size <= 65536 or page_size & (page_size - 1)
+    ):
+        raise ValueError(
+            f"page_size must be a power of two between 512 and 65536, got {page_size}"
+        )
+
+
+# sqlite3.Connection.serialize/deserialize arrived in Python 3.11.
+_HAS_SQLITE_SERIALIZE = hasattr(sqlite3.Connection, "deserialize")
+
+
+def _inflate_chunks(src: BinaryIO, header: bytes) -> Iterator[bytes]:
+    """Decompress a gzip (or legacy raw deflate) ``.duc`` stream 1 MiB at a time."""
+    wbits = 16 + zlib.MAX_WBITS if _is_gzip_bytes(header) else -zlib.MAX_WBITS
+    inflater = zlib.decompressobj(wbits)
+    for chunk in iter(lambda: src.read(_COPY_CHUNK_SIZE), b""):
+        yield inflater.decompress(chunk)
+    yield inflater.flush()
+    if not inflater.eof:
+        raise zlib.error("incomplete or truncated .duc stream")
+
+
+def _read_header(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(len(SQLITE_HEADER_MAGIC))
+
+
+def _read_sqlite_image(path: str) -> bytearray:
+    """Load the SQLite image of a ``.duc`` file, inflating it as it is read."""
+    with open(path, "rb") as src:
+        header = src.read(len(SQLITE_HEADER_MAGIC))
+        src.seek(0)
+        if _is_sqlite_bytes(header):
+            image = bytearray(os.fstat(src.fileno()).st_size)
+            src.readinto(image)
+        else:
+            image = bytearray()
+            for chunk in _inflate_chunks(src, header):
+                image += chunk
+            if not _is_sqlite_bytes(image):
+                raise ValueError("decompressed .duc payload does not start with a SQLite header")
+    _normalize_sqlite_header(image)
+    return image
+
+
+def _connect_in_memory(
+    image: Union[bytes, bytearray],
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
+    if not _HAS_SQLITE_SERIALIZE:
+        raise RuntimeError("in_memory=True requires Python 3.11+ (sqlite3 deserialize)")
+    conn = sqlite3.connect(":memory:", check_same_thread=check_same_thread)
+    try:
+        conn.deserialize(image)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def _write_gzip(image: bytes, target: str, level: int) -> None:
+    """gzip an in-memory SQLite image into *target* in 1 MiB chunks."""
+    with open(target, "wb") as dst:
+        for piece in _gzip_chunks(_image_chunks(image), level):
+            dst.write(piece)
+
+
+def _connect_readonly(sqlite_path: str) -> sqlite3.Connection:
+    """Open *sqlite_path* read-only; immutable (no locks, no journal) unless a WAL is pending."""
+    wal = f"{sqlite_path}-wal"
+    immutable = not (os.path.exists(wal) and os.path.getsize(wal) > 0)
+    uri = f"{Path(os.path.abspath(sqlite_path)).as_uri()}?mode=ro"
+    return sqlite3.connect(uri + "&immutable=1" if immutable else uri, uri=True)
+
+
+def _backup_to_temp(conn: sqlite3.Connection) -> str:
+    fd, temp_path = tempfile.mkstemp(suffix=".duc")
+    os.close(fd)
+    try:
+        dst = sqlite3.connect(temp_path)
+        try:
+            conn.backup(dst)
+        finally:
+            dst.close()
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    return temp_path
+
+
 def _write_temp_sqlite(data: bytes) -> str:
     tmp = tempfile.NamedTemporaryFile(suffix=".duc", delete=False)
     try:
@@ -97,13 +323,32 @@ def _write_temp_sqlite(data: bytes) -> str:
         raise
 
 
+def _inflate_to_temp(path: str) -> str:
+    tmp = tempfile.NamedTemporaryFile(suffix=".duc", delete=False)
+    try:
+        with tmp, open(path, "rb") as src:
+            header = src.read(len(SQLITE_HEADER_MAGIC))
+            src.seek(0)
+            for chunk in _inflate_chunks(src, header):
+                tmp.write(chunk)
+            tmp.seek(0)
+            image = bytearray(tmp.read(20))
+            if not _is_sqlite_bytes(image):
+                raise ValueError("decompressed .duc payload does not start with a SQLite header")
+            _normalize_sqlite_header(image)
+            tmp.seek(0)
+            tmp.write(image)
+        return tmp.name
+    except Exception:
+        os.unlink(tmp.name)
+        raise
+
+
 def _sqlite_path_for_duc(path: Union[str, Path]) -> tuple[str, Optional[str]]:
     path = str(path)
-    with open(path, "rb") as f:
-        data = f.read()
-    if _is_sqlite_bytes(data):
+    if _is_sqlite_bytes(_read_header(path)):
         return path, None
-    temp_path = _write_temp_sqlite(data)
+    temp_path = _inflate_to_temp(path)
     return temp_path, temp_path
 
 
@@ -160,6 +405,24 @@ def _apply_pragmas(conn: sqlite3.Connection) -> None:
     conn.execute("PRAGMA synchronous = NORMAL")
 
 
+@dataclass(frozen=True)
+class ExternalFileDedupeStats:
+    """Result of :meth:`DucSQL.dedupe_external_files`."""
+
+    revisions: int
+    bytes_saved: int
+
+
+def _revision_digest(conn: sqlite3.Connection, revision_id: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    for (data,) in conn.execute(
+        "SELECT data FROM external_file_revision_chunks WHERE revision_id = ? ORDER BY chunk_index",
+        (revision_id,),
+    ):
+        digest.update(data)
+    return digest.digest()
+
+
 class DucSQL:
     """Raw SQL access to a ``.duc`` SQLite database.
 
@@ -168,13 +431,54 @@ class DucSQL:
               Use it directly for cursor-level ops, ``conn.executemany``, etc.
     """
 
-    def __init__(self, path: Union[str, Path]):
-        """Open an existing ``.duc`` file."""
+    # Write-back target (see __init__); only set for files that are not
+    # edited in place.
+    _source: Optional[str] = None
+    _write_back_level: int = 0
+    _write_back_threads: int = 1
+    _saved_marker: Optional[tuple] = None
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        in_memory: bool = False,
+        write_back: bool = False,
+        compression_level: Optional[int] = None,
+        compression_threads: int = 1,
+        check_same_thread: bool = True,
+    ):
+        """Open an existing ``.duc`` file.
+
+        A compressed file is inflated into a temp file. With ``in_memory=True``
+        it is inflated straight into an in-memory database instead (Python
+        3.11+), so nothing is written to disk; changes then stay in memory
+        until :meth:`save` is given a path or :meth:`to_bytes` is called.
+
+        With ``write_back=True`` that working copy is written back to *path*
+        by :meth:`save` (no path) and on leaving a ``with`` block: it is
+        recompressed at ``compression_level`` (default 6 for compressed files,
+        0 for raw SQLite ones) on ``compression_threads`` threads into a
+        sibling file, which then replaces *path* atomically. Nothing is
+        written if the database did not change since it was opened or last
+        written back.
+
+        ``check_same_thread=False`` lets other threads use the connection
+        (one at a time), e.g. for handles shared through a cache.
+        """
         path = str(path)
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
-        sqlite_path, temp_path = _sqlite_path_for_duc(path)
-        self.conn: sqlite3.Connection = sqlite3.connect(sqlite_path)
+        _check_write_options(compression_level, None)
+        if compression_threads < 1:
+            raise ValueError(f"compression_threads must be at least 1, got {compression_threads}")
+        if in_memory:
+            self.conn: sqlite3.Connection = _connect_in_memory(
+                _read_sqlite_image(path), check_same_thread
+            )
+            sqlite_path, temp_path = None, None
+        else:
+            sqlite_path, temp_path = _sqlite_path_for_duc(path)
+            self.conn = sqlite3.connect(sqlite_path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row
         _apply_pragmas(self.conn)
         _apply_migrations(self.conn)
@@ -182,6 +486,14 @@ class DucSQL:
         self._temp: Optional[str] = temp_path
         self._attached_temps: list[str] = []
         self._closed = False
+        if write_back and sqlite_path != path:
+            if compression_level is None:
+                compressed = not _is_sqlite_bytes(_read_header(path))
+                compression_level = _DEFAULT_COMPRESSION_LEVEL if compressed else 0
+            self._source = path
+            self._write_back_level = compression_level
+            self._write_back_threads = compression_threads
+            self._saved_marker = self._change_marker()
 
     @classmethod
     def new(cls, path: Union[str, Path, None] = None) -> DucSQL:
@@ -201,8 +513,23 @@ class DucSQL:
         return inst
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> DucSQL:
-        """Open a ``.duc`` from raw bytes (temp file, cleaned up on close)."""
+    def from_bytes(cls, data: bytes, in_memory: bool = False) -> DucSQL:
+        """Open a ``.duc`` from raw bytes (temp file, cleaned up on close).
+
+        ``in_memory=True`` loads the database into memory instead, without a
+        temp file (Python 3.11+).
+        """
+        if in_memory:
+            inst = object.__new__(cls)
+            inst.conn = _connect_in_memory(_decompress_duc_bytes(data))
+            inst.conn.row_factory = sqlite3.Row
+            inst._path = None
+            inst._temp = None
+            inst._attached_temps = []
+            inst._closed = False
+            _apply_pragmas(inst.conn)
+            _apply_migrations(inst.conn)
+            return inst
         temp_path = _write_temp_sqlite(data)
         try:
             inst = object.__new__(cls)
@@ -219,6 +546,63 @@ class DucSQL:
             os.unlink(temp_path)
             raise
 
+    @classmethod
+    def open_readonly(
+        cls,
+        path: Union[str, Path],
+        mmap_size: int = _READONLY_MMAP_SIZE,
+        cache_size: int = _READONLY_CACHE_SIZE,
+    ) -> DucSQL:
+        """Open a ``.duc`` file for reading only, tuned for read-heavy viewers.
+
+        An uncompressed file is opened as an immutable ``mode=ro`` URI: no
+        journal, no locks, and pages are read through a memory map of up to
+        *mmap_size* bytes, backed by a page cache of *cache_size* bytes. Any
+        number of readers can share the file. A compressed file is inflated
+        into a private temp file first, and a file with an older schema is
+        migrated in such a copy; the original is never written. Writes raise
+        :class:`sqlite3.OperationalError`.
+
+        The file must not change while it is open; one with a pending
+        ``-wal`` file is opened without ``immutable`` so those commits are seen.
+        """
+        path = str(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        sqlite_path, temp_path = _sqlite_path_for_duc(path)
+        conn = None
+        try:
+            conn = _connect_readonly(sqlite_path)
+            user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if user_version and user_version < _get_current_schema_version():
+                if temp_path is None:
+                    temp_path = sqlite_path = _backup_to_temp(conn)
+                conn.close()
+                writer = sqlite3.connect(sqlite_path)
+                try:
+                    _apply_migrations(writer)
+                    writer.commit()
+                finally:
+                    writer.close()
+                conn = _connect_readonly(sqlite_path)
+            conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+            conn.execute(f"PRAGMA cache_size = {-(int(cache_size) // 1024)}")
+            conn.execute("PRAGMA query_only = ON")
+        except Exception:
+            if conn is not None:
+                conn.close()
+            if temp_path:
+                os.unlink(temp_path)
+            raise
+        inst = object.__new__(cls)
+        inst.conn = conn
+        inst.conn.row_factory = sqlite3.Row
+        inst._path = sqlite_path
+        inst._temp = temp_path
+        inst._attached_temps = []
+        inst._closed = False
+        return inst
+
     @classmethod
     def attach_many(
         cls,
@@ -276,40 +660,217 @@ class DucSQL:
     def rollback(self) -> None:
         self.conn.rollback()
 
+    # ------------------------------------------------------------------
+    # Spatial queries
+    # ------------------------------------------------------------------
+
+    def ensure_spatial_index(self) -> None:
+        """Create the R*Tree element index and its sync triggers.
+
+        See :mod:`ducpy.query.spatial`.
+        """
+        from ..query.spatial import ensure_spatial_index
+        ensure_spatial_index(self)
+
+    def query_elements_in_rect(
+        self,
+        x0: float,
+        y0: float,
+        x1: float,
+        y1: float,
+        layer: Union[str, Sequence[str], None] = None,
+        types: Union[str, Sequence[str], None] = None,
+        contained: bool = False,
+    ) -> list:
+        """Elements whose bounds overlap a rectangle (see :func:`ducpy.query_elements_in_rect`)."""
+        from ..query.spatial import query_elements_in_rect
+        return query_elements_in_rect(self, x0, y0, x1, y1, layer=layer, types=types, contained=contained)
+
+    def nearest_elements(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        layer: Union[str, Sequence[str], None] = None,
+        types: Union[str, Sequence[str], None] = None,
+    ) -> list:
+        """The *k* elements closest to a point (see :func:`ducpy.nearest_elements`)."""
+        from ..query.spatial import nearest_elements
+        return nearest_elements(self, x, y, k=k, layer=layer, types=types)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def dedupe_external_files(self, vacuum: bool = True) -> ExternalFileDedupeStats:
+        """Store byte-identical external file revisions once.
+
+        Duplicates drop their chunks and point ``content_revision_id`` at the
+        first revision (by id) holding the same bytes; readers follow that
+        link. Only revisions of equal ``size_bytes`` are hashed. With
+        ``vacuum=True`` the freed pages are returned to the file system.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(external_file_revisions)")}
+        if "content_revision_id" not in columns:
+            raise ValueError("This database predates external file deduplication; open it read-write to migrate it.")
+
+        by_size: dict = defaultdict(list)
+        for revision_id, size_bytes in self.conn.execute(
+            "SELECT id, size_bytes FROM external_file_revisions "
+            "WHERE content_revision_id IS NULL AND size_bytes > 0 ORDER BY id"
+        ):
+            by_size[size_bytes].append(revision_id)
+
+        revisions = bytes_saved = 0
+        for size_bytes, revision_ids in by_size.items():
+            if len(revision_ids) < 2:
+                continue
+            first_by_digest: dict = {}
+            for revision_id in revision_ids:
+                digest = _revision_digest(self.conn, revision_id)
+                content_revision_id = first_by_digest.setdefault(digest, revision_id)
+                if content_revision_id == revision_id:
+                    continue
+                self.conn.execute(
+                    "DELETE FROM external_file_revision_chunks WHERE revision_id = ?", (revision_id,)
+                )
+                self.conn.execute(
+                    "UPDATE external_file_revisions SET content_revision_id = ? "
+                    "WHERE id = ? OR content_revision_id = ?",
+                    (content_revision_id, revision_id, revision_id),
+                )
+                revisions += 1
+                bytes_saved += size_bytes
+        self.commit()
+        if vacuum and revisions:
+            self.conn.execute("VACUUM")
+        return ExternalFileDedupeStats(revisions=revisions, bytes_saved=bytes_saved)
+
     # ------------------------------------------------------------------
     # Export
     # ------------------------------------------------------------------
 
-    def save(self, path: Union[str, Path, None] = None) -> None:
-        """Write the database to a file. Omit *path* to save in-place."""
+    def _backup_to(self, target: str, page_size: Optional[int] = None) -> None:
+        dst = sqlite3.connect(target)
+        try:
+            self.conn.backup(dst)
+            if page_size is not None:
+                # The page size of a WAL database is fixed; rebuild it in rollback mode.
+                dst.execute("PRAGMA journal_mode = DELETE")
+                dst.execute(f"PRAGMA page_size = {int(page_size)}")
+                dst.execute("VACUUM")
+        finally:
+            dst.close()
+
+    def save(
+        self,
+        path: Union[str, Path, None] = None,
+        compression_level: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> None:
+        """Write the database to a file. Omit *path* to save in-place.
+
+        ``compression_level`` 1 (fastest) to 9 (smallest) writes a gzipped
+        ``.duc``; None or 0 writes the raw SQLite image, the fastest option
+        for intermediate files. ``page_size`` rebuilds the copy with that
+        SQLite page size. In-place saves keep the live file uncompressed.
+
+        When opened with ``write_back=True``, saving without a *path* writes
+        the working copy back to the original file instead (see
+        :meth:`__init__`); the options given at open time apply.
+        """
+        _check_write_options(compression_level, page_size)
         self.commit()
+        if not path and self._source is not None:
+            if compression_level is not None or page_size is not None:
+                raise ValueError("Write-back uses the compression options given when the file was opened.")
+            self._write_back()
+            return
         target = str(path) if path else self._path
         if not target:
             raise ValueError("No path — use save(path) or to_bytes().")
         if target == self._path:
+            if compression_level:
+                raise ValueError("In-place saves are not compressed; pass a path to write a compressed copy.")
+            if page_size is not None:
+                self.conn.execute("PRAGMA journal_mode = DELETE")
+                self.conn.execute(f"PRAGMA page_size = {int(page_size)}")
+                self.conn.execute("VACUUM")
+                self.conn.execute("PRAGMA journal_mode = WAL")
             self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-        else:
-            dst = sqlite3.connect(target)
+        elif compression_level and self._path is None and page_size is None and _HAS_SQLITE_SERIALIZE:
+            _write_gzip(self.conn.serialize(), target, compression_level)
+        elif compression_level:
+            fd, tmp = tempfile.mkstemp(suffix=".sqlite", dir=os.path.dirname(os.path.abspath(target)))
+            os.close(fd)
             try:
-                self.conn.backup(dst)
+                self._backup_to(tmp, page_size)
+                _gzip_file(tmp, target, compression_level)
             finally:
-                dst.close()
-
-    def to_bytes(self, compressed: bool = False) -> bytes:
-        """Export the database as raw bytes."""
+                os.unlink(tmp)
+        else:
+            self._backup_to(target, page_size)
+
+    def to_bytes(
+        self,
+        compressed: bool = False,
+        compression_level: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> bytes:
+        """Export the database as raw bytes.
+
+        ``compressed=True`` gzips at zlib's default level; an explicit
+        ``compression_level`` (1-9, or 0 for raw) takes precedence.
+        ``page_size`` rebuilds the export with that SQLite page size.
+
+        The image is taken with ``Connection.serialize()`` on Python 3.11+;
+        only a ``page_size`` rebuild (or older Pythons) goes through a temp
+        file.
+        """
+        _check_write_options(compression_level, page_size)
         self.commit()
+        level = compression_level if compression_level is not None else (-1 if compressed else 0)
+        if page_size is None and _HAS_SQLITE_SERIALIZE:
+            data = self.conn.serialize()
+            if len(data) > 19 and 2 in (data[18], data[19]):
+                data = _normalize_sqlite_image(data)
+            return _compress_duc_bytes(data, level) if level else data
         tmp = tempfile.NamedTemporaryFile(suffix=".duc", delete=False)
         try:
             tmp.close()
-            dst = sqlite3.connect(tmp.name)
-            self.conn.backup(dst)
-            dst.close()
+            self._backup_to(tmp.name, page_size)
             with open(tmp.name, "rb") as f:
                 data = f.read()
-            return _compress_duc_bytes(data) if compressed else data
+            return _compress_duc_bytes(data, level) if level else data
         finally:
             os.unlink(tmp.name)
 
+    def _change_marker(self) -> tuple:
+        # total_changes counts this connection's row changes, schema_version
+        # its DDL, data_version commits made through other connections.
+        return (
+            self.conn.total_changes,
+            self.conn.execute("PRAGMA schema_version").fetchone()[0],
+            self.conn.execute("PRAGMA data_version").fetchone()[0],
+        )
+
+    def _write_back(self) -> bool:
+        """Write the working copy over the original file if it changed."""
+        marker = self._change_marker()
+        if marker == self._saved_marker:
+            return False
+        if self._path is None:
+            chunks: Iterable[bytes] = _image_chunks(self.conn.serialize())
+        else:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            chunks = _file_chunks(self._path)
+        chunks = _with_rollback_header(chunks)
+        if self._write_back_level:
+            chunks = _gzip_chunks(chunks, self._write_back_level, self._write_back_threads)
+        _write_atomic(self._source, chunks)
+        self._saved_marker = marker
+        return True
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
@@ -331,6 +892,8 @@ class DucSQL:
         if not self._closed:
             if exc[0] is None:
                 self.commit()
+                if self._source is not None:
+                    self._write_back()
             self.close()
 
     def __del__(self) -> None:
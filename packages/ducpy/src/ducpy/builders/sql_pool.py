@@ -0,0 +1,373 @@
+"""
+Thread-safe pool of :class:`~ducpy.builders.sql_builder.DucSQL` connections.
+
+A ``sqlite3.Connection`` belongs to the thread that opened it, so a web
+worker serving requests on several threads cannot share one ``DucSQL``.
+:class:`DucSQLPool` opens the file once (applying migrations and WAL mode a
+single time) and then hands out:
+
+* **readers** - read-only WAL connections kept on a free list and reused
+  by whichever thread checks one out; at most ``max_readers`` exist, so
+  recycled worker threads never leave connections behind;
+* **the writer** - a single connection, checked out by one thread at a time,
+  whose transaction starts with ``BEGIN IMMEDIATE`` and is retried with
+  exponential backoff while another process holds the write lock.
+
+Idle connections are pinged before reuse and replaced if they stopped
+working. :attr:`DucSQLPool.stats` reports checkouts and wait times.
+
+Usage::
+
+    import ducpy as duc
+
+    pool = duc.DucSQLPool("drawing.duc", max_readers=16)
+
+    def get_element(element_id):
+        with pool.reader() as db:
+            return db.sql("SELECT * FROM elements WHERE id = ?", element_id)
+
+    def rename(element_id, label):
+        with pool.writer() as db:  # committed on exit, rolled back on error
+            db.sql("UPDATE elements SET label = ? WHERE id = ?", label, element_id)
+
+    print(pool.stats)
+    pool.close()
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Union
+
+from .sql_builder import (DucSQL, _apply_migrations, _apply_pragmas, _get_current_schema_version,
+                          _sqlite_path_for_duc)
+
+__all__ = ["DucSQLPool", "DucSQLPoolStats"]
+
+
+@dataclass(frozen=True)
+class DucSQLPoolStats:
+    """Snapshot of :class:`DucSQLPool` counters."""
+
+    reader_checkouts: int
+    writer_checkouts: int
+    #: Total seconds spent waiting for a free reader / the writer.
+    reader_wait_seconds: float
+    writer_wait_seconds: float
+    #: Reader connections currently open, idle or checked out (<= ``max_readers``).
+    readers_open: int
+    #: Connections replaced after failing a health check.
+    replaced: int
+    #: ``BEGIN IMMEDIATE`` attempts retried because the database was locked.
+    write_retries: int
+
+
+class _Handle:
+    __slots__ = ("db", "last_used")
+
+    def __init__(self, db: DucSQL):
+        self.db = db
+        self.last_used = time.monotonic()
+
+
+def _wrap(conn: sqlite3.Connection, path: str) -> DucSQL:
+    conn.row_factory = sqlite3.Row
+    db = object.__new__(DucSQL)
+    db.conn = conn
+    db._path = path
+    db._temp = None
+    db._attached_temps = []
+    db._closed = False
+    return db
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+class DucSQLPool:
+    """Pool of reusable reader connections and one serialized writer.
+
+    Parameters
+    ----------
+    path : str | Path
+        The ``.duc`` file. A compressed file is inflated into a working copy
+        owned by the pool (deleted on :meth:`close`); writes go to that copy,
+        use ``writer().save(path, compression_level=...)`` to persist them.
+    max_readers : int, default=8
+        At most this many reader connections are open and checked out at
+        once; further :meth:`reader` calls wait for one to be returned.
+    writer : int, default=1
+        1 for a pool with a writer, 0 for a read-only pool. SQLite allows a
+        single writer, so no other value is accepted.
+    busy_timeout : float, default=5.0
+        Seconds SQLite itself waits on a lock held by another connection.
+    write_retries : int, default=5
+        Extra ``BEGIN IMMEDIATE`` attempts, with exponential backoff starting
+        at *retry_backoff* seconds, once *busy_timeout* ran out.
+    retry_backoff : float, default=0.05
+        First backoff delay in seconds; doubled per retry, capped at 1 s.
+    health_check_interval : float, default=30.0
+        Ping (``SELECT 1``) connections idle for longer than this before
+        handing them out, replacing those that fail. 0 pings every checkout.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_readers: int = 8,
+        writer: int = 1,
+        busy_timeout: float = 5.0,
+        write_retries: int = 5,
+        retry_backoff: float = 0.05,
+        health_check_interval: float = 30.0,
+    ):
+        if max_readers <= 0:
+            raise ValueError("max_readers must be greater than zero")
+        if writer not in (0, 1):
+            raise ValueError("writer must be 0 or 1; SQLite allows a single writer")
+        if write_retries < 0:
+            raise ValueError("write_retries must not be negative")
+        path = str(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        self.path = path
+        self.max_readers = max_readers
+        self.busy_timeout = busy_timeout
+        self.write_retries = write_retries
+        self.retry_backoff = retry_backoff
+        self.health_check_interval = health_check_interval
+
+        self._sqlite_path, self._temp = _sqlite_path_for_duc(path)
+        self._lock = threading.Lock()
+        self._reader_slots = threading.BoundedSemaphore(max_readers)
+        self._writer_lock = threading.Lock()
+        self._readers: List[_Handle] = []
+        self._idle: List[_Handle] = []
+        self._writer: Optional[_Handle] = None
+        self._closed = False
+        self._reader_checkouts = self._writer_checkouts = 0
+        self._reader_wait = self._writer_wait = 0.0
+        self._replaced = self._write_retries = 0
+        try:
+            if writer:
+                # Migrate and switch to WAL once, not per request.
+                self._writer = _Handle(self._connect_writer())
+            else:
+                self._check_schema()
+        except BaseException:
+            self._discard_temp()
+            raise
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def reader(self, timeout: Optional[float] = None) -> Iterator[DucSQL]:
+        """Check out a read-only connection from the free list.
+
+        Waits up to *timeout* seconds (forever if None) while ``max_readers``
+        readers are in use, then raises :class:`TimeoutError`.
+        """
+        self._check_open()
+        start = time.monotonic()
+        if not self._reader_slots.acquire(timeout=timeout):
+            raise TimeoutError(f"no reader became free within {timeout} s")
+        try:
+            waited = time.monotonic() - start
+            with self._lock:
+                self._reader_checkouts += 1
+                self._reader_wait += waited
+                # Most recently used first: it is the least likely to need a ping.
+                handle = self._idle.pop() if self._idle else None
+            if handle is None or not self._healthy(handle):
+                handle = self._new_reader(replacing=handle)
+            try:
+                yield handle.db
+            finally:
+                handle.last_used = time.monotonic()
+                self._release_reader(handle)
+        finally:
+            self._reader_slots.release()
+
+    @contextlib.contextmanager
+    def writer(self, timeout: Optional[float] = None) -> Iterator[DucSQL]:
+        """Check out the writer inside a ``BEGIN IMMEDIATE`` transaction.
+
+        The transaction is committed when the block exits normally and rolled
+        back if it raises. Other threads wait up to *timeout* seconds (forever
+        if None) for the writer, then get :class:`TimeoutError`.
+        """
+        self._check_open()
+        if self._writer is None:
+            raise RuntimeError("DucSQLPool was created with writer=0")
+        start = time.monotonic()
+        if not self._writer_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"the writer did not become free within {timeout} s")
+        try:
+            with self._lock:
+                self._writer_checkouts += 1
+                self._writer_wait += time.monotonic() - start
+            if not self._healthy(self._writer):
+                self._writer.db.close()
+                self._writer = _Handle(self._connect_writer())
+                with self._lock:
+                    self._replaced += 1
+            db = self._writer.db
+            self._begin_immediate(db.conn)
+            try:
+                yield db
+            except BaseException:
+                if db.conn.in_transaction:
+                    db.rollback()
+                raise
+            else:
+                db.commit()
+            finally:
+                self._writer.last_used = time.monotonic()
+        finally:
+            self._writer_lock.release()
+
+    def close(self) -> None:
+        """Close every connection; checked-out connections are closed too."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            handles = list(self._readers)
+            self._readers.clear()
+            self._idle.clear()
+        if self._writer is not None:
+            handles.append(self._writer)
+        for handle in handles:
+            handle.db.close()
+        self._discard_temp()
+
+    @property
+    def stats(self) -> DucSQLPoolStats:
+        with self._lock:
+            return DucSQLPoolStats(
+                reader_checkouts=self._reader_checkouts,
+                writer_checkouts=self._writer_checkouts,
+                reader_wait_seconds=self._reader_wait,
+                writer_wait_seconds=self._writer_wait,
+                readers_open=len(self._readers),
+                replaced=self._replaced,
+                write_retries=self._write_retries,
+            )
+
+    def __enter__(self) -> "DucSQLPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "open"
+        return f"DucSQLPool({self.path!r}, max_readers={self.max_readers}, {state})"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("DucSQLPool is closed")
+
+    def _connect(self, uri: str) -> sqlite3.Connection:
+        # Connections move between threads: readers via the free list, and
+        # close() may run on any thread.
+        conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        return conn
+
+    def _uri(self) -> str:
+        return Path(os.path.abspath(self._sqlite_path)).as_uri()
+
+    def _connect_writer(self) -> DucSQL:
+        conn = self._connect(self._uri())
+        try:
+            _apply_pragmas(conn)
+            _apply_migrations(conn)
+            conn.commit()
+        except BaseException:
+            conn.close()
+            raise
+        return _wrap(conn, self._sqlite_path)
+
+    def _check_schema(self) -> None:
+        conn = self._connect(self._uri() + "?mode=ro")
+        try:
+            user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+        if user_version and user_version < _get_current_schema_version():
+            raise ValueError(
+                f"{self.path} uses schema version {user_version} and needs migrating; "
+                "open the pool with writer=1"
+            )
+
+    def _new_reader(self, replacing: Optional[_Handle]) -> _Handle:
+        if replacing is not None:
+            with self._lock:
+                if replacing in self._readers:
+                    self._readers.remove(replacing)
+                self._replaced += 1
+            replacing.db.close()
+        conn = self._connect(self._uri() + "?mode=ro")
+        conn.execute("PRAGMA query_only = ON")
+        handle = _Handle(_wrap(conn, self._sqlite_path))
+        with self._lock:
+            self._readers.append(handle)
+        return handle
+
+    def _release_reader(self, handle: _Handle) -> None:
+        with self._lock:
+            # close() may have run while the reader was checked out.
+            if self._closed or handle not in self._readers:
+                return
+            self._idle.append(handle)
+
+    def _healthy(self, handle: _Handle) -> bool:
+        if handle.db._closed:
+            return False
+        if time.monotonic() - handle.last_used < self.health_check_interval:
+            return True
+        try:
+            handle.db.conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _begin_immediate(self, conn: sqlite3.Connection) -> None:
+        delay = self.retry_backoff
+        for attempt in range(self.write_retries + 1):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc) or attempt == self.write_retries:
+                    raise
+            with self._lock:
+                self._write_retries += 1
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    def _discard_temp(self) -> None:
+        if self._temp and os.path.exists(self._temp):
+            os.unlink(self._temp)
+            self._temp = None
@@ -3,9 +3,10 @@ Helper functions for creating DUC state-related objects with a user-friendly API
 Follows the same hierarchical builder pattern as element_builders.py.
 Only types from types.rs / duc.sql are supported.
 """
+import os
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, List, Optional, Union
 
 from ducpy.utils.rand_utils import generate_random_id
 
@@ -404,6 +405,31 @@ class ExternalFileBuilder(StateSpecificBuilder):
 
     def with_data(self, data: bytes):
         self.extra["data"] = data
+        self.extra.pop("data_source", None)
+        return self
+
+    def with_data_path(self, path: Union[str, "os.PathLike[str]"]):
+        """Stream the revision bytes from *path* at serialization time.
+
+        The file is read chunk by chunk by the native writer, so it is never
+        held in memory; it must still exist when ``serialize_duc`` runs.
+        """
+        self.extra["data_source"] = os.fspath(path)
+        self.extra.pop("data", None)
+        return self
+
+    def with_data_stream(self, stream: IO[bytes]):
+        """Stream the revision bytes from a binary file object at serialization time.
+
+        The stream is read from its current position to EOF. It must be
+        seekable if embedded code validation needs the file.
+        """
+        self.extra["data_source"] = stream
+        self.extra.pop("data", None)
+        return self
+
+    def with_source_name(self, source_name: str):
+        self.extra["source_name"] = source_name
         return self
 
     def with_last_retrieved(self, last_retrieved: int):
@@ -616,16 +642,31 @@ def create_delta_from_base(base: BaseStateParams, **kwargs) -> Delta:
     )
 
 
+def _data_source_size(source: Any) -> int:
+    """Best-effort size of a path or stream source (the writer records the real size)."""
+    try:
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        return os.fstat(source.fileno()).st_size - source.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
 def create_external_file_from_base(base: BaseStateParams, **kwargs) -> DucExternalFile:
     file_id = base.id or generate_random_id()
     rev_id = f"{file_id}_rev1"
     created = now_ms()
     data = kwargs.get('data', b"")
+    source = kwargs.get('data_source')
+    source_name = kwargs.get('source_name')
+    if source_name is None and isinstance(source, str):
+        source_name = os.path.basename(source)
     revision = ExternalFileRevision(
         id=rev_id,
-        size_bytes=len(data),
+        size_bytes=len(data) if source is None else _data_source_size(source),
         mime_type=kwargs.get('mime_type', ""),
         created=created,
+        source_name=source_name,
         last_retrieved=kwargs.get('last_retrieved')
     )
     ef = DucExternalFile(
@@ -637,6 +678,8 @@ def create_external_file_from_base(base: BaseStateParams, **kwargs) -> DucExtern
     # Carry binary blobs alongside the metadata so the serializer
     # can split them into the separate `filesData` map.
     ef._data_blobs = {rev_id: data} if data else {}  # type: ignore[attr-defined]
+    # Paths and streams are read chunk by chunk by the native writer instead.
+    ef._data_sources = {rev_id: source} if source is not None else {}  # type: ignore[attr-defined]
     return ef
 
 
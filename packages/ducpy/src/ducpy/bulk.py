@@ -0,0 +1,181 @@
+"""Parse many ``.duc`` files concurrently.
+
+:func:`parse_many` fans :func:`ducpy.parse_duc` out over a thread or process
+pool and yields a :class:`ParseOutcome` per file as soon as it finishes. Paths
+are pulled from the input lazily and at most ``max_pending`` files are in
+flight (or finished but not yet consumed) at any time, so memory stays bounded
+even for an endless path generator.
+
+Threads are the default: the native parser releases the GIL, so they scale
+without pickling results. Use ``use_processes=True`` when the caller's own
+per-document Python work should run in parallel too.
+
+Usage::
+
+    from pathlib import Path
+    import ducpy as duc
+
+    for outcome in duc.parse_many(Path("archive").rglob("*.duc"), workers=8,
+                                  include=("elements",), on_error="yield"):
+        if outcome.ok:
+            report(outcome.path, len(outcome.data.elements), outcome.seconds)
+        else:
+            log(outcome.path, outcome.error)
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor, wait)
+from dataclasses import dataclass
+from os import cpu_count, fspath
+from typing import (Any, Callable, Dict, Iterable, Iterator, Optional, Tuple,
+                    Union)
+
+from .parse import (DucData, LazyDucData, PathInput, SectionInput, _parse_raw,
+                    _resolve_sections, _wrap)
+from .utils.convert import deep_camel_to_snake
+
+__all__ = ["ParseOutcome", "parse_many"]
+
+ErrorPolicy = Union[str, Callable[[str, BaseException], Any]]
+_ERROR_POLICIES = ("raise", "skip", "yield")
+
+
+@dataclass
+class ParseOutcome:
+    """Result of parsing one file with :func:`parse_many`.
+
+    Attributes
+    ----------
+    index : int
+        Position of the path in the input sequence.
+    path : str
+        The parsed path.
+    data : DucData | LazyDucData | None
+        The parsed document, or ``None`` when parsing failed.
+    error : BaseException | None
+        The exception raised while parsing, if any.
+    seconds : float
+        Wall time spent parsing the file in the worker.
+    """
+
+    index: int
+    path: str
+    data: Optional[Union[DucData, LazyDucData]]
+    error: Optional[BaseException]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _parse_timed(
+    path: str, include: SectionInput, exclude: SectionInput, lazy: bool
+) -> Tuple[Any, float]:
+    """Worker entry point; returns the raw result for lazy parses (a view cannot be pickled)."""
+    started = time.perf_counter()
+    raw = _parse_raw(path, include, exclude)
+    data = raw if lazy else _wrap(deep_camel_to_snake(raw))
+    return data, time.perf_counter() - started
+
+
+def parse_many(
+    paths: Iterable[PathInput],
+    workers: Optional[int] = None,
+    include: SectionInput = None,
+    exclude: SectionInput = None,
+    lazy: bool = False,
+    on_error: ErrorPolicy = "raise",
+    use_processes: bool = False,
+    max_pending: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[ParseOutcome]:
+    """Parse *paths* concurrently, yielding outcomes in completion order.
+
+    Parameters
+    ----------
+    paths : Iterable[str | PathLike]
+        Files to parse; consumed lazily.
+    workers : int, optional
+        Pool size (default: the CPU count). Ignored when *executor* is given.
+    include, exclude : str | Iterable[str], optional
+        Section selection, as in :func:`ducpy.parse_duc`.
+    lazy : bool, default=False
+        Yield :class:`LazyDucData` views instead of converted documents.
+    on_error : {"raise", "skip", "yield"} | Callable[[str, BaseException], Any], default="raise"
+        ``"raise"`` stops at the first failure (pending work is cancelled)
+        and re-raises it; ``"skip"`` drops failed files; ``"yield"`` yields
+        them with ``error`` set. A callable is called with the path and the
+        exception, and the file is then skipped.
+    use_processes : bool, default=False
+        Use a :class:`~concurrent.futures.ProcessPoolExecutor` instead of threads.
+    max_pending : int, optional
+        Bound on submitted-but-unconsumed files (default: ``2 * workers``).
+        The input is not read further until the caller consumes results.
+    executor : concurrent.futures.Executor, optional
+        Run on this executor instead of creating (and shutting down) a pool.
+
+    Yields
+    ------
+    ParseOutcome
+        One per parsed (or failed, with ``on_error="yield"``) file; use
+        ``outcome.index`` to restore input order.
+    """
+    if not (callable(on_error) or on_error in _ERROR_POLICIES):
+        raise ValueError(f"on_error must be one of {_ERROR_POLICIES} or a callable")
+    # Fail fast on bad section names instead of once per file.
+    _resolve_sections(include, exclude)
+
+    workers = workers or cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be greater than zero")
+    max_pending = max_pending or 2 * workers
+    if max_pending <= 0:
+        raise ValueError("max_pending must be greater than zero")
+
+    owned = executor is None
+    if executor is None:
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        executor = pool_cls(max_workers=workers)
+
+    pending: Dict[Future, Tuple[int, str]] = {}
+    path_iter = enumerate(paths)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    index, path = next(path_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                path = fspath(path)
+                future = executor.submit(_parse_timed, path, include, exclude, lazy)
+                pending[future] = (index, path)
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, path = pending.pop(future)
+                try:
+                    data, seconds = future.result()
+                except Exception as exc:
+                    if on_error == "raise":
+                        raise
+                    if callable(on_error):
+                        on_error(path, exc)
+                    elif on_error == "yield":
+                        yield ParseOutcome(index, path, None, exc, 0.0)
+                    continue
+                if lazy:
+                    data = LazyDucData(data)
+                yield ParseOutcome(index, path, data, None, seconds)
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,573 @@
+"""Opt-in, process-wide LRU caches for parsed documents and open ``DucSQL`` handles.
+
+:class:`ParseCache` memoizes :func:`ducpy.parse_duc` results;
+:class:`DucHandleCache` keeps :class:`~ducpy.builders.sql_builder.DucSQL`
+handles (and their decompressed temp files) open between requests.
+
+Entries are keyed by file identity: the resolved path plus ``st_mtime_ns``,
+``st_size``, ``st_ino`` and ``st_dev`` (or a BLAKE2b digest of the bytes with
+``identity="content"``), together with the selected sections. Any change to the
+file yields a new key, so stale results are never served; the superseded entry
+for that path is dropped on the next lookup.
+
+The cache keeps the native parse result and hands out a fresh
+:class:`~ducpy.parse.LazyDucData` view per call. Writes on a view stay in that
+view and never reach the shared entry, so callers cannot corrupt each other.
+Pass ``copy=True`` for fully materialized :class:`~ducpy.parse.DucData` results
+instead.
+
+Usage::
+
+    import ducpy as duc
+
+    CACHE = duc.cache.ParseCache(max_bytes=512 * 1024 * 1024)
+
+    data = CACHE.parse("site.duc", include=("elements", "layers"))
+    print(CACHE.stats.hit_rate)
+
+    HANDLES = duc.DucHandleCache(max_open=256, max_temp_bytes=4 * 1024**3)
+
+    with HANDLES.checkout("projects/site.duc") as db:
+        rows = db.sql("SELECT id FROM elements WHERE layer_id = ?", layer_id)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import PathLike, fspath
+from typing import Any, Dict, FrozenSet, Hashable, Iterator, List, Optional, Tuple, Union
+
+import ducpy_native
+
+from .builders.sql_builder import DucSQL
+from .parse import (DucData, LazyDucData, SectionInput, _drop_unselected,
+                    _resolve_sections, _wrap)
+from .utils.convert import deep_camel_to_snake
+
+__all__ = ["DucHandleCache", "DucHandleCacheStats", "ParseCache", "ParseCacheStats"]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_OPEN = 64
+DEFAULT_MAX_TEMP_BYTES = 1024 * 1024 * 1024
+
+_IDENTITIES = ("stat", "content")
+_HASH_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    """Snapshot of :class:`ParseCache` counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _estimate_size(obj: Any) -> int:
+    """Approximate the memory held by a native parse result, in bytes."""
+    size = 0
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return size
+
+
+def _content_digest(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed ``.duc`` documents with a byte budget.
+
+    Parameters
+    ----------
+    max_bytes : int, default=256 MiB
+        Upper bound on the estimated memory of all cached results. Least
+        recently used entries are evicted to stay under it; a single result
+        larger than the budget is returned but not cached.
+    identity : {"stat", "content"}, default="stat"
+        ``"stat"`` keys entries by path, mtime, size, inode and device (no
+        file read on a hit). ``"content"`` hashes the file bytes, so copies
+        and touched-but-unchanged files share an entry.
+    copy : bool, default=False
+        Return an independent, fully converted :class:`DucData` on every call
+        instead of a lazy per-call view.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        identity: str = "stat",
+        copy: bool = False,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than zero")
+        if identity not in _IDENTITIES:
+            raise ValueError(f"identity must be one of {_IDENTITIES}, got {identity!r}")
+        self.max_bytes = max_bytes
+        self.identity = identity
+        self.copy = copy
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._key_by_path: Dict[Tuple[str, Optional[FrozenSet[str]]], Hashable] = {}
+        self._in_flight: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def parse(
+        self,
+        source: Union[str, PathLike],
+        include: SectionInput = None,
+        exclude: SectionInput = None,
+    ) -> Union[DucData, LazyDucData]:
+        """Parse *source* like :func:`ducpy.parse_duc`, serving repeats from the cache.
+
+        Returns a :class:`LazyDucData` view (or a :class:`DucData` copy when
+        the cache was created with ``copy=True``).
+        """
+        path = os.path.realpath(fspath(source))
+        sections = _resolve_sections(include, exclude)
+        key = self._key(path, sections)
+
+        raw = self._lookup(key)
+        if raw is None:
+            try:
+                with self._flight_lock(key):
+                    # Another thread may have parsed it while we waited.
+                    raw = self._lookup(key, count=False)
+                    if raw is None:
+                        raw = self._load(path, sections)
+                        self._store(path, sections, key, raw)
+            finally:
+                self._in_flight_done(key)
+        return self._view(raw)
+
+    def invalidate(self, source: Optional[Union[str, PathLike]] = None) -> int:
+        """Drop cached entries for *source* (every entry when ``None``).
+
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            if source is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._key_by_path.clear()
+                self._bytes = 0
+                return removed
+            path = os.path.realpath(fspath(source))
+            stale = [slot for slot in self._key_by_path if slot[0] == path]
+            for slot in stale:
+                self._discard(self._key_by_path.pop(slot))
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._key_by_path.clear()
+            self._bytes = self._hits = self._misses = self._evictions = 0
+
+    @property
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            return ParseCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source: object) -> bool:
+        try:
+            path = os.path.realpath(fspath(source))  # type: ignore[arg-type]
+            key = self._key(path, None)
+        except (TypeError, OSError):
+            return False
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        stats = self.stats
+        return (
+            f"ParseCache(entries={stats.entries}, bytes={stats.current_bytes}/"
+            f"{stats.max_bytes}, hits={stats.hits}, misses={stats.misses})"
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _key(self, path: str, sections: Optional[FrozenSet[str]]) -> Hashable:
+        if self.identity == "content":
+            return ("content", _content_digest(path), sections)
+        st = os.stat(path)
+        return (path, st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev, sections)
+
+    def _lookup(self, key: Hashable, count: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if count:
+                    self._hits += 1
+                return entry[0]
+            if count:
+                self._misses += 1
+            return None
+
+    def _load(self, path: str, sections: Optional[FrozenSet[str]]) -> Dict[str, Any]:
+        if sections is None:
+            return ducpy_native.parse_duc(path)
+        return _drop_unselected(ducpy_native.parse_duc(path, include=sorted(sections)), sections)
+
+    def _store(
+        self,
+        path: str,
+        sections: Optional[FrozenSet[str]],
+        key: Hashable,
+        raw: Dict[str, Any],
+    ) -> None:
+        size = _estimate_size(raw)
+        with self._lock:
+            slot = (path, sections)
+            previous = self._key_by_path.get(slot)
+            if previous is not None and previous != key:
+                self._discard(previous)
+            if size > self.max_bytes:
+                self._key_by_path.pop(slot, None)
+                return
+            self._discard(key)
+            self._entries[key] = (raw, size)
+            self._key_by_path[slot] = key
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self._evictions += 1
+                self._forget(old_key)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _forget(self, key: Hashable) -> None:
+        for slot, slot_key in list(self._key_by_path.items()):
+            if slot_key == key:
+                del self._key_by_path[slot]
+
+    def _flight_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            lock = self._in_flight.get(key)
+            if lock is None:
+                lock = self._in_flight[key] = threading.Lock()
+            return lock
+
+    def _in_flight_done(self, key: Hashable) -> None:
+        with self._lock:
+            lock = self._in_flight.get(key)
+            if lock is not None and not lock.locked():
+                del self._in_flight[key]
+
+    def _view(self, raw: Dict[str, Any]) -> Union[DucData, LazyDucData]:
+        if self.copy:
+            return _wrap(deep_camel_to_snake(raw))
+        return LazyDucData(raw)
+
+
+@dataclass(frozen=True)
+class DucHandleCacheStats:
+    """Snapshot of :class:`DucHandleCache` counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    #: Handles dropped because their source file changed on disk.
+    invalidations: int
+    open: int
+    checked_out: int
+    temp_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _file_signature(path: str) -> Tuple[int, int, int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev)
+
+
+class _Handle:
+    __slots__ = ("db", "path", "signature", "refs", "temp_bytes", "stale", "changes", "lock", "depth")
+
+    def __init__(self, db: DucSQL, path: str, signature: Tuple[int, int, int, int]):
+        self.db = db
+        self.path = path
+        self.signature = signature
+        self.refs = 0
+        self.temp_bytes = 0
+        self.stale = False
+        self.changes = 0
+        # Held for the whole checkout so each one is its own transaction.
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.measure()
+
+    def measure(self) -> None:
+        temp = self.db._temp
+        self.temp_bytes = os.path.getsize(temp) if temp and os.path.exists(temp) else 0
+
+
+class DucHandleCache:
+    """Thread-safe LRU cache of open :class:`DucSQL` handles, one per file.
+
+    Opening a compressed ``.duc`` inflates it into a temp file and checks
+    its schema; a cached handle skips both. :meth:`checkout` hands out the
+    cached handle and counts the checkout, so a handle is never closed while
+    in use. Idle handles are closed least recently used first once more than
+    *max_open* are open or their temp files exceed *max_temp_bytes*. A file
+    whose mtime, size or inode changed is reopened, and the old handle is
+    closed as soon as its last checkout ends.
+
+    Checkouts of the same file share one connection and are serialized: a
+    checkout holds the handle's lock until it ends, so another thread
+    checking out the same file waits (use
+    :class:`~ducpy.builders.sql_pool.DucSQLPool` for concurrent readers).
+    Changes are committed when a checkout ends and rolled back if it raised;
+    a nested checkout of the same file in the same thread joins the outer
+    one, which commits or rolls back for both. Changes live in the temp copy
+    of a compressed file until saved with ``db.save(path, ...)``.
+
+    Parameters
+    ----------
+    max_open : int, default=64
+        Keep at most this many handles open. Checked-out handles are never
+        closed, so the count can exceed it while they are in use.
+    max_temp_bytes : int, default=1 GiB
+        Budget for the decompressed temp files of cached handles.
+    """
+
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN, max_temp_bytes: int = DEFAULT_MAX_TEMP_BYTES):
+        if max_open <= 0:
+            raise ValueError("max_open must be greater than zero")
+        if max_temp_bytes < 0:
+            raise ValueError("max_temp_bytes must not be negative")
+        self.max_open = max_open
+        self.max_temp_bytes = max_temp_bytes
+        self._entries: "OrderedDict[str, _Handle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._temp_bytes = 0
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def checkout(self, source: Union[str, PathLike]) -> Iterator[DucSQL]:
+        """Yield the cached :class:`DucSQL` for *source*, opening it if needed."""
+        handle = self._acquire(os.path.realpath(fspath(source)))
+        try:
+            with handle.lock:
+                outer = handle.depth == 0
+                if outer:
+                    handle.changes = handle.db.conn.total_changes
+                handle.depth += 1
+                failed = True
+                try:
+                    yield handle.db
+                    failed = False
+                finally:
+                    handle.depth -= 1
+                    if outer:
+                        self._release(handle, failed)
+        finally:
+            self._return(handle)
+
+    def invalidate(self, source: Optional[Union[str, PathLike]] = None) -> int:
+        """Drop the handle for *source* (every handle when ``None``).
+
+        Idle handles are closed now, checked-out ones when released. Returns
+        the number of handles dropped.
+        """
+        with self._lock:
+            if source is None:
+                paths = list(self._entries)
+            else:
+                path = os.path.realpath(fspath(source))
+                paths = [path] if path in self._entries else []
+            doomed = [self._drop(path) for path in paths]
+        self._close_idle(doomed)
+        return len(paths)
+
+    def close(self) -> None:
+        """Close every handle; checked-out ones close when released."""
+        self.invalidate()
+
+    @property
+    def stats(self) -> DucHandleCacheStats:
+        with self._lock:
+            return DucHandleCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                open=len(self._entries),
+                checked_out=sum(1 for handle in self._entries.values() if handle.refs),
+                temp_bytes=self._temp_bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source: object) -> bool:
+        try:
+            return os.path.realpath(fspath(source)) in self._entries  # type: ignore[arg-type]
+        except TypeError:
+            return False
+
+    def __enter__(self) -> "DucHandleCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        stats = self.stats
+        return (
+            f"DucHandleCache(open={stats.open}/{self.max_open}, temp_bytes={stats.temp_bytes}/"
+            f"{self.max_temp_bytes}, hits={stats.hits}, misses={stats.misses})"
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _acquire(self, path: str) -> _Handle:
+        signature = _file_signature(path)
+        doomed: List[_Handle] = []
+        with self._lock:
+            handle = self._entries.get(path)
+            if handle is not None and handle.signature != signature:
+                self._invalidations += 1
+                doomed.append(self._drop(path))
+                handle = None
+            if handle is not None:
+                self._hits += 1
+                self._entries.move_to_end(path)
+                handle.refs += 1
+                return handle
+            self._misses += 1
+        self._close_idle(doomed)
+
+        db = DucSQL(path, check_same_thread=False)
+        # Opening an uncompressed file switches it to WAL, which touches it.
+        opened = _Handle(db, path, _file_signature(path))
+        with self._lock:
+            handle = self._entries.get(path)
+            if handle is not None and handle.signature == opened.signature:
+                # Another thread opened it meanwhile; use theirs.
+                doomed = [opened]
+            else:
+                doomed = [self._drop(path)] if handle is not None else []
+                handle = self._entries[path] = opened
+                self._temp_bytes += handle.temp_bytes
+            handle.refs += 1
+            doomed += self._evict()
+        self._close_idle(doomed)
+        return handle
+
+    def _release(self, handle: _Handle, failed: bool) -> None:
+        """End the outermost checkout's transaction (handle lock held)."""
+        db = handle.db
+        if db._closed:
+            return
+        if failed:
+            db.rollback()
+        else:
+            db.commit()
+        if db.conn.total_changes != handle.changes:
+            # Our own writes to an uncompressed file must not look like an
+            # outside change on the next checkout.
+            with self._lock:
+                if not handle.stale:
+                    try:
+                        handle.signature = _file_signature(handle.path)
+                    except OSError:
+                        pass
+
+    def _return(self, handle: _Handle) -> None:
+        db = handle.db
+        doomed: List[_Handle] = []
+        with self._lock:
+            handle.refs -= 1
+            if db._closed and not handle.stale:
+                self._drop(handle.path)
+            elif not handle.stale:
+                self._temp_bytes -= handle.temp_bytes
+                handle.measure()
+                self._temp_bytes += handle.temp_bytes
+                doomed += self._evict()
+            if handle.stale and handle.refs == 0:
+                doomed.append(handle)
+        self._close_idle(doomed)
+
+    def _drop(self, path: str) -> _Handle:
+        """Remove *path* from the cache (lock held); returns the handle to close if idle."""
+        handle = self._entries.pop(path)
+        self._temp_bytes -= handle.temp_bytes
+        handle.stale = True
+        return handle
+
+    def _evict(self) -> List[_Handle]:
+        """Drop least recently used idle handles while over budget (lock held)."""
+        evicted: List[_Handle] = []
+        for path in list(self._entries):
+            if len(self._entries) <= self.max_open and self._temp_bytes <= self.max_temp_bytes:
+                break
+            if self._entries[path].refs == 0:
+                evicted.append(self._drop(path))
+                self._evictions += 1
+        return evicted
+
+    @staticmethod
+    def _close_idle(handles: List[_Handle]) -> None:
+        for handle in handles:
+            if handle.refs == 0:
+                handle.db.close()
@@ -0,0 +1,16 @@
+"""Vectorized element geometry (requires NumPy, the ``geometry`` extra)."""
+
+from .bounds import (ElementBounds, compute_bounds, ellipse_bounds,
+                     iter_bounds_batches, rect_bounds, write_bounds)
+from .columns import PointColumns, to_columns
+
+__all__ = [
+    "ElementBounds",
+    "PointColumns",
+    "compute_bounds",
+    "ellipse_bounds",
+    "iter_bounds_batches",
+    "rect_bounds",
+    "to_columns",
+    "write_bounds",
+]
@@ -0,0 +1,545 @@
+"""Vectorized axis-aligned bounds for ``.duc`` elements.
+
+Bounds are geometric: they cover the element's shape only and ignore stroke
+width, so a stroked element can paint up to half its stroke width outside
+them. (ducjs ``utils/bounds.ts`` pads linear elements by half their first
+stroke's width; pad these boxes yourself when you need painted extents.)
+
+Per element type:
+
+* Boxed elements (rectangles, text, images, frames, plots, documents …) rotate
+  their ``x, y, width, height`` box about its centre.
+* Ellipses use the exact extent of the rotated ellipse inscribed in the box.
+* Linear elements (``line``/``arrow``) take their points and the Bezier
+  segments in ``lines`` (handles are relative to ``x, y`` like the points),
+  rotated about the centre of their unrotated extent. Curve extrema are solved
+  exactly, not sampled.
+* Freedraw elements take their point cloud, rotated the same way.
+
+Every step works on whole batches of elements as NumPy arrays. Results use the
+``[min_x, min_y, max_x, max_y]`` row layout.
+
+Requires NumPy (``pip install ducpy[geometry]``).
+
+Usage::
+
+    import ducpy as duc
+
+    result = duc.compute_bounds("site.duc")
+    boxes = result.as_dict()           # {element_id: (min_x, min_y, max_x, max_y)}
+
+    data = duc.parse_duc("site.duc")
+    result = duc.compute_bounds(data)  # same, from parsed elements
+
+    duc.write_bounds("site.duc")       # store them in the R*Tree index
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Sequence, Tuple, Union)
+
+from ..builders.sql_builder import DucSQL
+from ..query._source import DucSource, open_duc_source
+from ..query.spatial import SPATIAL_INDEX_TABLE, ensure_spatial_index
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = [
+    "ElementBounds",
+    "compute_bounds",
+    "ellipse_bounds",
+    "iter_bounds_batches",
+    "rect_bounds",
+    "write_bounds",
+]
+
+DEFAULT_BATCH_SIZE = 50_000
+
+_LINEAR_TYPES = frozenset({"line", "arrow"})
+_POINT_TABLES = {
+    "line": "linear_element_points",
+    "arrow": "linear_element_points",
+    "freedraw": "freedraw_element_points",
+}
+
+# Denominator below which a Bezier derivative coefficient counts as zero.
+_EPSILON = 1e-12
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "ducpy.geometry requires NumPy; install it with `pip install ducpy[geometry]`"
+        ) from exc
+    return numpy
+
+
+@dataclass
+class ElementBounds:
+    """Bounds for a batch of elements.
+
+    Attributes
+    ----------
+    ids : list[str]
+        Element ids, in the same order as ``bounds``.
+    bounds : numpy.ndarray
+        ``(n, 4)`` float64 array of ``[min_x, min_y, max_x, max_y]`` rows.
+    """
+
+    ids: List[str]
+    bounds: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def as_dict(self) -> Dict[str, Tuple[float, float, float, float]]:
+        """Return ``{element_id: (min_x, min_y, max_x, max_y)}``."""
+        return {
+            element_id: tuple(float(v) for v in row)
+            for element_id, row in zip(self.ids, self.bounds.tolist())
+        }
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+
+def rect_bounds(x, y, width, height, angle) -> "np.ndarray":
+    """Geometric bounds of boxes rotated by *angle* (radians) about their centres.
+
+    All arguments are array-likes of equal length (scalars broadcast). Negative
+    widths/heights (boxes drawn right-to-left) are handled.
+    """
+    np = _numpy()
+    x, y, width, height, angle = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (x, y, width, height, angle))
+    )
+    cos, sin = np.abs(np.cos(angle)), np.abs(np.sin(angle))
+    w, h = np.abs(width), np.abs(height)
+    half_x = (w * cos + h * sin) / 2.0
+    half_y = (w * sin + h * cos) / 2.0
+    return _centred(np, x + width / 2.0, y + height / 2.0, half_x, half_y)
+
+
+def ellipse_bounds(x, y, width, height, angle) -> "np.ndarray":
+    """Bounds of the ellipses inscribed in boxes rotated by *angle* (radians)."""
+    np = _numpy()
+    x, y, width, height, angle = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (x, y, width, height, angle))
+    )
+    cos, sin = np.cos(angle), np.sin(angle)
+    a, b = np.abs(width) / 2.0, np.abs(height) / 2.0
+    half_x = np.hypot(a * cos, b * sin)
+    half_y = np.hypot(a * sin, b * cos)
+    return _centred(np, x + width / 2.0, y + height / 2.0, half_x, half_y)
+
+
+def _centred(np, cx, cy, half_x, half_y) -> "np.ndarray":
+    return np.stack([cx - half_x, cy - half_y, cx + half_x, cy + half_y], axis=-1)
+
+
+def _cubic_bounds(np, curves: "np.ndarray") -> "np.ndarray":
+    """Exact bounds of cubic Bezier curves given as ``(m, 4, 2)`` control points."""
+    p0, p1, p2, p3 = curves[:, 0], curves[:, 1], curves[:, 2], curves[:, 3]
+    # B'(t) / 3 = a t^2 + b t + c, per axis.
+    a = -p0 + 3.0 * p1 - 3.0 * p2 + p3
+    b = 2.0 * (p0 - 2.0 * p1 + p2)
+    c = p1 - p0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quadratic = np.abs(a) > _EPSILON
+        root = np.sqrt(b * b - 4.0 * a * c)
+        t1 = np.where(quadratic, (-b + root) / (2.0 * a), -c / b)
+        t2 = np.where(quadratic, (-b - root) / (2.0 * a), np.nan)
+    # (m, 4) candidate parameters: both roots of both axes.
+    ts = np.concatenate([t1, t2], axis=1)
+    ts = np.where((ts > 0.0) & (ts < 1.0), ts, 0.0)
+
+    u = 1.0 - ts
+    coeffs = np.stack([u**3, 3.0 * u * u * ts, 3.0 * u * ts * ts, ts**3], axis=-1)
+    extrema = np.einsum("mkj,mjd->mkd", coeffs, curves)
+    candidates = np.concatenate([extrema, curves[:, [0, 3]]], axis=1)
+    return np.concatenate([candidates.min(axis=1), candidates.max(axis=1)], axis=1)
+
+
+# ---------------------------------------------------------------------------
+# Path elements (linear + freedraw)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Paths:
+    """Points and Bezier segments of path elements, grouped by element index."""
+
+    point_owner: "np.ndarray"  # (p,) element index of each point
+    points: "np.ndarray"  # (p, 2) relative coordinates
+    curve_owner: "np.ndarray"  # (m,) element index of each curve
+    curves: "np.ndarray"  # (m, 4, 2) relative cubic control points
+
+
+def _curves_from_lines(np, points, offsets, counts, owner, start, start_handle, end, end_handle):
+    """Build cubic control points for the segments that carry handles.
+
+    Segments without handles are straight and already covered by the points;
+    segments with one handle are quadratics, raised to cubics.
+    """
+    valid = (start >= 0) & (start < counts[owner]) & (end >= 0) & (end < counts[owner])
+    has_start = ~np.isnan(start_handle[:, 0])
+    has_end = ~np.isnan(end_handle[:, 0])
+    keep = valid & (has_start | has_end)
+    owner, start, end = owner[keep], start[keep], end[keep]
+    start_handle, end_handle = start_handle[keep], end_handle[keep]
+    has_start, has_end = has_start[keep], has_end[keep]
+
+    p0 = points[offsets[owner] + start]
+    p3 = points[offsets[owner] + end]
+    cubic = (has_start & has_end)[:, None]
+    control = np.where(has_start[:, None], start_handle, end_handle)
+    c1 = np.where(cubic, start_handle, p0 + 2.0 / 3.0 * (control - p0))
+    c2 = np.where(cubic, end_handle, p3 + 2.0 / 3.0 * (control - p3))
+    return owner, np.stack([p0, c1, c2, p3], axis=1)
+
+
+def _extent(np, count: int, owner, values_min, values_max) -> "np.ndarray":
+    out = np.empty((count, 4))
+    out[:, :2] = np.inf
+    out[:, 2:] = -np.inf
+    if len(owner):
+        np.minimum.at(out[:, :2], owner, values_min)
+        np.maximum.at(out[:, 2:], owner, values_max)
+    return out
+
+
+def _path_bounds(np, x, y, angle, paths: _Paths) -> "np.ndarray":
+    """Stroke-less bounds of path elements, rotated about their unrotated extent's centre."""
+    n = len(x)
+    origin = np.stack([x, y], axis=1)
+    points = paths.points + origin[paths.point_owner]
+    curves = paths.curves + origin[paths.curve_owner][:, None, :]
+
+    def extent(pts, crv):
+        box = _extent(np, n, paths.point_owner, pts, pts)
+        if len(crv):
+            curve_box = _cubic_bounds(np, crv)
+            np.minimum.at(box[:, :2], paths.curve_owner, curve_box[:, :2])
+            np.maximum.at(box[:, 2:], paths.curve_owner, curve_box[:, 2:])
+        return box
+
+    box = extent(points, curves)
+    rotated = angle != 0.0
+    if rotated.any():
+        with np.errstate(invalid="ignore"):  # elements without points stay NaN
+            centre = (box[:, :2] + box[:, 2:]) / 2.0
+        cos, sin = np.cos(angle), np.sin(angle)
+
+        def rotate(coords, owner):
+            shape = (-1,) + (1,) * (coords.ndim - 2)
+            pivot = centre[owner].reshape(shape + (2,))
+            c, s = cos[owner].reshape(shape), sin[owner].reshape(shape)
+            rel = coords - pivot
+            return np.stack(
+                [rel[..., 0] * c - rel[..., 1] * s, rel[..., 0] * s + rel[..., 1] * c],
+                axis=-1,
+            ) + pivot
+
+        turned = extent(rotate(points, paths.point_owner), rotate(curves, paths.curve_owner))
+        box = np.where(rotated[:, None], turned, box)
+    return box
+
+
+# ---------------------------------------------------------------------------
+# Batch assembly
+# ---------------------------------------------------------------------------
+
+
+def _bounds_for(np, types, x, y, width, height, angle, paths: Optional[_Paths]):
+    types = np.asarray(types, dtype=object)
+    out = rect_bounds(x, y, width, height, angle)
+
+    ellipse = types == "ellipse"
+    if ellipse.any():
+        out[ellipse] = ellipse_bounds(
+            x[ellipse], y[ellipse], width[ellipse], height[ellipse], angle[ellipse]
+        )
+
+    if paths is not None and len(paths.point_owner):
+        path_box = _path_bounds(np, x, y, angle, paths)
+        has_points = np.isfinite(path_box[:, 0])
+        out[has_points] = path_box[has_points]
+    return out
+
+
+def _element_value(element: Any, key: str, default: Any = None) -> Any:
+    if isinstance(element, Mapping):
+        return element.get(key, default)
+    return getattr(element, key, default)
+
+
+def _handle(reference: Any) -> Tuple[float, float]:
+    handle = _element_value(reference, "handle") if reference is not None else None
+    if handle is None:
+        return (float("nan"), float("nan"))
+    return (float(_element_value(handle, "x")), float(_element_value(handle, "y")))
+
+
+def _bounds_from_elements(np, elements: Sequence[Any]) -> ElementBounds:
+    n = len(elements)
+    ids: List[str] = []
+    types: List[str] = []
+    transform = np.empty((n, 5))
+    point_owner: List[int] = []
+    point_xy: List[Tuple[float, float]] = []
+    counts = np.zeros(n, dtype=np.int64)
+    line_rows: List[Tuple[int, int, int, float, float, float, float]] = []
+
+    for index, element in enumerate(elements):
+        element_type = _element_value(element, "type")
+        ids.append(_element_value(element, "id"))
+        types.append(element_type)
+        transform[index] = [
+            float(_element_value(element, key, 0.0) or 0.0)
+            for key in ("x", "y", "width", "height", "angle")
+        ]
+        if element_type not in _POINT_TABLES:
+            continue
+        points = _element_value(element, "points") or []
+        counts[index] = len(points)
+        for point in points:
+            point_owner.append(index)
+            point_xy.append((float(_element_value(point, "x")), float(_element_value(point, "y"))))
+        if element_type in _LINEAR_TYPES:
+            for line in _element_value(element, "lines") or []:
+                start = _element_value(line, "start")
+                end = _element_value(line, "end")
+                if start is None or end is None:
+                    continue
+                line_rows.append(
+                    (index, int(_element_value(start, "index")), int(_element_value(end, "index")))
+                    + _handle(start)
+                    + _handle(end)
+                )
+
+    paths = _assemble_paths(
+        np,
+        counts,
+        np.asarray(point_owner, dtype=np.int64),
+        np.asarray(point_xy, dtype=np.float64).reshape(-1, 2),
+        np.asarray(line_rows, dtype=np.float64).reshape(-1, 7),
+    )
+    bounds = _bounds_for(np, types, *transform.T, paths)
+    return ElementBounds(ids=ids, bounds=bounds)
+
+
+def _assemble_paths(np, counts, point_owner, points, lines) -> _Paths:
+    """*lines* rows are ``(owner, start, end, sx, sy, ex, ey)``; NaN = no handle."""
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    curve_owner, curves = _curves_from_lines(
+        np,
+        points,
+        offsets,
+        counts,
+        lines[:, 0].astype(np.int64),
+        lines[:, 1].astype(np.int64),
+        lines[:, 3:5],
+        lines[:, 2].astype(np.int64),
+        lines[:, 5:7],
+    )
+    return _Paths(point_owner=point_owner, points=points, curve_owner=curve_owner, curves=curves)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _owners(np, rowids, owner_rowids) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Map owner rowids to batch indices; the mask drops any row whose owner
+    is not in the batch."""
+    owner_rowids = owner_rowids.astype(np.int64)
+    index = np.searchsorted(rowids, owner_rowids)
+    clipped = np.minimum(index, len(rowids) - 1)
+    return clipped, rowids[clipped] == owner_rowids
+
+
+def _sql_batch(
+    np,
+    conn: sqlite3.Connection,
+    rows: List[sqlite3.Row],
+    tables: Dict[str, bool],
+    type_filter: Tuple[str, ...] = (),
+) -> Tuple["np.ndarray", ElementBounds]:
+    rowids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    ids = [row[1] for row in rows]
+    types = [row[2] for row in rows]
+    transform = np.asarray([tuple(row[3:8]) for row in rows], dtype=np.float64).reshape(-1, 5)
+    lo, hi = int(rowids[0]), int(rowids[-1])
+    # Same filter as the batch query, so a sparse type selection does not
+    # pull the points of every other element in the rowid window.
+    type_sql = (
+        f" AND e.element_type IN ({','.join('?' * len(type_filter))})" if type_filter else ""
+    )
+
+    def fetch(query: str, width: int) -> "np.ndarray":
+        data = conn.execute(query, (lo, hi, *type_filter)).fetchall()
+        return np.asarray(data, dtype=np.float64).reshape(-1, width)
+
+    # Points of both tables, in element order; `rowids` is sorted, so the
+    # owning element index is a binary search away.
+    chunks = []
+    for table in sorted(set(_POINT_TABLES.values())):
+        if tables[table]:
+            chunks.append(fetch(
+                f"SELECT e.rowid, p.x, p.y FROM {table} AS p "
+                "JOIN elements AS e ON e.id = p.element_id "
+                f"WHERE e.rowid BETWEEN ? AND ? AND e.is_deleted = 0{type_sql} "
+                "ORDER BY e.rowid, p.sort_order",
+                3,
+            ))
+    point_rows = np.concatenate(chunks) if chunks else np.empty((0, 3))
+    point_rows = point_rows[np.argsort(point_rows[:, 0], kind="stable")]
+    point_owner, in_batch = _owners(np, rowids, point_rows[:, 0])
+    point_rows, point_owner = point_rows[in_batch], point_owner[in_batch]
+    counts = np.bincount(point_owner, minlength=len(rows)).astype(np.int64)
+
+    lines = np.empty((0, 7))
+    if tables["linear_element_lines"]:
+        lines = fetch(
+            "SELECT e.rowid, l.start_index, l.end_index, "
+            "l.start_handle_x, l.start_handle_y, l.end_handle_x, l.end_handle_y "
+            "FROM linear_element_lines AS l JOIN elements AS e ON e.id = l.element_id "
+            f"WHERE e.rowid BETWEEN ? AND ? AND e.is_deleted = 0{type_sql}",
+            7,
+        )
+        owner, in_batch = _owners(np, rowids, lines[:, 0])
+        lines = lines[in_batch]
+        lines[:, 0] = owner[in_batch]
+
+    paths = _assemble_paths(np, counts, point_owner, point_rows[:, 1:], lines)
+    bounds = _bounds_for(np, types, *transform.T, paths)
+    return rowids, ElementBounds(ids=ids, bounds=bounds)
+
+
+def iter_bounds_batches(
+    source: DucSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    types: Optional[Union[str, Iterable[str]]] = None,
+) -> Iterator[Tuple["np.ndarray", ElementBounds]]:
+    """Yield ``(rowids, ElementBounds)`` for non-deleted elements, *batch_size* at a time.
+
+    Elements are read in ``rowid`` order; each batch loads its points and
+    lines with one query per table, so memory stays bounded by *batch_size*.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be greater than zero")
+    np = _numpy()
+    type_filter = (types,) if isinstance(types, str) else tuple(types or ())
+    type_sql = (
+        f" AND element_type IN ({','.join('?' * len(type_filter))})" if type_filter else ""
+    )
+
+    with open_duc_source(source) as db:
+        conn = db.conn
+        tables = {
+            table: _table_exists(conn, table)
+            for table in (*set(_POINT_TABLES.values()), "linear_element_lines")
+        }
+        last = None
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, id, element_type, x, y, width, height, angle FROM elements "
+                f"WHERE is_deleted = 0 AND rowid > ?{type_sql} ORDER BY rowid LIMIT ?",
+                (-1 if last is None else last, *type_filter, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            yield _sql_batch(np, conn, rows, tables, type_filter)
+            last = rows[-1][0]
+
+
+def compute_bounds(
+    source: Union[DucSource, Mapping[str, Any], Sequence[Any]],
+    types: Optional[Union[str, Iterable[str]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ElementBounds:
+    """Compute geometric axis-aligned bounds for every non-deleted element.
+
+    Stroke width is not included (see the module docstring).
+
+    Parameters
+    ----------
+    source : str | PathLike | DucSQL | DucData | Sequence
+        A ``.duc`` path or open :class:`DucSQL` (read straight from the
+        tables), parsed data from :func:`ducpy.parse_duc` (its ``elements``
+        are used), or a sequence of parsed elements such as those yielded by
+        :func:`ducpy.iter_elements`.
+    types : str | Iterable[str], optional
+        Only include these element types.
+    batch_size : int, default=50000
+        Elements per vectorized batch when reading from SQLite.
+
+    Returns
+    -------
+    ElementBounds
+        Element ids and an ``(n, 4)`` array of ``[min_x, min_y, max_x, max_y]``.
+    """
+    np = _numpy()
+    if isinstance(source, (str, os.PathLike, DucSQL)):
+        ids: List[str] = []
+        parts = []
+        for _, batch in iter_bounds_batches(source, batch_size=batch_size, types=types):
+            ids.extend(batch.ids)
+            parts.append(batch.bounds)
+        bounds = np.concatenate(parts) if parts else np.empty((0, 4))
+        return ElementBounds(ids=ids, bounds=bounds)
+
+    elements = _element_value(source, "elements") if isinstance(source, Mapping) else source
+    wanted = None if types is None else ({types} if isinstance(types, str) else set(types))
+    selected = [
+        element
+        for element in elements or ()
+        if not _element_value(element, "is_deleted", False)
+        and (wanted is None or _element_value(element, "type") in wanted)
+    ]
+    return _bounds_from_elements(np, selected)
+
+
+def write_bounds(
+    source: DucSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Store precomputed bounds in the ``elements_rtree`` spatial index and commit.
+
+    Creates the index if needed (see :func:`ducpy.ensure_spatial_index`) and
+    replaces its trigger-maintained boxes with the exact ones from
+    :func:`compute_bounds`, so viewport queries stop over-reporting rotated,
+    curved and point-based elements. The triggers still rewrite a box when an
+    element's transform changes; call this again after geometry edits.
+
+    Returns
+    -------
+    int
+        Number of elements written.
+    """
+    written = 0
+    with open_duc_source(source, writable=True) as db:
+        ensure_spatial_index(db)
+        for rowids, batch in iter_bounds_batches(db, batch_size=batch_size):
+            min_x, min_y, max_x, max_y = batch.bounds.T.tolist()
+            db.conn.executemany(
+                f"UPDATE {SPATIAL_INDEX_TABLE} "
+                "SET min_x = ?, max_x = ?, min_y = ?, max_y = ? WHERE id = ?",
+                zip(min_x, max_x, min_y, max_y, rowids.tolist()),
+            )
+            written += len(batch)
+        db.commit()
+    return written
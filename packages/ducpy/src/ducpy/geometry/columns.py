@@ -0,0 +1,184 @@
+"""Columnar NumPy export of element geometry.
+
+:func:`to_columns` reads ``elements`` and the point tables straight into NumPy
+arrays, without building a Python object per row: transforms become one
+structured array and the points of linear and freedraw elements become
+CSR-style ``offsets``/``values`` pairs aligned with it. A million freedraw
+points take 17 MB this way instead of a million dicts.
+
+Requires NumPy (``pip install ducpy[geometry]``).
+
+Usage::
+
+    import numpy as np
+    import ducpy as duc
+
+    cols = duc.to_columns("markup.duc", types="freedraw")
+    ink = cols.freedraw_points
+    lengths = np.diff(ink.offsets)                  # points per element
+    xs = ink.values["x"] + np.repeat(cols.elements["x"], lengths)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
+
+from ..parse import DucData
+from ..query._source import DucSource, open_duc_source
+from .bounds import _numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["PointColumns", "to_columns"]
+
+# ``elements`` columns exported per element, with their NumPy types.
+_ELEMENT_FIELDS = (
+    ("id", "id", "O"),
+    ("element_type", "type", "O"),
+    ("layer_id", "layer_id", "O"),
+    ("x", "x", "f8"),
+    ("y", "y", "f8"),
+    ("width", "width", "f8"),
+    ("height", "height", "f8"),
+    ("angle", "angle", "f8"),
+    ("z_index", "z_index", "f8"),
+    ("opacity", "opacity", "f8"),
+    ("is_visible", "is_visible", "?"),
+    ("locked", "locked", "?"),
+)
+
+_POINT_DTYPE = [("x", "f8"), ("y", "f8"), ("mirroring", "i1")]
+
+# Stored as -1 in ``values["mirroring"]`` when the point has no mirroring.
+NO_MIRRORING = -1
+
+
+@dataclass
+class PointColumns:
+    """Points of many elements in CSR layout.
+
+    The points of ``elements[i]`` are ``values[offsets[i]:offsets[i + 1]]``,
+    relative to the element's ``x``/``y`` as in the file. Elements without
+    points in this table get an empty range.
+
+    Attributes
+    ----------
+    offsets : numpy.ndarray
+        ``int64`` array of length ``len(elements) + 1``.
+    values : numpy.ndarray
+        Structured array with ``x``, ``y`` (``float64``) and ``mirroring``
+        (``int8``, a ``BEZIER_MIRRORING`` value or ``-1``).
+    """
+
+    offsets: "np.ndarray"
+    values: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def points_of(self, index: int) -> "np.ndarray":
+        """Return the points of the element at *index* (a view)."""
+        return self.values[self.offsets[index]:self.offsets[index + 1]]
+
+    def owners(self) -> "np.ndarray":
+        """Return the element index of every point (``len(values)`` entries)."""
+        np = _numpy()
+        return np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+
+
+def _element_filter(
+    types: Tuple[str, ...], include_deleted: bool
+) -> Tuple[str, List[Any]]:
+    clauses = [] if include_deleted else ["e.is_deleted = 0"]
+    if types:
+        clauses.append(f"e.element_type IN ({','.join('?' * len(types))})")
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", list(types)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _read_points(np, conn, table, where, params, rowids) -> PointColumns:
+    dtype = np.dtype([("rowid", "i8")] + _POINT_DTYPE)
+    rows = np.empty(0, dtype=dtype)
+    if _table_exists(conn, table):
+        # Driving the join from ``elements`` walks it in rowid order and the
+        # point table's primary key per element, so no sort is needed.
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"SELECT e.rowid, p.x, p.y, coalesce(p.mirroring, {NO_MIRRORING}) "
+            f"FROM elements AS e JOIN {table} AS p ON p.element_id = e.id{where} "
+            "ORDER BY e.rowid, p.sort_order",
+            params,
+        )
+        rows = np.fromiter(cursor, dtype=dtype)
+
+    counts = np.bincount(np.searchsorted(rowids, rows["rowid"]), minlength=len(rowids))
+    offsets = np.zeros(len(rowids) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    values = np.empty(len(rows), dtype=_POINT_DTYPE)
+    for name, _ in _POINT_DTYPE:
+        values[name] = rows[name]
+    return PointColumns(offsets=offsets, values=values)
+
+
+def to_columns(
+    source: DucSource,
+    types: Optional[Union[str, Iterable[str]]] = None,
+    include_deleted: bool = False,
+) -> DucData:
+    """Export element transforms and points as NumPy arrays.
+
+    Parameters
+    ----------
+    source : str | PathLike | DucSQL
+        A ``.duc`` path or an open :class:`DucSQL`.
+    types : str | Iterable[str], optional
+        Only export these element types (``"freedraw"``, ``"line"`` …).
+    include_deleted : bool, default=False
+        Also export elements flagged ``is_deleted``.
+
+    Returns
+    -------
+    DucData
+        ``elements``: structured array in ``rowid`` order with ``id``, ``type``,
+        ``layer_id``, ``x``, ``y``, ``width``, ``height``, ``angle``,
+        ``z_index``, ``opacity``, ``is_visible`` and ``locked``.
+        ``linear_points`` / ``freedraw_points``: :class:`PointColumns`
+        aligned with ``elements``.
+    """
+    np = _numpy()
+    type_filter = (types,) if isinstance(types, str) else tuple(types or ())
+    where, params = _element_filter(type_filter, include_deleted)
+    dtype = np.dtype([("rowid", "i8")] + [(key, kind) for _, key, kind in _ELEMENT_FIELDS])
+
+    with open_duc_source(source) as db:
+        conn = db.conn
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        columns = ", ".join(f"e.{column}" for column, _, _ in _ELEMENT_FIELDS)
+        cursor.execute(
+            f"SELECT e.rowid, {columns} FROM elements AS e{where} ORDER BY e.rowid", params
+        )
+        rows = np.fromiter(cursor, dtype=dtype)
+        rowids = rows["rowid"]
+
+        elements = np.empty(len(rows), dtype=[(key, kind) for _, key, kind in _ELEMENT_FIELDS])
+        for _, key, _ in _ELEMENT_FIELDS:
+            elements[key] = rows[key]
+
+        return DucData(
+            elements=elements,
+            linear_points=_read_points(np, conn, "linear_element_points", where, params, rowids),
+            freedraw_points=_read_points(
+                np, conn, "freedraw_element_points", where, params, rowids
+            ),
+        )
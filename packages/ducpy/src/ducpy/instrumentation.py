@@ -0,0 +1,150 @@
+"""Per-phase timing spans for the ``.duc`` I/O functions.
+
+:func:`~ducpy.serialize_duc`, :func:`~ducpy.parse_duc`,
+:func:`~ducpy.search.search_duc_elements` and the ``stream_*`` helpers report
+one :class:`Span` per phase (e.g. ``convert``, ``validate``, ``write``) plus a
+``total`` span for the whole call. Nothing is timed unless a hook is installed
+with :func:`set_hook` or spans are being collected with :func:`record`.
+
+The native extension writes SQLite and compresses in a single call, so a
+serialize ``write`` span covers both; its ``bytes`` is the size of the written
+file. Compare ``compression_level=0`` runs to separate the two.
+
+Usage::
+
+    import ducpy as duc
+    from ducpy import instrumentation
+
+    instrumentation.set_hook(lambda span: metrics.observe(span.name, span.seconds))
+
+    with instrumentation.record() as spans:
+        duc.serialize_duc("plan", "plan.duc", elements=elements)
+    for span in spans:
+        print(f"{span.name:<28} {span.seconds * 1000:8.1f} ms  {span.bytes or ''}")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Span",
+    "get_hook",
+    "record",
+    "set_hook",
+    "span",
+]
+
+
+@dataclass(frozen=True)
+class Span:
+    """One timed phase of an instrumented call."""
+
+    operation: str
+    """Public function that ran, e.g. ``"serialize_duc"``."""
+    phase: str
+    """Step within the call, e.g. ``"validate"``; ``"total"`` for the whole call."""
+    seconds: float
+    """Wall-clock duration."""
+    bytes: Optional[int] = None
+    """Bytes read or written by the phase, when known."""
+    ok: bool = True
+    """False when the phase raised."""
+
+    @property
+    def name(self) -> str:
+        """``"operation.phase"``, handy as a metric or trace span name."""
+        return f"{self.operation}.{self.phase}"
+
+
+Hook = Callable[[Span], None]
+
+_hook: Optional[Hook] = None
+_recorders: ContextVar[Tuple[List[Span], ...]] = ContextVar("ducpy_span_recorders", default=())
+
+
+def set_hook(hook: Optional[Hook]) -> None:
+    """Call *hook* with every finished :class:`Span` (``None`` disables it).
+
+    The hook runs synchronously on the calling thread, so keep it cheap;
+    exceptions it raises are logged and otherwise ignored.
+    """
+    global _hook
+    _hook = hook
+
+
+def get_hook() -> Optional[Hook]:
+    """Return the hook installed with :func:`set_hook`, if any."""
+    return _hook
+
+
+@contextlib.contextmanager
+def record() -> Iterator[List[Span]]:
+    """Collect the spans emitted in this context into the yielded list.
+
+    Unlike :func:`set_hook` this only sees calls made from the current thread
+    or task, so concurrent requests can each profile themselves.
+    """
+    spans: List[Span] = []
+    token = _recorders.set(_recorders.get() + (spans,))
+    try:
+        yield spans
+    finally:
+        _recorders.reset(token)
+
+
+class _Timer:
+    __slots__ = ("bytes",)
+
+    def __init__(self) -> None:
+        self.bytes: Optional[int] = None
+
+    def size_of(self, path: str) -> None:
+        """Set :attr:`bytes` to the size of *path*, if it exists."""
+        try:
+            self.bytes = os.path.getsize(path)
+        except OSError:
+            pass
+
+
+def _enabled() -> bool:
+    return _hook is not None or bool(_recorders.get())
+
+
+def _emit(item: Span) -> None:
+    for spans in _recorders.get():
+        spans.append(item)
+    hook = _hook
+    if hook is not None:
+        try:
+            hook(item)
+        except Exception:
+            logger.exception("ducpy instrumentation hook failed for %s", item.name)
+
+
+@contextlib.contextmanager
+def span(operation: str, phase: str) -> Iterator[_Timer]:
+    """Time the enclosed block as *phase* of *operation*.
+
+    The yielded object's ``bytes`` attribute may be set to report a size.
+    When no hook or recorder is active the block runs untimed.
+    """
+    timer = _Timer()
+    if not _enabled():
+        yield timer
+        return
+    ok = False
+    start = time.perf_counter()
+    try:
+        yield timer
+        ok = True
+    finally:
+        _emit(Span(operation, phase, time.perf_counter() - start, timer.bytes, ok))
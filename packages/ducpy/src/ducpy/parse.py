@@ -8,11 +8,14 @@ via DucData wrapper.
 from __future__ import annotations
 
 import logging
+from collections.abc import MutableMapping, Sequence
+import os
 from os import PathLike, fspath
-from typing import Any, List, Union
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
 import ducpy_native
-from ducpy.utils.convert import deep_camel_to_snake
+from ducpy.instrumentation import span
+from ducpy.utils.convert import camel_to_snake, deep_camel_to_snake
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +48,218 @@ def _wrap(obj: Any) -> Any:
     return obj
 
 
+class LazyDucData(MutableMapping):
+    """Read-through view over a native camelCase dict.
+
+    Keys are renamed to snake_case and nested dicts/lists are wrapped only when
+    they are accessed, so a document is never copied up front. Offers the same
+    attribute-style API as :class:`DucData`; call :meth:`materialize` to get a
+    regular :class:`DucData` tree.
+    """
+
+    __slots__ = ("_raw", "_keys", "_values")
+
+    def __init__(self, raw: Dict[str, Any]):
+        object.__setattr__(self, "_raw", raw)
+        object.__setattr__(self, "_keys", None)
+        object.__setattr__(self, "_values", {})
+
+    def _key_map(self) -> Dict[str, Optional[str]]:
+        # snake_case key -> raw camelCase key (None for keys set on the view)
+        keys = self._keys
+        if keys is None:
+            keys = {camel_to_snake(k): k for k in self._raw}
+            object.__setattr__(self, "_keys", keys)
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        values = self._values
+        if key in values:
+            return values[key]
+        raw_key = self._key_map()[key]
+        value = _wrap_lazy(self._raw[raw_key])
+        values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        keys = self._key_map()
+        if key not in keys:
+            keys[key] = None
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._key_map()[key]
+        self._values.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_map())
+
+    def __len__(self) -> int:
+        return len(self._key_map())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_map()
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        self[key] = value
+
+    def __delattr__(self, key: str) -> None:
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __repr__(self) -> str:
+        return f"LazyDucData({sorted(self._key_map())!r})"
+
+    def materialize(self) -> DucData:
+        """Return a fully converted :class:`DucData` copy of this view."""
+        return _materialize(self)
+
+
+class LazyDucList(Sequence):
+    """Sequence view that wraps list items lazily (see :class:`LazyDucData`)."""
+
+    __slots__ = ("_raw", "_items")
+
+    def __init__(self, raw: List[Any]):
+        self._raw = raw
+        self._items: Dict[int, Any] = {}
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._raw)))]
+        size = len(self._raw)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("LazyDucList index out of range")
+        items = self._items
+        if index in items:
+            return items[index]
+        value = _wrap_lazy(self._raw[index])
+        items[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyDucList)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyDucList(len={len(self._raw)})"
+
+    def materialize(self) -> List[Any]:
+        """Return a fully converted list copy of this view."""
+        return _materialize(self)
+
+
+def _wrap_lazy(obj: Any) -> Any:
+    """Wrap one level of a native value as a lazy view."""
+    if isinstance(obj, dict):
+        return LazyDucData(obj)
+    if isinstance(obj, list):
+        return LazyDucList(obj)
+    return obj
+
+
+def _is_untouched(view: LazyDucData) -> bool:
+    """True when *view* still mirrors its raw dict (nothing read, set or deleted)."""
+    keys = view._keys
+    if view._values:
+        return False
+    return keys is None or (len(keys) == len(view._raw) and None not in keys.values())
+
+
+def _materialize(obj: Any) -> Any:
+    if isinstance(obj, LazyDucData):
+        if _is_untouched(obj):
+            return _wrap(deep_camel_to_snake(obj._raw))
+        return DucData({k: _materialize(obj[k]) for k in obj})
+    if isinstance(obj, LazyDucList):
+        if not obj._items:
+            return _wrap(deep_camel_to_snake(obj._raw))
+        return [_materialize(item) for item in obj]
+    return _wrap(obj)
+
+
 PathInput = Union[str, PathLike[str]]
+# Bytes-like ``.duc`` content: ``bytes``, ``bytearray``, ``memoryview``, ``mmap.mmap``
+# or any other object exposing the buffer protocol.
+BufferInput = Union[bytes, bytearray, memoryview]
+DucInput = Union[PathInput, BufferInput]
+
+# Top-level sections selectable with ``include`` / ``exclude``, mapped to the
+# native (camelCase) keys each one populates.
+DUC_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "thumbnail": ("thumbnail",),
+    "dictionary": ("dictionary",),
+    "charter": ("charter",),
+    "issues": ("issues",),
+    "global_state": ("globalState",),
+    "local_state": ("localState",),
+    "layers": ("layers",),
+    "groups": ("groups",),
+    "regions": ("regions",),
+    "blocks": ("blocks", "blockInstances", "blockCollections"),
+    "elements": ("elements",),
+    "version_graph": ("versionGraph",),
+    "files": ("files",),
+}
+
+_SECTION_ALIASES: Dict[str, str] = {
+    "duc_global_state": "global_state",
+    "duc_local_state": "local_state",
+    "block_instances": "blocks",
+    "block_collections": "blocks",
+    "external_files": "files",
+}
+
+SectionInput = Optional[Union[str, Iterable[str]]]
+
+
+def _section_names(names: SectionInput) -> List[str]:
+    if isinstance(names, str):
+        names = (names,)
+    resolved = []
+    for name in names or ():
+        # Accept the native camelCase names too, e.g. "versionGraph".
+        key = camel_to_snake(name)
+        canonical = _SECTION_ALIASES.get(key, key)
+        if canonical not in DUC_SECTIONS:
+            raise ValueError(
+                f"Unknown .duc section {name!r}; expected one of: {', '.join(DUC_SECTIONS)}"
+            )
+        resolved.append(canonical)
+    return resolved
+
+
+def _resolve_sections(include: SectionInput, exclude: SectionInput) -> Optional[FrozenSet[str]]:
+    """Return the selected section names, or ``None`` when every section is selected."""
+    if include is None and exclude is None:
+        return None
+    selected = set(_section_names(include)) if include is not None else set(DUC_SECTIONS)
+    selected.difference_update(_section_names(exclude))
+    if len(selected) == len(DUC_SECTIONS):
+        return None
+    return frozenset(selected)
+
+
+def _drop_unselected(raw: Dict[str, Any], sections: FrozenSet[str]) -> Dict[str, Any]:
+    for name, keys in DUC_SECTIONS.items():
+        if name not in sections:
+            for key in keys:
+                raw.pop(key, None)
+    return raw
 
 
 def _path(source: PathInput) -> str:
@@ -54,22 +268,78 @@ def _path(source: PathInput) -> str:
     return fspath(source)
 
 
-def parse_duc(source: PathInput) -> DucData:
+def _source(source: DucInput) -> Any:
+    """Return a path string, or the buffer itself so the native side reads it in place."""
+    if isinstance(source, (str, PathLike)):
+        return fspath(source)
+    try:
+        memoryview(source).release()
+    except TypeError:
+        raise TypeError(
+            "Expected a .duc path or a bytes-like object (bytes, memoryview, mmap), "
+            f"got {type(source).__name__}"
+        ) from None
+    return source
+
+
+def _input_size(source: DucInput) -> Optional[int]:
+    if isinstance(source, (str, PathLike)):
+        try:
+            return os.path.getsize(source)
+        except OSError:
+            return None
+    with memoryview(source) as view:
+        return view.nbytes
+
+
+def _parse_raw(source: DucInput, include: SectionInput, exclude: SectionInput) -> Dict[str, Any]:
+    """Return the native (camelCase) parse result for the selected sections."""
+    sections = _resolve_sections(include, exclude)
+    if sections is None:
+        return ducpy_native.parse_duc(_source(source))
+    return _drop_unselected(
+        ducpy_native.parse_duc(_source(source), include=sorted(sections)),
+        sections,
+    )
+
+
+def parse_duc(
+    source: DucInput,
+    lazy: bool = False,
+    include: SectionInput = None,
+    exclude: SectionInput = None,
+) -> Union[DucData, LazyDucData]:
     """Parse a ``.duc`` file into a :class:`DucData` dict.
 
-    This function streams a `.duc` file path through the Rust native extension.
+    This function streams a `.duc` file path, or an in-memory buffer, through
+    the Rust native extension.
     It returns a specialized dictionary (`DucData`)
     that allows attribute-style access to the parsed properties (e.g. `data.elements[0].id`),
     using `snake_case` keys instead of the internal `camelCase` format.
 
     Parameters
     ----------
-    source : str | PathLike
-        Path to a ``.duc`` file.
+    source : str | PathLike | bytes | bytearray | memoryview | mmap.mmap
+        Path to a ``.duc`` file, or its content as any bytes-like object.
+        Contiguous buffers are read in place by the native extension, so a
+        document fetched from object storage or an HTTP body (or an ``mmap``
+        of a file) is parsed without being copied or written to disk first.
+    lazy : bool, default=False
+        Return a :class:`LazyDucData` view instead of converting the whole
+        document up front. Keys are renamed and nested objects wrapped only
+        when accessed, which keeps peak memory close to the native result on
+        large drawings.
+    include : str | Iterable[str], optional
+        Only read these top-level sections (see :data:`DUC_SECTIONS`), e.g.
+        ``include=("elements", "layers")``; camelCase spellings such as
+        ``"versionGraph"`` are accepted too. Unselected tables are never
+        queried and their keys are absent from the result.
+    exclude : str | Iterable[str], optional
+        Skip these sections; applied after ``include``.
 
     Returns
     -------
-    DucData
+    DucData | LazyDucData
         An attribute-accessible dictionary matching the internal `ExportedDataState` 
         schema with snake_case keys. Common keys include `elements`, `duc_global_state`, 
         `duc_local_state`, and `version_graph`.
@@ -79,16 +349,27 @@ def parse_duc(source: PathInput) -> DucData:
     >>> data = duc.parse_duc("path/to/file.duc")
     >>> print(f"Found {len(data.elements)} elements")
     >>> print(f"First element type: {data.elements[0].type}")
+    >>> geometry = duc.parse_duc("path/to/file.duc", include=("elements", "layers"))
+    >>> data = duc.parse_duc(response.content)
     """
-    raw = ducpy_native.parse_duc(_path(source))
-    return _wrap(deep_camel_to_snake(raw))
+    with span("parse_duc", "total") as total:
+        with span("parse_duc", "read") as read:
+            raw = _parse_raw(source, include, exclude)
+            read.bytes = total.bytes = _input_size(source)
+        if lazy:
+            return LazyDucData(raw)
+        with span("parse_duc", "convert"):
+            return _wrap(deep_camel_to_snake(raw))
 
 
 def list_external_files(
-    source: PathInput,
+    source: DucInput,
 ) -> List[DucData]:
-    """List metadata for all external files (without data blobs)."""
-    raw = ducpy_native.list_external_files(_path(source))
+    """List metadata for all external files (without data blobs).
+
+    *source* is a ``.duc`` path or bytes-like content, as in :func:`parse_duc`.
+    """
+    raw = ducpy_native.list_external_files(_source(source))
     return _wrap(deep_camel_to_snake(raw))
 
 
@@ -98,11 +379,13 @@ def stream_external_file_revision_to_path(
     output_path: PathInput,
 ) -> int:
     """Stream an external file revision from a ``.duc`` file into ``output_path``."""
-    return ducpy_native.stream_external_file_revision_to_path(
-        _path(source),
-        revision_id,
-        _path(output_path),
-    )
+    with span("stream_external_file_revision_to_path", "total") as total:
+        total.bytes = ducpy_native.stream_external_file_revision_to_path(
+            _path(source),
+            revision_id,
+            _path(output_path),
+        )
+    return total.bytes
 
 
 def stream_checkpoint_data_to_path(
@@ -111,11 +394,13 @@ def stream_checkpoint_data_to_path(
     output_path: PathInput,
 ) -> int:
     """Stream checkpoint data from a ``.duc`` file into ``output_path``."""
-    return ducpy_native.stream_checkpoint_data_to_path(
-        _path(source),
-        checkpoint_id,
-        _path(output_path),
-    )
+    with span("stream_checkpoint_data_to_path", "total") as total:
+        total.bytes = ducpy_native.stream_checkpoint_data_to_path(
+            _path(source),
+            checkpoint_id,
+            _path(output_path),
+        )
+    return total.bytes
 
 
 def stream_delta_changeset_to_path(
@@ -124,8 +409,10 @@ def stream_delta_changeset_to_path(
     output_path: PathInput,
 ) -> int:
     """Stream delta changeset data from a ``.duc`` file into ``output_path``."""
-    return ducpy_native.stream_delta_changeset_to_path(
-        _path(source),
-        delta_id,
-        _path(output_path),
-    )
+    with span("stream_delta_changeset_to_path", "total") as total:
+        total.bytes = ducpy_native.stream_delta_changeset_to_path(
+            _path(source),
+            delta_id,
+            _path(output_path),
+        )
+    return total.bytes
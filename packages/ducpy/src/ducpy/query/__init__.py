@@ -0,0 +1,19 @@
+"""Direct, bounded-memory queries over ``.duc`` SQLite tables."""
+
+from .elements import iter_element_batches, iter_elements
+from .peek import peek_duc
+from .spatial import (SPATIAL_INDEX_TABLE, drop_spatial_index,
+                      ensure_spatial_index, has_spatial_index,
+                      nearest_elements, query_elements_in_rect)
+
+__all__ = [
+    "SPATIAL_INDEX_TABLE",
+    "drop_spatial_index",
+    "ensure_spatial_index",
+    "has_spatial_index",
+    "iter_element_batches",
+    "iter_elements",
+    "nearest_elements",
+    "peek_duc",
+    "query_elements_in_rect",
+]
@@ -0,0 +1,28 @@
+"""Shared helpers for opening a ``.duc`` path or an existing :class:`DucSQL`."""
+
+from __future__ import annotations
+
+import contextlib
+from os import PathLike, fspath
+from typing import Iterator, Union
+
+from ..builders.sql_builder import DucSQL
+
+DucSource = Union[str, PathLike, DucSQL]
+
+
+@contextlib.contextmanager
+def open_duc_source(source: DucSource, writable: bool = False) -> Iterator[DucSQL]:
+    """Yield a :class:`DucSQL` for *source*.
+
+    A ``DucSQL`` passed in is used as-is and left open; a path is opened for
+    the duration of the ``with`` block and closed afterwards. Paths are opened
+    with :meth:`DucSQL.open_readonly` unless *writable*, so read helpers never
+    switch the caller's file to WAL or migrate it in place.
+    """
+    if isinstance(source, DucSQL):
+        yield source
+        return
+    path = fspath(source)
+    with (DucSQL(path) if writable else DucSQL.open_readonly(path)) as db:
+        yield db
@@ -0,0 +1,227 @@
+"""Stream elements straight from the ``.duc`` SQLite tables.
+
+Unlike :func:`ducpy.parse_duc`, nothing here builds the full
+``ExportedDataState``: rows are read with a single cursor, one page at a time,
+so memory stays bounded by ``batch_size`` regardless of drawing size.
+
+Each element is a :class:`~ducpy.parse.DucData` with the same snake_case base
+keys as ``parse_duc`` (``id``, ``type``, ``x``, ``y``, ``layer_id`` …). With
+``details=True`` the type-specific satellite row (``element_text``,
+``element_linear`` …) is merged in and linear/freedraw elements get a
+``points`` list. Styles, memberships and bindings are not resolved; use
+``parse_duc`` when the full object graph is needed.
+
+Usage::
+
+    import ducpy as duc
+
+    for element in duc.iter_elements("site.duc", where="element_type = ?", params=("text",)):
+        print(element.id, element.text)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from ..parse import DucData
+from ._source import DucSource, open_duc_source
+
+__all__ = ["iter_element_batches", "iter_elements"]
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Base ``elements`` columns, renamed to the keys produced by ``parse_duc``.
+_BASE_COLUMNS = (
+    ("id", "id"),
+    ("element_type", "type"),
+    ("x", "x"),
+    ("y", "y"),
+    ("width", "width"),
+    ("height", "height"),
+    ("angle", "angle"),
+    ("scope", "scope"),
+    ("label", "label"),
+    ("description", "description"),
+    ("is_visible", "is_visible"),
+    ("seed", "seed"),
+    ("version", "version"),
+    ("version_nonce", "version_nonce"),
+    ("updated", "updated"),
+    ('"index"', "index"),
+    ("is_plot", "is_plot"),
+    ("is_deleted", "is_deleted"),
+    ("roundness", "roundness"),
+    ("blending", "blending"),
+    ("opacity", "opacity"),
+    ("instance_id", "instance_id"),
+    ("layer_id", "layer_id"),
+    ("frame_id", "frame_id"),
+    ("z_index", "z_index"),
+    ("link", "link"),
+    ("locked", "locked"),
+    ("custom_data", "custom_data"),
+)
+_BOOL_KEYS = frozenset({"is_visible", "is_plot", "is_deleted", "locked"})
+
+# element_type -> satellite tables holding its type-specific columns.
+_DETAIL_TABLES: Dict[str, tuple[str, ...]] = {
+    "polygon": ("element_polygon",),
+    "ellipse": ("element_ellipse",),
+    "text": ("element_text",),
+    "line": ("element_linear",),
+    "arrow": ("element_linear",),
+    "image": ("element_image",),
+    "freedraw": ("element_freedraw",),
+    "frame": ("element_stack_properties",),
+    "plot": ("element_stack_properties", "element_plot"),
+    "pdf": ("document_grid_config",),
+    "doc": ("document_grid_config", "element_doc"),
+    "table": ("document_grid_config",),
+    "model": ("element_model",),
+}
+_POINT_TABLES: Dict[str, str] = {
+    "line": "linear_element_points",
+    "arrow": "linear_element_points",
+    "freedraw": "freedraw_element_points",
+}
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds.
+_MAX_IN_PARAMS = 500
+
+
+def _chunks(values: Sequence[str], size: int = _MAX_IN_PARAMS) -> Iterator[Sequence[str]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,),
+    ).fetchone()
+    return row is not None
+
+
+def _row_to_element(row: sqlite3.Row) -> DucData:
+    element = DucData()
+    for (_column, key), value in zip(_BASE_COLUMNS, row):
+        element[key] = bool(value) if key in _BOOL_KEYS else value
+    return element
+
+
+def _attach_details(
+    conn: sqlite3.Connection,
+    batch: List[DucData],
+    existing_tables: Dict[str, bool],
+) -> None:
+    ids_by_table: Dict[str, List[str]] = {}
+    ids_by_points: Dict[str, List[str]] = {}
+    by_id = {element["id"]: element for element in batch}
+
+    for element in batch:
+        element_type = element["type"]
+        for table in _DETAIL_TABLES.get(element_type, ()):
+            ids_by_table.setdefault(table, []).append(element["id"])
+        points_table = _POINT_TABLES.get(element_type)
+        if points_table:
+            ids_by_points.setdefault(points_table, []).append(element["id"])
+            element["points"] = []
+
+    for table, ids in ids_by_table.items():
+        if table not in existing_tables:
+            existing_tables[table] = _table_exists(conn, table)
+        if not existing_tables[table]:
+            continue
+        for chunk in _chunks(ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT * FROM {table} WHERE element_id IN ({placeholders})",
+                tuple(chunk),
+            )
+            for detail in cursor:
+                element = by_id[detail["element_id"]]
+                for key in detail.keys():
+                    if key != "element_id":
+                        # Base columns win over same-named stack/satellite columns.
+                        element.setdefault(key, detail[key])
+
+    for table, ids in ids_by_points.items():
+        for chunk in _chunks(ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT element_id, x, y, mirroring FROM {table} "
+                f"WHERE element_id IN ({placeholders}) ORDER BY element_id, sort_order",
+                tuple(chunk),
+            )
+            for element_id, x, y, mirroring in cursor:
+                by_id[element_id]["points"].append(DucData(x=x, y=y, mirroring=mirroring))
+
+
+def iter_element_batches(
+    source: DucSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    where: Optional[str] = None,
+    params: Sequence[Any] = (),
+    details: bool = True,
+) -> Iterator[List[DucData]]:
+    """Yield lists of at most *batch_size* elements, in ``parse_duc`` order.
+
+    Parameters
+    ----------
+    source : str | PathLike | DucSQL
+        A ``.duc`` path, or an open :class:`DucSQL` (left open afterwards).
+    batch_size : int, default=1000
+        Number of element rows fetched and yielded per page.
+    where : str, optional
+        SQL filter over the ``elements`` table, e.g. ``"element_type = ?"``.
+    params : Sequence, optional
+        Positional parameters bound to ``?`` placeholders in *where*.
+    details : bool, default=True
+        Merge type-specific columns and point lists into each element.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be greater than zero")
+
+    columns = ", ".join(column for column, _key in _BASE_COLUMNS)
+    query = f"SELECT {columns} FROM elements"
+    if where:
+        query += f" WHERE {where}"
+    query += " ORDER BY z_index ASC, rowid ASC"
+
+    with open_duc_source(source) as db:
+        conn = db.conn
+        existing_tables: Dict[str, bool] = {}
+        cursor = conn.execute(query, tuple(params))
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                batch = [_row_to_element(row) for row in rows]
+                if details:
+                    _attach_details(conn, batch, existing_tables)
+                yield batch
+        finally:
+            cursor.close()
+
+
+def iter_elements(
+    source: DucSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    where: Optional[str] = None,
+    params: Sequence[Any] = (),
+    details: bool = True,
+) -> Iterator[DucData]:
+    """Yield elements one by one, reading *batch_size* rows at a time.
+
+    See :func:`iter_element_batches` for the parameters.
+    """
+    for batch in iter_element_batches(
+        source,
+        batch_size=batch_size,
+        where=where,
+        params=params,
+        details=details,
+    ):
+        yield from batch
@@ -0,0 +1,202 @@
+"""Cheap metadata peek for ``.duc`` files.
+
+:func:`peek_duc` answers "what is in this file?" without :func:`ducpy.parse_duc`:
+it reads the SQLite header, the single ``duc_document`` row, the layer list and
+per-type element counts (from the ``idx_elements_type`` index, without touching
+element rows).
+
+Uncompressed SQLite files are opened in place and read-only (immutable unless
+a ``-wal`` file is pending, whose pages are then read too), so a peek costs a
+few page reads regardless of file size. Gzip has no random access,
+so compressed files are inflated once in 1 MiB chunks into a temporary file and
+never held in memory or converted to Python objects; with ``header_only=True``
+decompression stops after the 100-byte SQLite header.
+
+Usage::
+
+    import ducpy as duc
+
+    info = duc.peek_duc("site.duc")
+    print(info.schema_version, info.source, info.element_counts)
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import struct
+import tempfile
+import zlib
+from contextlib import contextmanager
+from os import PathLike, fspath
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+from ..builders.sql_builder import SQLITE_HEADER_MAGIC, DucSQL, _connect_readonly
+from ..parse import DucData
+
+__all__ = ["peek_duc"]
+
+_CHUNK_SIZE = 1024 * 1024
+_HEADER_SIZE = 100
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _schema_semver(user_version: int) -> str:
+    return f"{user_version // 1_000_000}.{user_version // 1_000 % 1_000}.{user_version % 1_000}"
+
+
+def _parse_header(header: bytes) -> Dict[str, Any]:
+    if len(header) < _HEADER_SIZE or not header.startswith(SQLITE_HEADER_MAGIC):
+        raise ValueError("not a .duc file: missing SQLite header")
+    page_size = struct.unpack_from(">H", header, 16)[0]
+    user_version = struct.unpack_from(">i", header, 60)[0]
+    return {
+        "user_version": user_version,
+        "schema_version": _schema_semver(user_version),
+        "page_size": 65536 if page_size == 1 else page_size,
+        "page_count": struct.unpack_from(">I", header, 28)[0],
+    }
+
+
+def _inflater(first: bytes) -> "zlib._Decompress":
+    # gzip magic -> gzip; otherwise legacy raw deflate (as in DucSQL)
+    wbits = 16 + zlib.MAX_WBITS if first.startswith(_GZIP_MAGIC) else -zlib.MAX_WBITS
+    return zlib.decompressobj(wbits)
+
+
+def _inflate_header(handle: BinaryIO, first: bytes) -> bytes:
+    inflater = _inflater(first)
+    header = inflater.decompress(first, _HEADER_SIZE)
+    while len(header) < _HEADER_SIZE:
+        chunk = inflater.unconsumed_tail or handle.read(64 * 1024)
+        if not chunk:
+            break
+        header += inflater.decompress(chunk, _HEADER_SIZE - len(header))
+    return header
+
+
+def _inflate_to_file(handle: BinaryIO, first: bytes, out: BinaryIO) -> None:
+    inflater = _inflater(first)
+    chunk = first
+    while chunk:
+        out.write(inflater.decompress(chunk))
+        chunk = handle.read(_CHUNK_SIZE)
+    out.write(inflater.flush())
+
+
+@contextmanager
+def _open_sqlite(path: str) -> Iterator[sqlite3.Connection]:
+    """Open *path* read-only, inflating it into a temp file when compressed."""
+    temp_path: Optional[str] = None
+    with open(path, "rb") as handle:
+        first = handle.read(_CHUNK_SIZE)
+        if first.startswith(SQLITE_HEADER_MAGIC):
+            target = path
+        else:
+            fd, temp_path = tempfile.mkstemp(prefix="ducpy-peek-", suffix=".sqlite")
+            with os.fdopen(fd, "wb") as out:
+                _inflate_to_file(handle, first, out)
+                # A standalone image never carries its -wal sidecar.
+                out.seek(18)
+                out.write(b"\x01\x01")
+            target = temp_path
+    try:
+        # A file DucSQL is still writing keeps recent pages in its -wal.
+        conn = _connect_readonly(target)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    finally:
+        if temp_path is not None:
+            os.unlink(temp_path)
+
+
+def _read_metadata(conn: sqlite3.Connection, thumbnail: bool) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    thumb = "thumbnail" if thumbnail else "NULL"
+    row = conn.execute(
+        f"SELECT id, version, source, data_type, {thumb} FROM duc_document LIMIT 1"
+    ).fetchone()
+    info["id"], info["version"], info["source"], info["data_type"], info["thumbnail"] = (
+        row if row is not None else (None, None, None, None, None)
+    )
+
+    # Covering-index count per type, minus the (few) deleted rows.
+    counts = dict(
+        conn.execute(
+            "SELECT element_type, count(*) FROM elements GROUP BY element_type"
+        ).fetchall()
+    )
+    for element_type, deleted in conn.execute(
+        "SELECT element_type, count(*) FROM elements WHERE is_deleted = 1 GROUP BY element_type"
+    ):
+        counts[element_type] -= deleted
+    info["element_counts"] = {k: v for k, v in sorted(counts.items()) if v}
+    info["element_total"] = sum(info["element_counts"].values())
+
+    info["layers"] = [
+        DucData(id=layer_id, label=label, is_visible=bool(visible), locked=bool(locked),
+                readonly=bool(readonly))
+        for layer_id, label, visible, locked, readonly in conn.execute(
+            "SELECT l.id, s.label, s.is_visible, s.locked, l.readonly "
+            "FROM layers AS l JOIN stack_properties AS s ON s.id = l.id ORDER BY l.id"
+        )
+    ]
+    return info
+
+
+def peek_duc(
+    source: Union[str, PathLike, DucSQL],
+    thumbnail: bool = True,
+    header_only: bool = False,
+) -> DucData:
+    """Read ``.duc`` metadata without parsing the document.
+
+    Parameters
+    ----------
+    source : str | PathLike | DucSQL
+        A ``.duc`` path (compressed or raw SQLite) or an open :class:`DucSQL`.
+    thumbnail : bool, default=True
+        Include the thumbnail bytes.
+    header_only : bool, default=False
+        Only return the SQLite header fields (``user_version``,
+        ``schema_version``, ``page_size``, ``page_count``), decompressing
+        nothing past the first 100 bytes.
+
+    Returns
+    -------
+    DucData
+        ``user_version``, ``schema_version`` (semver string), ``page_size``,
+        ``page_count``, ``compressed``, the ``duc_document`` fields (``id``,
+        ``version``, ``source``, ``data_type``, ``thumbnail``),
+        ``element_counts`` (non-deleted elements by type), ``element_total``
+        and ``layers`` (``id``, ``label``, ``is_visible``, ``locked``,
+        ``readonly``).
+    """
+    if isinstance(source, DucSQL):
+        conn = source.conn
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        info = DucData(
+            user_version=user_version,
+            schema_version=_schema_semver(user_version),
+            page_size=conn.execute("PRAGMA page_size").fetchone()[0],
+            page_count=conn.execute("PRAGMA page_count").fetchone()[0],
+            compressed=False,
+        )
+        if not header_only:
+            info.update(_read_metadata(conn, thumbnail))
+        return info
+
+    path = fspath(source)
+    with open(path, "rb") as handle:
+        first = handle.read(64 * 1024)
+        compressed = not first.startswith(SQLITE_HEADER_MAGIC)
+        header = _inflate_header(handle, first) if compressed else first
+    info = DucData(_parse_header(header), compressed=compressed)
+    if header_only:
+        return info
+
+    with _open_sqlite(path) as conn:
+        info.update(_read_metadata(conn, thumbnail))
+    return info
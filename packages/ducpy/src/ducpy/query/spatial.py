@@ -0,0 +1,360 @@
+"""R*Tree spatial index and viewport queries for ``.duc`` elements.
+
+The index is an opt-in SQLite R*Tree virtual table (``elements_rtree``) kept in
+sync with ``elements`` by triggers, keyed by the element ``rowid``. It stores
+an axis-aligned box per non-deleted element: exact for unrotated elements and
+a conservative rotation-safe box otherwise.
+
+The index is not part of the canonical schema: files without it stay readable
+everywhere, and the query helpers fall back to a table scan when it is absent.
+Writers that insert into ``elements`` need an SQLite build with R*Tree support
+(the default for Python and the bundled Rust driver).
+
+Usage::
+
+    import ducpy as duc
+
+    with duc.DucSQL("site.duc") as db:
+        duc.ensure_spatial_index(db)
+        visible = duc.query_elements_in_rect(db, 0, 0, 5000, 3000, layer="walls")
+        closest = duc.nearest_elements(db, 120.0, 80.0, k=5)
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+from ..parse import DucData
+from ._source import DucSource, open_duc_source
+
+__all__ = [
+    "SPATIAL_INDEX_TABLE",
+    "drop_spatial_index",
+    "ensure_spatial_index",
+    "has_spatial_index",
+    "nearest_elements",
+    "query_elements_in_rect",
+]
+
+SPATIAL_INDEX_TABLE = "elements_rtree"
+
+_RTREE_CELL_RE = re.compile(r"\{([^}]*)\}")
+
+
+# Box expressions over an ``elements`` row alias. Rotated elements get the box
+# of their centre ± (|w| + |h|) / 2, which contains the rotated rectangle at any
+# angle and needs no SQL math functions (so every SQLite build can run the
+# triggers).
+def _bounds_sql(alias: str) -> Tuple[str, str, str, str]:
+    x, y, w, h, a = (f"{alias}.{c}" for c in ("x", "y", "width", "height", "angle"))
+    reach = f"(abs({w}) + abs({h})) / 2.0"
+    cx = f"({x} + {w} / 2.0)"
+    cy = f"({y} + {h} / 2.0)"
+    return (
+        f"CASE WHEN {a} = 0 THEN min({x}, {x} + {w}) ELSE {cx} - {reach} END",
+        f"CASE WHEN {a} = 0 THEN max({x}, {x} + {w}) ELSE {cx} + {reach} END",
+        f"CASE WHEN {a} = 0 THEN min({y}, {y} + {h}) ELSE {cy} - {reach} END",
+        f"CASE WHEN {a} = 0 THEN max({y}, {y} + {h}) ELSE {cy} + {reach} END",
+    )
+
+
+def _spatial_index_sql() -> str:
+    new_bounds = ", ".join(_bounds_sql("new"))
+    row_bounds = ", ".join(_bounds_sql("elements"))
+    table = SPATIAL_INDEX_TABLE
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING rtree(id, min_x, max_x, min_y, max_y);
+
+CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON elements
+WHEN new.is_deleted = 0
+BEGIN
+    INSERT OR REPLACE INTO {table} (id, min_x, max_x, min_y, max_y)
+    VALUES (new.rowid, {new_bounds});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_update
+AFTER UPDATE OF x, y, width, height, angle, is_deleted ON elements
+BEGIN
+    DELETE FROM {table} WHERE id = old.rowid;
+    INSERT INTO {table} (id, min_x, max_x, min_y, max_y)
+    SELECT new.rowid, {new_bounds} WHERE new.is_deleted = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON elements
+BEGIN
+    DELETE FROM {table} WHERE id = old.rowid;
+END;
+
+INSERT OR REPLACE INTO {table} (id, min_x, max_x, min_y, max_y)
+SELECT elements.rowid, {row_bounds}
+FROM elements
+WHERE elements.is_deleted = 0
+  AND elements.rowid NOT IN (SELECT id FROM {table});
+"""
+
+
+def has_spatial_index(conn: sqlite3.Connection) -> bool:
+    """Return whether the ``elements_rtree`` index exists in *conn*."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (SPATIAL_INDEX_TABLE,),
+    ).fetchone()
+    return row is not None
+
+
+def ensure_spatial_index(source: DucSource) -> None:
+    """Create (or complete) the R*Tree index and its sync triggers, then commit.
+
+    Idempotent: existing rows are kept and only missing elements are added.
+    """
+    with open_duc_source(source, writable=True) as db:
+        db.conn.executescript(_spatial_index_sql())
+        db.commit()
+
+
+def drop_spatial_index(source: DucSource) -> None:
+    """Remove the R*Tree index and its triggers."""
+    table = SPATIAL_INDEX_TABLE
+    with open_duc_source(source, writable=True) as db:
+        db.conn.executescript(
+            f"""
+            DROP TRIGGER IF EXISTS {table}_insert;
+            DROP TRIGGER IF EXISTS {table}_update;
+            DROP TRIGGER IF EXISTS {table}_delete;
+            DROP TABLE IF EXISTS {table};
+            """
+        )
+        db.commit()
+
+
+def _as_tuple(value: Optional[Union[str, Iterable[str]]]) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+_RESULT_COLUMNS = (
+    "e.id, e.element_type, e.layer_id, e.x, e.y, e.width, e.height, e.angle, e.z_index"
+)
+
+
+def _filters(layer: Tuple[str, ...], types: Tuple[str, ...]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if layer:
+        clauses.append(f"e.layer_id IN ({','.join('?' * len(layer))})")
+        params.extend(layer)
+    if types:
+        clauses.append(f"e.element_type IN ({','.join('?' * len(types))})")
+        params.extend(types)
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def _to_element(row: sqlite3.Row) -> DucData:
+    return DucData(
+        id=row[0],
+        type=row[1],
+        layer_id=row[2],
+        x=row[3],
+        y=row[4],
+        width=row[5],
+        height=row[6],
+        angle=row[7],
+        z_index=row[8],
+        min_x=row[9],
+        max_x=row[10],
+        min_y=row[11],
+        max_y=row[12],
+    )
+
+
+def _query_rect(
+    conn: sqlite3.Connection,
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+    layer: Tuple[str, ...],
+    types: Tuple[str, ...],
+    contained: bool,
+    indexed: bool,
+) -> List[DucData]:
+    min_x, max_x = min(x0, x1), max(x0, x1)
+    min_y, max_y = min(y0, y1), max(y0, y1)
+    extra, extra_params = _filters(layer, types)
+
+    if indexed:
+        source = (
+            f"SELECT {_RESULT_COLUMNS}, r.min_x, r.max_x, r.min_y, r.max_y "
+            f"FROM {SPATIAL_INDEX_TABLE} AS r JOIN elements AS e ON e.rowid = r.id"
+        )
+        box = ("r.min_x", "r.max_x", "r.min_y", "r.max_y")
+        where = "1 = 1"
+    else:
+        box = _bounds_sql("e")
+        source = (
+            f"SELECT {_RESULT_COLUMNS}, {', '.join(box)} FROM elements AS e"
+        )
+        where = "e.is_deleted = 0"
+
+    if contained:
+        where += (
+            f" AND {box[0]} >= ? AND {box[1]} <= ? AND {box[2]} >= ? AND {box[3]} <= ?"
+        )
+    else:
+        where += (
+            f" AND {box[1]} >= ? AND {box[0]} <= ? AND {box[3]} >= ? AND {box[2]} <= ?"
+        )
+    params: List[Any] = [min_x, max_x, min_y, max_y] + extra_params
+    query = f"{source} WHERE {where}{extra} ORDER BY e.z_index ASC, e.rowid ASC"
+    return [_to_element(row) for row in conn.execute(query, params)]
+
+
+def query_elements_in_rect(
+    source: DucSource,
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+    layer: Optional[Union[str, Iterable[str]]] = None,
+    types: Optional[Union[str, Iterable[str]]] = None,
+    contained: bool = False,
+) -> List[DucData]:
+    """Return non-deleted elements whose bounds overlap the rectangle, in z order.
+
+    Parameters
+    ----------
+    source : str | PathLike | DucSQL
+        A ``.duc`` path or an open :class:`DucSQL`.
+    x0, y0, x1, y1 : float
+        Two opposite corners of the query rectangle (any order).
+    layer : str | Iterable[str], optional
+        Only return elements on these layer ids.
+    types : str | Iterable[str], optional
+        Only return these element types (``"rectangle"``, ``"line"`` …).
+    contained : bool, default=False
+        Require the element bounds to lie fully inside the rectangle.
+
+    Returns
+    -------
+    list[DucData]
+        One entry per element with ``id``, ``type``, ``layer_id``, the
+        transform columns, ``z_index`` and its ``min_x``/``max_x``/``min_y``/``max_y``
+        bounds. Uses the R*Tree when present, otherwise scans ``elements``.
+    """
+    with open_duc_source(source) as db:
+        return _query_rect(
+            db.conn,
+            x0,
+            y0,
+            x1,
+            y1,
+            _as_tuple(layer),
+            _as_tuple(types),
+            contained,
+            has_spatial_index(db.conn),
+        )
+
+
+def _box_distance(x: float, y: float, element: DucData) -> float:
+    dx = max(element.min_x - x, 0.0, x - element.max_x)
+    dy = max(element.min_y - y, 0.0, y - element.max_y)
+    return math.hypot(dx, dy)
+
+
+def nearest_elements(
+    source: DucSource,
+    x: float,
+    y: float,
+    k: int = 1,
+    layer: Optional[Union[str, Iterable[str]]] = None,
+    types: Optional[Union[str, Iterable[str]]] = None,
+    initial_radius: float = 1.0,
+) -> List[DucData]:
+    """Return the *k* elements whose bounds are closest to ``(x, y)``.
+
+    Distance is measured to the element's bounding box (``0`` when the point
+    is inside it) and is stored on each result as ``distance``. The search
+    window starts at *initial_radius* and doubles until *k* elements are
+    known to be nearest, so each step is a bounded R*Tree range query.
+    """
+    if k <= 0:
+        raise ValueError("k must be greater than zero")
+    if initial_radius <= 0:
+        raise ValueError("initial_radius must be greater than zero")
+
+    layers, element_types = _as_tuple(layer), _as_tuple(types)
+    with open_duc_source(source) as db:
+        conn = db.conn
+        indexed = has_spatial_index(conn)
+        radius = float(initial_radius)
+        extent: Optional[Tuple[float, float, float, float]] = None
+
+        while True:
+            candidates = _query_rect(
+                conn, x - radius, y - radius, x + radius, y + radius,
+                layers, element_types, False, indexed,
+            )
+            for candidate in candidates:
+                candidate.distance = _box_distance(x, y, candidate)
+            candidates.sort(key=lambda item: (item.distance, item.z_index))
+            # Boxes overlapping the square include every box within `radius`.
+            within = [c for c in candidates if c.distance <= radius]
+            if len(within) >= k:
+                return within[:k]
+
+            if extent is None:
+                extent = _extent(conn, indexed)
+                if extent is None:
+                    return []
+            min_x, max_x, min_y, max_y = extent
+            if (
+                x - radius <= min_x and x + radius >= max_x
+                and y - radius <= min_y and y + radius >= max_y
+            ):
+                return candidates[:k]
+            radius *= 2.0
+
+
+def _root_extent(conn: sqlite3.Connection) -> Optional[Tuple[float, float, float, float]]:
+    """Read the overall extent from the R*Tree root node instead of scanning it."""
+    row = conn.execute(
+        f"SELECT rtreenode(2, data) FROM {SPATIAL_INDEX_TABLE}_node WHERE nodeno = 1"
+    ).fetchone()
+    boxes = [
+        tuple(float(value) for value in match.split()[1:])
+        for match in _RTREE_CELL_RE.findall(row[0] if row else "")
+    ]
+    if not boxes:
+        return None
+    return (
+        min(box[0] for box in boxes),
+        max(box[1] for box in boxes),
+        min(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _extent(conn: sqlite3.Connection, indexed: bool) -> Optional[Tuple[float, float, float, float]]:
+    if indexed:
+        try:
+            return _root_extent(conn)
+        except sqlite3.OperationalError:
+            pass  # rtreenode() unavailable; fall back to scanning the index
+        row = conn.execute(
+            f"SELECT min(min_x), max(max_x), min(min_y), max(max_y) FROM {SPATIAL_INDEX_TABLE}"
+        ).fetchone()
+    else:
+        box = _bounds_sql("e")
+        row = conn.execute(
+            f"SELECT min({box[0]}), max({box[1]}), min({box[2]}), max({box[3]}) "
+            "FROM elements AS e WHERE e.is_deleted = 0"
+        ).fetchone()
+    if row is None or row[0] is None:
+        return None
+    return float(row[0]), float(row[1]), float(row[2]), float(row[3])
@@ -29,6 +29,7 @@ from pathlib import Path
 from typing import Any
 
 from ..builders.sql_builder import DucSQL
+from ..instrumentation import span
 from ..parse import parse_duc
 from .search_external_files import (
     ExternalFileSearchTarget,
@@ -922,65 +923,72 @@ def search_duc_elements(
 ) -> DucSearchResponse:
     """Search DUC elements and export ordered results to JSON."""
 
-    duc_file = Path(duc_path)
-    if not duc_file.exists():
-        raise FileNotFoundError(f"DUC file not found: {duc_file}")
-    if limit <= 0:
-        raise ValueError("limit must be greater than zero")
-
-    destination = Path(output_path) if output_path else _default_output_path(duc_file, query)
-    use_external_search = bool(
-        search_all_external_files
-        or external_file_targets
-        or external_file_element_ids
-    )
+    with span("search_duc_elements", "total"):
+        duc_file = Path(duc_path)
+        if not duc_file.exists():
+            raise FileNotFoundError(f"DUC file not found: {duc_file}")
+        if limit <= 0:
+            raise ValueError("limit must be greater than zero")
+
+        destination = Path(output_path) if output_path else _default_output_path(duc_file, query)
+        use_external_search = bool(
+            search_all_external_files
+            or external_file_targets
+            or external_file_element_ids
+        )
 
-    try:
-        with DucSQL(duc_file) as db:
-            resolved_external_targets = resolve_external_file_search_targets(
-                db.conn,
+        try:
+            with span("search_duc_elements", "open"):
+                db = DucSQL(duc_file)
+            with db:
+                resolved_external_targets = resolve_external_file_search_targets(
+                    db.conn,
+                    search_all_external_files=search_all_external_files,
+                    external_file_targets=external_file_targets,
+                    external_file_element_ids=external_file_element_ids,
+                ) if use_external_search else ()
+                with span("search_duc_elements", "index_external_files"):
+                    external_text_by_revision = ensure_external_file_search_index(
+                        db.conn,
+                        targets=resolved_external_targets,
+                        ocr_language=ocr_language,
+                    ) if resolved_external_targets else {}
+                with span("search_duc_elements", "query"):
+                    candidates = _collect_candidates(
+                        db.conn,
+                        query,
+                        limit_per_source=max(limit * 3, 25),
+                        external_targets=resolved_external_targets,
+                        external_text_by_revision=external_text_by_revision,
+                    )[:limit]
+                    file_id_map = _resolve_file_ids(db.conn, [candidate.element_id for candidate in candidates])
+                    for candidate in candidates:
+                        candidate.file_id = file_id_map.get(candidate.element_id)
+
+                all_element_ids, results = _build_result_payloads(candidates)
+                response = DucSearchResponse(
+                    query=query,
+                    results=results,
+                    total_hits=len(all_element_ids),
+                    all_element_ids=all_element_ids,
+                    output_path=str(destination),
+                )
+                with span("search_duc_elements", "write") as write:
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    destination.write_text(
+                        json.dumps(response.to_dict(), indent=2, ensure_ascii=False),
+                        encoding="utf-8",
+                    )
+                    write.size_of(str(destination))
+                return response
+        except sqlite3.DatabaseError:
+            return _search_non_sqlite_duc(
+                duc_file,
+                query,
+                output_path=destination,
+                limit=limit,
+                ocr_language=ocr_language,
                 search_all_external_files=search_all_external_files,
                 external_file_targets=external_file_targets,
                 external_file_element_ids=external_file_element_ids,
-            ) if use_external_search else ()
-            external_text_by_revision = ensure_external_file_search_index(
-                db.conn,
-                targets=resolved_external_targets,
-                ocr_language=ocr_language,
-            ) if resolved_external_targets else {}
-            candidates = _collect_candidates(
-                db.conn,
-                query,
-                limit_per_source=max(limit * 3, 25),
-                external_targets=resolved_external_targets,
-                external_text_by_revision=external_text_by_revision,
-            )[:limit]
-            file_id_map = _resolve_file_ids(db.conn, [candidate.element_id for candidate in candidates])
-            for candidate in candidates:
-                candidate.file_id = file_id_map.get(candidate.element_id)
-
-            all_element_ids, results = _build_result_payloads(candidates)
-            response = DucSearchResponse(
-                query=query,
-                results=results,
-                total_hits=len(all_element_ids),
-                all_element_ids=all_element_ids,
-                output_path=str(destination),
             )
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            destination.write_text(
-                json.dumps(response.to_dict(), indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
-            return response
-    except sqlite3.DatabaseError:
-        return _search_non_sqlite_duc(
-            duc_file,
-            query,
-            output_path=destination,
-            limit=limit,
-            ocr_language=ocr_language,
-            search_all_external_files=search_all_external_files,
-            external_file_targets=external_file_targets,
-            external_file_element_ids=external_file_element_ids,
-        )
@@ -127,6 +127,20 @@ def _has_table(conn: sqlite3.Connection, table_name: str) -> bool:
     return row is not None
 
 
+# Deduplicated revisions read the chunks of the revision they share content with.
+_CONTENT_REVISION_SQL = (
+    "(SELECT coalesce(content_revision_id, id) FROM external_file_revisions WHERE id = ?)"
+)
+
+
+def _has_content_revisions(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM pragma_table_info('external_file_revisions') "
+        "WHERE name = 'content_revision_id' LIMIT 1"
+    ).fetchone()
+    return row is not None
+
+
 def _fetch_active_revision_ids(conn: sqlite3.Connection, file_ids: Iterable[str]) -> dict[str, str]:
     file_ids = sorted({str(file_id) for file_id in file_ids if file_id})
     if not file_ids:
@@ -460,10 +474,10 @@ def _fetch_external_revision_row(conn: sqlite3.Connection, file_id: str, revisio
     blob: bytes | None = None
     if _has_table(conn, "external_file_revision_chunks"):
         chunks = conn.execute(
-            """
+            f"""
             SELECT data
             FROM external_file_revision_chunks
-            WHERE revision_id = ?
+            WHERE revision_id = {_CONTENT_REVISION_SQL if _has_content_revisions(conn) else "?"}
             ORDER BY chunk_index
             """,
             (revision_id,),
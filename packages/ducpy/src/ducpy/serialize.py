@@ -7,20 +7,30 @@ from __future__ import annotations
 import logging
 import builtins
 import contextlib
+import functools
+import hashlib
 import io
 import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
 import ducpy_native
-from ducpy.utils.convert import (deep_snake_to_camel, snake_to_camel,
-                                 to_serializable, _flatten_dict)
+from ducpy.builders.sql_builder import _check_write_options
+from ducpy.instrumentation import span
+from ducpy.validation.cache import (ValidationCache, default_validation_cache,
+                                    validation_key)
+from ducpy.validation.pool import ValidationWorkerPool
+from ducpy.utils.convert import (dataclass_converter, deep_snake_to_camel,
+                                 snake_to_camel, to_serializable, _flatten_dict)
 
 logger = logging.getLogger(__name__)
 
@@ -63,19 +73,16 @@ def _element_to_camel(wrapper_or_element: Any) -> dict:
         el = el.element
 
     if isinstance(el, dict):
-        d = dict(el)
-    elif is_dataclass(el):
-        class_name = type(el).__name__
-        d = asdict(el)
-        # Inject the type tag if we know the mapping
-        type_tag = _ELEMENT_CLASS_TO_TYPE.get(class_name)
-        if type_tag:
-            d["type"] = type_tag
-    else:
+        return deep_snake_to_camel(_flatten_dict(dict(el)))
+    if not is_dataclass(el):
         return el
 
-    d = _flatten_dict(d)
-    return deep_snake_to_camel(d)
+    d = dataclass_converter(type(el))(el)
+    # Inject the type tag if we know the mapping
+    type_tag = _ELEMENT_CLASS_TO_TYPE.get(type(el).__name__)
+    if type_tag:
+        d["type"] = type_tag
+    return d
 
 
 def _convert_external_files(
@@ -122,6 +129,34 @@ def _convert_external_files(
     return (result if result else None), (data_blobs if data_blobs else None)
 
 
+def _collect_file_sources(
+    entries: Optional[Any],
+    explicit: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Gather revision-id → path/stream sources from built external files and *explicit*.
+
+    Paths are normalized to ``str``; streams must be binary file objects.
+    """
+    sources: Dict[str, Any] = {}
+    values = entries.values() if isinstance(entries, dict) else (entries or [])
+    for entry in values:
+        found = getattr(entry, "_data_sources", None)
+        if found:
+            sources.update(found)
+    if explicit:
+        sources.update(explicit)
+
+    for revision_id, source in sources.items():
+        if isinstance(source, (str, os.PathLike)):
+            sources[revision_id] = os.fspath(source)
+        elif not callable(getattr(source, "read", None)):
+            raise TypeError(
+                f"external file source for {revision_id!r} must be a path or a binary file object, "
+                f"got {type(source).__name__}"
+            )
+    return sources
+
+
 def _convert_dict_entries(
     entries: Optional[list],
 ) -> Optional[Dict[str, str]]:
@@ -177,14 +212,14 @@ def _find_revision(revisions: Any, active_revision_id: str) -> Optional[Dict[str
     return None
 
 
-def _write_python_external_files(
-    project_dir: Path,
+def _sandbox_files(
     files_meta: Optional[Dict[str, Any]],
-    files_data: Optional[Dict[str, bytes]],
-) -> Dict[str, str]:
-    resolved_paths: Dict[str, str] = {}
+    files_data: Optional[Dict[str, Any]],
+) -> List[Tuple[str, str, Any]]:
+    """Return ``(file_id, safe_name, data)`` for each file placed in a validation sandbox."""
+    entries: List[Tuple[str, str, Any]] = []
     if not files_meta or not files_data:
-        return resolved_paths
+        return entries
 
     for file_id, meta in files_meta.items():
         if not isinstance(meta, dict):
@@ -202,24 +237,177 @@ def _write_python_external_files(
 
         source_name = revision.get("sourceName") or revision.get("source_name") or "file"
         safe_name = re.sub(r"[^a-zA-Z0-9._-]", "_", str(source_name).strip() or "file")
-        target = project_dir / "scopture-files" / str(file_id) / safe_name
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_bytes(bytes(data))
-        resolved_paths[file_id] = str(target.resolve())
+        entries.append((str(file_id), safe_name, data))
+
+    return entries
+
+
+def _resolve_validation_cache(
+    cache: Union[bool, str, os.PathLike, ValidationCache, None],
+) -> Optional[ValidationCache]:
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return default_validation_cache()
+    if isinstance(cache, ValidationCache):
+        return cache
+    return ValidationCache(cache)
+
+
+def _link_or_copy(source: Path, target: Path, allow_symlink: bool) -> None:
+    try:
+        os.link(source, target)
+        return
+    except OSError:
+        pass
+    if allow_symlink:
+        try:
+            os.symlink(source, target)
+            return
+        except (OSError, NotImplementedError):
+            pass
+    shutil.copyfile(source, target)
+
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
 
-    return resolved_paths
+def _stream_position(stream: Any) -> int:
+    try:
+        return stream.tell()
+    except (OSError, ValueError) as exc:
+        raise ValueError(
+            "embedded code references an external file given as a non-seekable stream; "
+            "pass a path or a seekable file object to validate it"
+        ) from exc
+
+
+def _iter_source_chunks(source: Any) -> Iterator[bytes]:
+    """Yield the bytes of a blob, path or stream source (streams are rewound after)."""
+    if isinstance(source, str):
+        with open(source, "rb") as handle:
+            yield from iter(lambda: handle.read(_COPY_CHUNK_SIZE), b"")
+    elif hasattr(source, "read"):
+        position = _stream_position(source)
+        try:
+            yield from iter(lambda: source.read(_COPY_CHUNK_SIZE), b"")
+        finally:
+            source.seek(position)
+    else:
+        yield source
+
+
+class _SandboxFiles:
+    """External files for the validation sandboxes of one serialize call.
+
+    Each revision is written at most once, on first use, into a shared
+    read-only directory and hard-linked (or symlinked, or as a last resort
+    copied) into every sandbox whose element references it. Path and stream
+    sources are copied in chunks, never loaded whole.
+    """
+
+    def __init__(
+        self,
+        files_meta: Optional[Dict[str, Any]],
+        files_data: Optional[Dict[str, Any]],
+    ):
+        self._entries = {
+            file_id: (safe_name, data)
+            for file_id, safe_name, data in _sandbox_files(files_meta, files_data)
+        }
+        self._root: Optional[tempfile.TemporaryDirectory] = None
+        self._paths: Dict[str, Path] = {}
+        self._digests: Dict[str, bytes] = {}
+        # The shared lock only guards the dicts and temp root; streaming or
+        # hashing one file holds that file's own lock.
+        self._lock = threading.Lock()
+        self._file_locks = {file_id: threading.Lock() for file_id in self._entries}
+
+    def referenced(self, element: Dict[str, Any], code: str) -> List[str]:
+        """Ids of the files *element* declares or mentions in its code."""
+        declared = set(element.get("fileIds") or ()) | set(element.get("referencedFileIds") or ())
+        return sorted(file_id for file_id in self._entries if file_id in declared or file_id in code)
+
+    def digest(self, file_ids: List[str]) -> str:
+        # Hash the bytes themselves: revision checksums are optional and unverified.
+        digest = hashlib.sha256()
+        for file_id in file_ids:
+            safe_name, data = self._entries[file_id]
+            with self._file_locks[file_id]:
+                with self._lock:
+                    blob_digest = self._digests.get(file_id)
+                if blob_digest is None:
+                    hasher = hashlib.blake2b(digest_size=32)
+                    for chunk in _iter_source_chunks(data):
+                        hasher.update(chunk)
+                    blob_digest = hasher.digest()
+                    with self._lock:
+                        self._digests[file_id] = blob_digest
+            digest.update(f"{file_id}\0{safe_name}\0".encode("utf-8"))
+            digest.update(blob_digest)
+        return digest.hexdigest()
+
+    def link_into(
+        self, project_dir: Path, file_ids: List[str], allow_symlink: bool = True
+    ) -> Dict[str, str]:
+        """Place *file_ids* under ``project_dir/scopture-files``; return their paths."""
+        resolved_paths: Dict[str, str] = {}
+        for file_id in file_ids:
+            source = self._materialize(file_id)
+            target = project_dir / "scopture-files" / file_id / source.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(source, target, allow_symlink)
+            resolved_paths[file_id] = str(target.resolve())
+        return resolved_paths
+
+    def close(self) -> None:
+        if self._root is not None:
+            for path in self._paths.values():
+                path.chmod(0o600)
+            self._root.cleanup()
+            self._root = None
+            self._paths.clear()
+
+    def _materialize(self, file_id: str) -> Path:
+        with self._file_locks[file_id]:
+            with self._lock:
+                path = self._paths.get(file_id)
+                if path is not None:
+                    return path
+                if self._root is None:
+                    self._root = tempfile.TemporaryDirectory(prefix="ducpy-files-")
+                root = Path(self._root.name)
+            safe_name, data = self._entries[file_id]
+            path = root / file_id / safe_name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as handle:
+                for chunk in _iter_source_chunks(data):
+                    handle.write(chunk)
+            path.chmod(0o444)
+            with self._lock:
+                self._paths[file_id] = path
+            return path
 
 
 def _run_python_validation(
     code: str,
     label: str,
     timeout_seconds: Optional[float],
-    files_meta: Optional[Dict[str, Any]] = None,
-    files_data: Optional[Dict[str, bytes]] = None,
+    files: Optional[_SandboxFiles] = None,
+    file_ids: Optional[List[str]] = None,
+    pool: Optional[ValidationWorkerPool] = None,
 ) -> Optional[str]:
     with tempfile.TemporaryDirectory(prefix="ducpy-model-") as tmpdir:
         tmp_path = Path(tmpdir)
-        resolved_files = _write_python_external_files(tmp_path, files_meta, files_data)
+        resolved_files = files.link_into(tmp_path, file_ids or []) if files is not None else {}
+
+        if pool is not None:
+            status, detail = pool.run(code, tmpdir, resolved_files, timeout_seconds)
+            if status == "ok":
+                return None
+            if status == "timeout":
+                return f"{label}: Python validation timed out after {timeout_seconds:g}s"
+            return f"{label}: Python validation failed\n{detail or 'Python process exited with an error'}"
 
         import json
         resolved_files_json = json.dumps(resolved_files)
@@ -272,11 +460,26 @@ builtins.resolve_external_file = resolve_external_file
     return f"{label}: Python validation failed\n{output}"
 
 
+# The in-process fallback swaps the working directory and a builtin, so
+# concurrent validations must take turns.
+_IN_PROCESS_VALIDATION_LOCK = threading.Lock()
+
+
 def _run_python_validation_in_process(
     code: str,
     label: str,
     project_dir: Path,
     resolved_files: Dict[str, str],
+) -> Optional[str]:
+    with _IN_PROCESS_VALIDATION_LOCK:
+        return _exec_python_validation(code, label, project_dir, resolved_files)
+
+
+def _exec_python_validation(
+    code: str,
+    label: str,
+    project_dir: Path,
+    resolved_files: Dict[str, str],
 ) -> Optional[str]:
     previous_cwd = os.getcwd()
     had_resolver = hasattr(builtins, "resolve_external_file")
@@ -310,31 +513,6 @@ def _run_python_validation_in_process(
     return None
 
 
-def _write_typst_external_files(project_dir: Path, files_meta: Optional[Dict[str, Any]], files_data: Optional[Dict[str, bytes]]) -> None:
-    if not files_meta or not files_data:
-        return
-
-    for file_id, meta in files_meta.items():
-        if not isinstance(meta, dict):
-            continue
-
-        active_revision_id = meta.get("activeRevisionId") or meta.get("active_revision_id")
-        revisions = meta.get("revisions") or {}
-        revision = _find_revision(revisions, active_revision_id) if active_revision_id else None
-        if not active_revision_id or not isinstance(revision, dict):
-            continue
-
-        data = files_data.get(active_revision_id)
-        if data is None:
-            continue
-
-        source_name = revision.get("sourceName") or revision.get("source_name") or "file"
-        safe_name = re.sub(r"[^a-zA-Z0-9._-]", "_", str(source_name).strip() or "file")
-        target = project_dir / "scopture-files" / str(file_id) / safe_name
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_bytes(bytes(data))
-
-
 def _format_typst_validation_error(exc: Exception, main_path: Path) -> str:
     diagnostic = getattr(exc, "diagnostic", None)
     detail = diagnostic.strip() if isinstance(diagnostic, str) and diagnostic.strip() else str(exc)
@@ -348,8 +526,8 @@ def _run_typst_validation(
     code: str,
     label: str,
     timeout_seconds: float,
-    files_meta: Optional[Dict[str, Any]],
-    files_data: Optional[Dict[str, bytes]],
+    files: Optional[_SandboxFiles] = None,
+    file_ids: Optional[List[str]] = None,
 ) -> Optional[str]:
     try:
         import typst  # type: ignore[import-not-found]
@@ -360,7 +538,9 @@ def _run_typst_validation(
         project_dir = Path(tmpdir)
         main_path = project_dir / "main.typ"
         main_path.write_text(code.replace('"/scopture-files/', '"scopture-files/'), encoding="utf-8")
-        _write_typst_external_files(project_dir, files_meta, files_data)
+        if files is not None:
+            # Typst refuses to follow links out of its project root.
+            files.link_into(project_dir, file_ids or [], allow_symlink=False)
 
         try:
             try:
@@ -376,10 +556,15 @@ def _run_typst_validation(
 def _validate_embedded_code(
     elements: List[Any],
     files_meta: Optional[Dict[str, Any]],
-    files_data: Optional[Dict[str, bytes]],
+    files_data: Optional[Dict[str, Any]],
     timeout_seconds: Optional[float],
+    workers: Optional[int] = None,
+    cache: Optional[ValidationCache] = None,
+    pool: Optional[ValidationWorkerPool] = None,
 ) -> None:
-    failures: List[str] = []
+    files = _SandboxFiles(files_meta, files_data)
+    checks: List[Tuple[Any, str, str, str, List[str]]] = []
+    run_python = functools.partial(_run_python_validation, pool=pool) if pool is not None else _run_python_validation
 
     for element in elements:
         if not isinstance(element, dict):
@@ -391,22 +576,161 @@ def _validate_embedded_code(
         if element_type == "model":
             code = element.get("code")
             if isinstance(code, str) and code.strip():
-                error = _run_python_validation(code, label, timeout_seconds, files_meta, files_data)
-                if error:
-                    failures.append(error)
+                checks.append((run_python, "python", code, label, files.referenced(element, code)))
             continue
 
         if element_type == "doc":
             text = element.get("text")
             if isinstance(text, str) and text.strip():
-                error = _run_typst_validation(text, label, timeout_seconds, files_meta, files_data)
-                if error:
-                    failures.append(error)
+                checks.append((_run_typst_validation, "typst", text, label, files.referenced(element, text)))
+
+    def run(check: Tuple[Any, str, str, str, List[str]]) -> Optional[str]:
+        validate, kind, code, label, file_ids = check
+        key = validation_key(kind, code, files.digest(file_ids)) if cache is not None else None
+        if key is not None and cache.get(key):
+            return None
+        error = validate(code, label, timeout_seconds, files, file_ids)
+        if error is None and key is not None:
+            cache.put(key, kind)
+        return error
+
+    # Each check mostly waits on a subprocess or the Typst compiler, so threads
+    # overlap well; map() keeps the results in element order.
+    try:
+        if workers is not None and workers > 1 and len(checks) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(workers, len(checks)), thread_name_prefix="ducpy-validate"
+            ) as executor:
+                errors = list(executor.map(run, checks))
+        else:
+            errors = [run(check) for check in checks]
+    finally:
+        files.close()
 
+    failures = [error for error in errors if error]
     if failures:
         raise DucSerializationValidationError(failures)
 
 
+def _export_data(
+    name: str,
+    thumbnail: Optional[bytes] = None,
+    dictionary: Optional[list] = None,
+    elements: Optional[list] = None,
+    duc_local_state: Any = None,
+    duc_global_state: Any = None,
+    version_graph: Any = None,
+    blocks: Optional[list] = None,
+    block_instances: Optional[list] = None,
+    block_collections: Optional[list] = None,
+    groups: Optional[list] = None,
+    regions: Optional[list] = None,
+    layers: Optional[list] = None,
+    external_files: Optional[list] = None,
+    charter: Any = None,
+    issues: Optional[list] = None,
+    validate_embedded_code: bool = True,
+    validation_timeout_seconds: Optional[float] = None,
+    validation_workers: Optional[int] = None,
+    validation_cache: Union[bool, str, os.PathLike, ValidationCache, None] = None,
+    validation_pool: Optional[ValidationWorkerPool] = None,
+    external_file_sources: Optional[Dict[str, Union[str, os.PathLike, BinaryIO]]] = None,
+    operation: str = "serialize_duc",
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Convert builder objects into the camelCase dict the native serializer expects.
+
+    Returns ``(data, sources)``; *sources* maps revision id → path or stream
+    for the blobs the native serializer reads itself. *operation* names the
+    public call in the ``convert`` and ``validate`` spans.
+    """
+    if validation_workers is not None and validation_workers < 1:
+        raise ValueError("validation_workers must be at least 1")
+
+    with span(operation, "convert"):
+        data, sources = _convert_document(
+            name,
+            thumbnail,
+            dictionary,
+            elements,
+            duc_local_state,
+            duc_global_state,
+            version_graph,
+            blocks,
+            block_instances,
+            block_collections,
+            groups,
+            regions,
+            layers,
+            external_files,
+            charter,
+            issues,
+            external_file_sources,
+        )
+
+    if validate_embedded_code:
+        with span(operation, "validate"):
+            _validate_embedded_code(
+                data["elements"],
+                data["files"],
+                {**(data["filesData"] or {}), **sources},
+                validation_timeout_seconds,
+                validation_workers,
+                _resolve_validation_cache(validation_cache),
+                validation_pool,
+            )
+    return data, sources
+
+
+def _convert_document(
+    name: str,
+    thumbnail: Optional[bytes],
+    dictionary: Optional[list],
+    elements: Optional[list],
+    duc_local_state: Any,
+    duc_global_state: Any,
+    version_graph: Any,
+    blocks: Optional[list],
+    block_instances: Optional[list],
+    block_collections: Optional[list],
+    groups: Optional[list],
+    regions: Optional[list],
+    layers: Optional[list],
+    external_files: Optional[list],
+    charter: Any,
+    issues: Optional[list],
+    external_file_sources: Optional[Dict[str, Union[str, os.PathLike, BinaryIO]]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    thumb = bytes(thumbnail) if thumbnail is not None else None
+
+    files_meta, files_data = _convert_external_files(external_files)
+    sources = _collect_file_sources(external_files, external_file_sources)
+
+    serialized_elements = [_element_to_camel(e) for e in (elements or [])]
+
+    data = {
+        "type": "duc",
+        "version": DUC_SCHEMA_VERSION,
+        "source": f"ducpy_{name}",
+        "thumbnail": thumb,
+        "elements": serialized_elements,
+        "blocks": _convert_list(blocks) or [],
+        "blockInstances": _convert_list(block_instances) or [],
+        "blockCollections": _convert_list(block_collections) or [],
+        "groups": _convert_list(groups) or [],
+        "regions": _convert_list(regions) or [],
+        "layers": _convert_list(layers) or [],
+        "dictionary": _convert_dict_entries(dictionary) or {},
+        "localState": to_serializable(duc_local_state),
+        "globalState": to_serializable(duc_global_state),
+        "versionGraph": to_serializable(version_graph),
+        "files": files_meta,
+        "filesData": files_data,
+        "charter": to_serializable(charter),
+        "issues": _convert_list(issues) or [],
+    }
+    return data, sources
+
+
 def serialize_duc(
     name: str,
     output_path: Optional[Union[str, Path]] = None,
@@ -427,6 +751,13 @@ def serialize_duc(
     issues: Optional[list] = None,
     validate_embedded_code: bool = True,
     validation_timeout_seconds: Optional[float] = None,
+    validation_workers: Optional[int] = None,
+    validation_cache: Union[bool, str, os.PathLike, ValidationCache, None] = None,
+    validation_pool: Optional[ValidationWorkerPool] = None,
+    external_file_sources: Optional[Dict[str, Union[str, os.PathLike, BinaryIO]]] = None,
+    compression_level: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    page_size: Optional[int] = None,
 ) -> str:
     """Serialize elements and document state directly to a ``.duc`` file path.
 
@@ -441,7 +772,8 @@ def serialize_duc(
         The document name or identifier (used to populate the `source` field).
     output_path : str | Path, optional
         Target path for the generated ``.duc`` file. When omitted, a temporary
-        ``.duc`` file is created and its path is returned.
+        ``.duc`` file is created and its path is returned; use
+        :func:`serialize_duc_to_bytes` to get the content in memory instead.
     thumbnail : Optional[bytes], default=None
         Raw PNG bytes representing a thumbnail of the document.
     dictionary : Optional[list], default=None
@@ -478,53 +810,162 @@ def serialize_duc(
         DucSerializationValidationError with per-element diagnostics on failure.
     validation_timeout_seconds : float, optional, default=None
         Timeout used for each embedded code validation step. If None, no timeout is applied.
+    validation_workers : int, optional, default=None
+        Validate up to this many model/doc elements concurrently. None or 1
+        validates them one at a time. Diagnostics keep the element order
+        either way.
+    validation_cache : bool | str | PathLike | ValidationCache, optional, default=None
+        Skip validations that passed before with the same code, sandbox files
+        and interpreter/Typst version. True uses the shared cache in
+        ``~/.cache/ducpy/validation``; a path uses a cache in that directory.
+    validation_pool : ValidationWorkerPool, optional, default=None
+        Run model code in these warm, pre-imported worker processes instead
+        of a fresh interpreter per element.
+    external_file_sources : dict, optional, default=None
+        Revision id → path or binary file object for external file blobs
+        that should be streamed into the file in chunks instead of held in
+        memory. ``ExternalFileBuilder.with_data_path`` and
+        ``with_data_stream`` register these automatically. Streams are read
+        from their current position; they must be seekable if embedded code
+        validation uses the file.
+    compression_level : int, optional, default=None
+        gzip level from 1 (fastest) to 9 (smallest); 0 writes the raw SQLite
+        image, which every reader also accepts. None uses level 6. Use 0 or 1
+        for intermediate files and 9 for archives.
+    chunk_size : int, optional, default=None
+        Size in bytes of the chunks external file blobs are split into
+        (4 MiB to 16 MiB, default 8 MiB).
+    page_size : int, optional, default=None
+        SQLite page size of the written database (a power of two from 512
+        to 65536). None keeps SQLite's default of 4096.
 
     Returns
     -------
     str
         The output path that was written.
     """
-    thumb = bytes(thumbnail) if thumbnail is not None else None
-
-    files_meta, files_data = _convert_external_files(external_files)
+    # Reject bad write options before the (possibly slow) conversion and validation.
+    _check_write_options(compression_level, page_size)
+    with span("serialize_duc", "total") as total:
+        data, sources = _export_data(
+            name,
+            thumbnail=thumbnail,
+            dictionary=dictionary,
+            elements=elements,
+            duc_local_state=duc_local_state,
+            duc_global_state=duc_global_state,
+            version_graph=version_graph,
+            blocks=blocks,
+            block_instances=block_instances,
+            block_collections=block_collections,
+            groups=groups,
+            regions=regions,
+            layers=layers,
+            external_files=external_files,
+            charter=charter,
+            issues=issues,
+            validate_embedded_code=validate_embedded_code,
+            validation_timeout_seconds=validation_timeout_seconds,
+            validation_workers=validation_workers,
+            validation_cache=validation_cache,
+            validation_pool=validation_pool,
+            external_file_sources=external_file_sources,
+        )
 
-    serialized_elements = [_element_to_camel(e) for e in (elements or [])]
+        if output_path is None:
+            fd, generated_path = tempfile.mkstemp(prefix="ducpy-", suffix=".duc")
+            os.close(fd)
+            output = generated_path
+        else:
+            output = str(output_path)
+        with span("serialize_duc", "write") as write:
+            ducpy_native.serialize_duc(
+                data,
+                output,
+                sources or None,
+                compression_level=compression_level,
+                chunk_size=chunk_size,
+                page_size=page_size,
+            )
+            write.size_of(output)
+        total.bytes = write.bytes
+        return output
 
-    if validate_embedded_code:
-        _validate_embedded_code(
-            serialized_elements,
-            files_meta,
-            files_data,
-            validation_timeout_seconds,
-        )
 
-    data: Dict[str, Any] = {
-        "type": "duc",
-        "version": DUC_SCHEMA_VERSION,
-        "source": f"ducpy_{name}",
-        "thumbnail": thumb,
-        "elements": serialized_elements,
-        "blocks": _convert_list(blocks) or [],
-        "blockInstances": _convert_list(block_instances) or [],
-        "blockCollections": _convert_list(block_collections) or [],
-        "groups": _convert_list(groups) or [],
-        "regions": _convert_list(regions) or [],
-        "layers": _convert_list(layers) or [],
-        "dictionary": _convert_dict_entries(dictionary) or {},
-        "localState": to_serializable(duc_local_state),
-        "globalState": to_serializable(duc_global_state),
-        "versionGraph": to_serializable(version_graph),
-        "files": files_meta,
-        "filesData": files_data,
-        "charter": to_serializable(charter),
-        "issues": _convert_list(issues) or [],
-    }
+def serialize_duc_to_bytes(
+    name: str,
+    thumbnail: Optional[bytes] = None,
+    dictionary: Optional[list] = None,
+    elements: Optional[list] = None,
+    duc_local_state: Any = None,
+    duc_global_state: Any = None,
+    version_graph: Any = None,
+    blocks: Optional[list] = None,
+    block_instances: Optional[list] = None,
+    block_collections: Optional[list] = None,
+    groups: Optional[list] = None,
+    regions: Optional[list] = None,
+    layers: Optional[list] = None,
+    external_files: Optional[list] = None,
+    charter: Any = None,
+    issues: Optional[list] = None,
+    validate_embedded_code: bool = True,
+    validation_timeout_seconds: Optional[float] = None,
+    validation_workers: Optional[int] = None,
+    validation_cache: Union[bool, str, os.PathLike, ValidationCache, None] = None,
+    validation_pool: Optional[ValidationWorkerPool] = None,
+    external_file_sources: Optional[Dict[str, Union[str, os.PathLike, BinaryIO]]] = None,
+    compression_level: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    page_size: Optional[int] = None,
+) -> bytes:
+    """Serialize elements and document state to in-memory ``.duc`` bytes.
+
+    Same parameters as :func:`serialize_duc` (minus ``output_path``), for
+    callers that upload the result or return it in an HTTP response: nothing
+    is written to a caller-visible temp file and no file is read back.
 
-    if output_path is None:
-        fd, generated_path = tempfile.mkstemp(prefix="ducpy-", suffix=".duc")
-        os.close(fd)
-        output = generated_path
-    else:
-        output = str(output_path)
-    ducpy_native.serialize_duc(data, output)
-    return output
+    Returns
+    -------
+    bytes
+        The ``.duc`` content (gzip-compressed unless ``compression_level=0``),
+        readable with ``parse_duc(data)``.
+    """
+    # Reject bad write options before the (possibly slow) conversion and validation.
+    _check_write_options(compression_level, page_size)
+    with span("serialize_duc_to_bytes", "total") as total:
+        data, sources = _export_data(
+            name,
+            thumbnail=thumbnail,
+            dictionary=dictionary,
+            elements=elements,
+            duc_local_state=duc_local_state,
+            duc_global_state=duc_global_state,
+            version_graph=version_graph,
+            blocks=blocks,
+            block_instances=block_instances,
+            block_collections=block_collections,
+            groups=groups,
+            regions=regions,
+            layers=layers,
+            external_files=external_files,
+            charter=charter,
+            issues=issues,
+            validate_embedded_code=validate_embedded_code,
+            validation_timeout_seconds=validation_timeout_seconds,
+            validation_workers=validation_workers,
+            validation_cache=validation_cache,
+            validation_pool=validation_pool,
+            external_file_sources=external_file_sources,
+            operation="serialize_duc_to_bytes",
+        )
+        with span("serialize_duc_to_bytes", "write") as write:
+            result = ducpy_native.serialize_duc_to_bytes(
+                data,
+                sources or None,
+                compression_level=compression_level,
+                chunk_size=chunk_size,
+                page_size=page_size,
+            )
+            write.bytes = total.bytes = len(result)
+        return result
@@ -6,18 +6,21 @@ and for flattening/nesting element structures to match the Rust serde layout.
 from __future__ import annotations
 
 import re
-from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import asdict, fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 _CAMEL_RE1 = re.compile(r"(.)([A-Z][a-z]+)")
 _CAMEL_RE2 = re.compile(r"([a-z0-9])([A-Z])")
 
 
+@lru_cache(maxsize=4096)
 def camel_to_snake(name: str) -> str:
     s1 = _CAMEL_RE1.sub(r"\1_\2", name)
     return _CAMEL_RE2.sub(r"\1_\2", s1).lower()
 
 
+@lru_cache(maxsize=4096)
 def snake_to_camel(name: str) -> str:
     parts = name.split("_")
     return parts[0] + "".join(p.title() for p in parts[1:])
@@ -40,6 +43,12 @@ _FLATTEN_KEYS = frozenset({
 })
 
 
+@lru_cache(maxsize=4096)
+def _camel_key(name: str) -> str:
+    override = _SNAKE_TO_CAMEL_OVERRIDES.get(name)
+    return override if override is not None else snake_to_camel(name)
+
+
 def deep_camel_to_snake(obj: Any) -> Any:
     if isinstance(obj, dict):
         return {camel_to_snake(k): deep_camel_to_snake(v) for k, v in obj.items()}
@@ -52,13 +61,12 @@ def deep_snake_to_camel(obj: Any) -> Any:
     if isinstance(obj, dict):
         result = {}
         for k, v in obj.items():
-            ck = _SNAKE_TO_CAMEL_OVERRIDES.get(k, snake_to_camel(k))
-            result[ck] = deep_snake_to_camel(v)
+            result[_camel_key(k)] = deep_snake_to_camel(v)
         return result
     if isinstance(obj, list):
         return [deep_snake_to_camel(item) for item in obj]
     if is_dataclass(obj) and not isinstance(obj, type):
-        return deep_snake_to_camel(asdict(obj))
+        return dataclass_converter(type(obj), flatten=False)(obj)
     if isinstance(obj, bytes):
         return obj
     return obj
@@ -83,6 +91,115 @@ def _flatten_dict(d: dict) -> dict:
     return result
 
 
+# ---------------------------------------------------------------------------
+# Precompiled dataclass converters
+# ---------------------------------------------------------------------------
+#
+# ``deep_snake_to_camel(_flatten_dict(asdict(obj)))`` deep-copies every object,
+# then walks the copy twice more. Instead, each dataclass gets one generated
+# function that reads its fields and emits the final camelCase dict directly.
+# Output is identical to that pipeline: flattening follows dict/dataclass
+# nesting but stops at lists (as ``_flatten_dict`` does), and tuples keep
+# ``asdict``'s snake_case form.
+
+_ATOMIC_TYPES = {str, int, float, bool, bytes, type(None)}
+
+_CONVERTERS: Dict[Tuple[type, bool], Callable[[Any], dict]] = {}
+
+
+def dataclass_converter(cls: type, flatten: bool = True) -> Callable[[Any], dict]:
+    """Return the cached converter from *cls* instances to camelCase dicts.
+
+    With ``flatten=True`` the result matches
+    ``deep_snake_to_camel(_flatten_dict(asdict(obj)))``; with ``flatten=False``
+    it matches ``deep_snake_to_camel(asdict(obj))``.
+    """
+    converter = _CONVERTERS.get((cls, flatten))
+    if converter is None:
+        converter = _CONVERTERS[(cls, flatten)] = _compile_converter(cls, flatten)
+    return converter
+
+
+def _compile_converter(cls: type, flatten: bool) -> Callable[[Any], dict]:
+    lines = ["def convert(obj):", "    result = {}"]
+    for field in fields(cls):
+        key = repr(_camel_key(field.name))
+        lines += [
+            f"    value = obj.{field.name}",
+            "    if value.__class__ in _ATOMIC_TYPES:",
+            f"        result[{key}] = value",
+            "    else:",
+            f"        converter = _get_converter((value.__class__, {flatten}))",
+            "        if converter is not None:",
+            "            value = converter(value)",
+            "        else:",
+            f"            value = _convert_value(value, {flatten})",
+        ]
+        if flatten and field.name in _FLATTEN_KEYS:
+            lines += [
+                "        if isinstance(value, dict):",
+                "            result.update(value)",
+                "        else:",
+                f"            result[{key}] = value",
+            ]
+        else:
+            lines.append(f"        result[{key}] = value")
+    lines.append("    return result")
+
+    namespace: Dict[str, Any] = {
+        "_ATOMIC_TYPES": _ATOMIC_TYPES,
+        "_convert_value": _convert_value,
+        "_get_converter": _CONVERTERS.get,
+    }
+    exec("\n".join(lines), namespace)
+    convert = namespace["convert"]
+    convert.__name__ = convert.__qualname__ = f"convert_{cls.__name__}"
+    return convert
+
+
+def _convert_value(value: Any, flatten: bool) -> Any:
+    cls = value.__class__
+    converter = _CONVERTERS.get((cls, flatten))
+    if converter is not None:
+        return converter(value)
+    if cls is list:
+        return [
+            item if item.__class__ in _ATOMIC_TYPES else _convert_value(item, False)
+            for item in value
+        ]
+    if hasattr(cls, "__dataclass_fields__"):
+        return dataclass_converter(cls, flatten)(value)
+    if isinstance(value, dict):
+        result: dict = {}
+        for k, v in value.items():
+            v = _convert_value(v, flatten)
+            if flatten and k in _FLATTEN_KEYS and isinstance(v, dict):
+                result.update(v)
+            else:
+                result[_camel_key(k)] = v
+        return result
+    if isinstance(value, list):
+        return [_convert_value(item, False) for item in value]
+    if isinstance(value, tuple):
+        return _asdict_value(value)
+    # Enums and other leaves: remember the class so later values skip the checks.
+    _ATOMIC_TYPES.add(cls)
+    return value
+
+
+def _asdict_value(value: Any) -> Any:
+    """Convert *value* the way ``dataclasses.asdict`` converts nested values."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[_asdict_value(item) for item in value])
+    if isinstance(value, (list, tuple)):
+        return type(value)(_asdict_value(item) for item in value)
+    if isinstance(value, dict):
+        return type(value)((_asdict_value(k), _asdict_value(v)) for k, v in value.items())
+    return value
+
+
 def to_serializable(obj: Any) -> Any:
     """Convert a value to a JSON-serializable form suitable for the Rust native module.
 
@@ -95,11 +212,7 @@ def to_serializable(obj: Any) -> Any:
     if obj is None:
         return None
     if is_dataclass(obj) and not isinstance(obj, type):
-        d = {}
-        for k, v in asdict(obj).items():
-            d[k] = v
-        d = _flatten_dict(d)
-        return deep_snake_to_camel(d)
+        return dataclass_converter(type(obj))(obj)
     if isinstance(obj, dict):
         return deep_snake_to_camel(obj)
     if isinstance(obj, list):
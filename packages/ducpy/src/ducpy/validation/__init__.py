@@ -0,0 +1,14 @@
+"""Support for embedded-code validation during :func:`ducpy.serialize_duc`."""
+
+from .cache import (ValidationCache, ValidationCacheStats,
+                    default_validation_cache, validation_key)
+from .pool import ValidationWorkerPool, ValidationWorkerPoolStats
+
+__all__ = [
+    "ValidationCache",
+    "ValidationCacheStats",
+    "ValidationWorkerPool",
+    "ValidationWorkerPoolStats",
+    "default_validation_cache",
+    "validation_key",
+]
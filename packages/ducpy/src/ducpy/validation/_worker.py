@@ -0,0 +1,95 @@
+"""Worker process for :class:`ducpy.validation.pool.ValidationWorkerPool`.
+
+Run as a script (``python _worker.py [preload ...]``), so it does not import
+ducpy itself. It imports the preload modules once, then reads pickled jobs
+from stdin and writes one pickled reply per job to its original stdout. The
+model code's own output is captured and never reaches the protocol stream.
+"""
+
+import builtins
+import contextlib
+import importlib
+import io
+import os
+import pickle
+import sys
+import traceback
+
+_FILENAME = "<ducpy-embedded-model>"
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def _run(code: str, cwd: str, resolved_files: dict) -> tuple:
+    def resolve_external_file(file_id):
+        if file_id in resolved_files:
+            return resolved_files[file_id]
+        raise FileNotFoundError(f"External file '{file_id}' not found in validation sandbox.")
+
+    home = os.getcwd()
+    saved_path = list(sys.path)
+    stderr = io.StringIO()
+    ok, detail = True, None
+    try:
+        os.chdir(cwd)
+        # Like running a script from the sandbox: its directory comes first.
+        sys.path.insert(0, cwd)
+        builtins.resolve_external_file = resolve_external_file
+        namespace = {"__name__": "__main__", "resolve_external_file": resolve_external_file}
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+            try:
+                exec(compile(code, _FILENAME, "exec"), namespace)
+            except SystemExit as exc:
+                if exc.code not in (None, 0):
+                    ok, detail = False, str(exc.code)
+            except BaseException:
+                ok, detail = False, traceback.format_exc()
+    finally:
+        os.chdir(home)
+        sys.path[:] = saved_path
+        if hasattr(builtins, "resolve_external_file"):
+            del builtins.resolve_external_file
+    if not ok:
+        detail = "\n".join(part for part in (stderr.getvalue().strip(), detail.strip()) if part)
+    return ok, detail
+
+
+def main(preload) -> None:
+    # Do not let this package's directory shadow top-level imports.
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+        del sys.path[0]
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    jobs = sys.stdin.buffer
+    while True:
+        try:
+            code, cwd, resolved_files = pickle.load(jobs)
+        except EOFError:
+            return
+        ok, detail = _run(code, cwd, resolved_files)
+        pickle.dump((ok, detail, _rss_bytes()), replies, protocol=pickle.HIGHEST_PROTOCOL)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
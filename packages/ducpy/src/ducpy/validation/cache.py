@@ -0,0 +1,284 @@
+"""Persistent, content-addressed cache of passed embedded-code validations.
+
+:func:`ducpy.serialize_duc` runs every ``model`` element's Python code and
+compiles every ``doc`` element's Typst source before writing. With a
+:class:`ValidationCache`, a validation that passed before is skipped when
+nothing it depends on has changed. Entries are keyed by a SHA-256 of:
+
+* the validation kind (``"python"`` or ``"typst"``) and the code text,
+* the external files placed in the sandbox (id, file name and a digest of the
+  active revision's bytes),
+* the engine: interpreter version and executable, or the ``typst`` package
+  version.
+
+Only passes are cached; failures always re-run so their diagnostics stay
+fresh. Packages installed into the same interpreter are not part of the key,
+so :meth:`ValidationCache.clear` after changing them.
+
+The cache is a small SQLite database, safe to share between threads and
+processes, trimmed to ``max_bytes`` by evicting the least recently used
+entries.
+
+Usage::
+
+    import ducpy as duc
+
+    duc.serialize_duc("site", "site.duc", elements=elements, validation_cache=True)
+    print(duc.default_validation_cache().stats.hit_rate)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from os import PathLike, fspath
+from pathlib import Path
+from typing import Optional, Union
+
+__all__ = [
+    "ValidationCache",
+    "ValidationCacheStats",
+    "default_validation_cache",
+    "validation_key",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+_KINDS = ("python", "typst")
+_DB_NAME = "validation.sqlite"
+_KEY_VERSION = b"ducpy-validation-1"
+# Rough per-row cost of the table and its indexes on disk.
+_ROW_OVERHEAD = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    kind      TEXT NOT NULL,
+    engine    TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used);
+"""
+
+
+@dataclass(frozen=True)
+class ValidationCacheStats:
+    """Snapshot of :class:`ValidationCache` counters.
+
+    ``hits``, ``misses`` and ``evictions`` count this process's lookups;
+    ``entries`` and ``current_bytes`` describe the shared store.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@lru_cache(maxsize=None)
+def _engine(kind: str) -> str:
+    if kind == "python":
+        return f"{sys.implementation.name} {sys.version} {sys.executable}"
+    try:
+        from importlib.metadata import version
+
+        return f"typst {version('typst')}"
+    except Exception:
+        return "typst unknown"
+
+
+def validation_key(kind: str, code: str, files_digest: str = "") -> str:
+    """Return the cache key for validating *code* as *kind*.
+
+    Parameters
+    ----------
+    kind : {"python", "typst"}
+        The validator that runs *code*.
+    code : str
+        Model Python code or doc Typst source.
+    files_digest : str, default=""
+        Digest of the external files available in the validation sandbox.
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"kind must be one of {_KINDS}, got {kind!r}")
+    digest = hashlib.sha256(_KEY_VERSION)
+    for part in (kind, _engine(kind), files_digest, code):
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _default_directory() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ducpy" / "validation"
+
+
+class ValidationCache:
+    """LRU store of validation passes, persisted in *directory*.
+
+    Parameters
+    ----------
+    directory : str | PathLike, optional
+        Where to keep the cache (default: ``$XDG_CACHE_HOME/ducpy/validation``,
+        i.e. ``~/.cache/ducpy/validation``). Created on first use.
+    max_bytes : int, default=16 MiB
+        Upper bound on the estimated size of all entries; least recently used
+        entries are evicted to stay under it.
+
+    Storage errors (read-only or full disks, locked databases) are logged
+    and treated as misses, so the cache never makes a save fail.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, PathLike]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than zero")
+        self.directory = Path(fspath(directory)) if directory is not None else _default_directory()
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> bool:
+        """Return whether *key* passed before, refreshing its LRU position."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    found = conn.execute(
+                        "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+                    ).rowcount
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("validation cache lookup failed: %s", exc)
+                found = 0
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return bool(found)
+
+    def put(self, key: str, kind: str) -> None:
+        """Record a passed validation for *key*, evicting old entries if needed."""
+        engine = _engine(kind)
+        size = len(key) + len(kind) + len(engine) + _ROW_OVERHEAD
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, kind, engine, size, created, last_used) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, kind, engine, size, now, now),
+                    )
+                    self._evict(conn)
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("validation cache store failed: %s", exc)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+            self._hits = self._misses = self._evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def stats(self) -> ValidationCacheStats:
+        with self._lock:
+            entries, current = self._connect().execute(
+                "SELECT count(*), total(size) FROM entries"
+            ).fetchone()
+            return ValidationCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=entries,
+                current_bytes=int(current),
+                max_bytes=self.max_bytes,
+            )
+
+    def __len__(self) -> int:
+        return self.stats.entries
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            row = self._connect().execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __repr__(self) -> str:
+        return f"ValidationCache(directory={str(self.directory)!r}, max_bytes={self.max_bytes})"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.directory / _DB_NAME), timeout=30.0, check_same_thread=False
+            )
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        excess = conn.execute("SELECT total(size) FROM entries").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+        self._evictions += len(stale)
+
+
+_default: Optional[ValidationCache] = None
+_default_lock = threading.Lock()
+
+
+def default_validation_cache() -> ValidationCache:
+    """Return the process-wide cache used by ``validation_cache=True``."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ValidationCache()
+        return _default
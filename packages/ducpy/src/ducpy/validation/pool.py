@@ -0,0 +1,256 @@
+"""Warm worker processes for validating ``model`` element code.
+
+By default every ``model`` element is validated in a fresh interpreter, so
+each one pays interpreter start-up plus its heavy imports (build123d,
+ifcopenshell, ...). A :class:`ValidationWorkerPool` keeps long-lived worker
+processes that import those modules once and then run one model after another,
+each in a fresh namespace with the ``resolve_external_file`` shim, inside its
+own sandbox directory.
+
+The parent enforces the timeout by killing the worker. Workers are replaced
+after ``max_runs`` validations or once their resident memory passes
+``max_memory_bytes``, so state leaked by model code does not accumulate.
+
+Usage::
+
+    import ducpy as duc
+
+    with duc.ValidationWorkerPool(size=4, preload=("build123d", "ifcopenshell")) as pool:
+        for name, elements in documents:
+            duc.serialize_duc(name, f"{name}.duc", elements=elements,
+                              validation_pool=pool, validation_workers=4)
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+__all__ = ["ValidationWorkerPool", "ValidationWorkerPoolStats"]
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_worker.py")
+
+
+@dataclass(frozen=True)
+class ValidationWorkerPoolStats:
+    """Snapshot of :class:`ValidationWorkerPool` counters."""
+
+    runs: int
+    started: int
+    #: Workers replaced after hitting a limit, a timeout or a crash.
+    recycled: int
+    timeouts: int
+    crashes: int
+
+
+class _Worker:
+    def __init__(self, preload: Tuple[str, ...]):
+        self.process = subprocess.Popen(
+            [sys.executable, _WORKER_SCRIPT, *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.runs = 0
+
+    def request(self, job: Tuple[str, str, Dict[str, str]], timeout: Optional[float]) -> Any:
+        """Send *job*; return the reply, ``TimeoutError`` or ``EOFError`` (worker died)."""
+        reply: List[Any] = []
+
+        def read() -> None:
+            try:
+                reply.append(pickle.load(self.process.stdout))
+            except (EOFError, OSError, pickle.UnpicklingError):
+                reply.append(EOFError())
+
+        try:
+            pickle.dump(job, self.process.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+            self.process.stdin.flush()
+        except OSError:
+            return EOFError()
+        reader = threading.Thread(target=read, name="ducpy-validation-reply", daemon=True)
+        reader.start()
+        reader.join(timeout)
+        if reader.is_alive():
+            self.kill()
+            reader.join()
+            return TimeoutError()
+        self.runs += 1
+        return reply[0]
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+
+class ValidationWorkerPool:
+    """Pool of pre-started Python processes that validate model code.
+
+    Parameters
+    ----------
+    size : int, default=2
+        Number of worker processes; at most this many validations run at once.
+    preload : Iterable[str], default=()
+        Modules each worker imports before its first job (missing ones are
+        skipped).
+    max_runs : int, default=100
+        Replace a worker after this many validations.
+    max_memory_bytes : int, optional
+        Replace a worker whose resident memory exceeds this after a job.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        preload: Iterable[str] = (),
+        max_runs: int = 100,
+        max_memory_bytes: Optional[int] = None,
+    ):
+        if size <= 0:
+            raise ValueError("size must be greater than zero")
+        if max_runs <= 0:
+            raise ValueError("max_runs must be greater than zero")
+        self.size = size
+        self.preload = tuple(preload)
+        self.max_runs = max_runs
+        self.max_memory_bytes = max_memory_bytes
+        self._idle: "queue.LifoQueue[Optional[_Worker]]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._runs = self._started = self._recycled = self._timeouts = self._crashes = 0
+        # Start every worker now so imports happen before the first save.
+        try:
+            for _ in range(size):
+                self._idle.put(self._spawn())
+        except BaseException:
+            self._closed = True
+            while not self._idle.empty():
+                self._idle.get().kill()
+            raise
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        code: str,
+        cwd: str,
+        resolved_files: Optional[Dict[str, str]] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """Run *code* in a worker with *cwd* as its sandbox directory.
+
+        Returns ``("ok", None)``, ``("failed", output)``, ``("timeout", None)``
+        or ``("crashed", message)``.
+        """
+        worker = self._acquire()
+        replace = True
+        try:
+            reply = worker.request((code, os.fspath(cwd), dict(resolved_files or {})), timeout_seconds)
+            with self._lock:
+                self._runs += 1
+            if isinstance(reply, TimeoutError):
+                with self._lock:
+                    self._timeouts += 1
+                return "timeout", None
+            if isinstance(reply, EOFError):
+                with self._lock:
+                    self._crashes += 1
+                returncode = worker.process.wait()
+                return "crashed", f"validation worker exited with code {returncode}"
+
+            ok, detail, rss = reply
+            replace = worker.runs >= self.max_runs or (
+                self.max_memory_bytes is not None and rss > self.max_memory_bytes
+            )
+            return ("ok", None) if ok else ("failed", detail)
+        finally:
+            self._release(worker, replace)
+
+    def close(self) -> None:
+        """Stop every worker; running validations finish first."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in range(self.size):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.close()
+
+    @property
+    def stats(self) -> ValidationWorkerPoolStats:
+        with self._lock:
+            return ValidationWorkerPoolStats(
+                runs=self._runs,
+                started=self._started,
+                recycled=self._recycled,
+                timeouts=self._timeouts,
+                crashes=self._crashes,
+            )
+
+    def __enter__(self) -> "ValidationWorkerPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self) -> str:
+        return f"ValidationWorkerPool(size={self.size}, preload={self.preload!r})"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.preload)
+        with self._lock:
+            self._started += 1
+        return worker
+
+    def _acquire(self) -> _Worker:
+        if self._closed:
+            raise RuntimeError("ValidationWorkerPool is closed")
+        worker = self._idle.get()
+        if worker is None or worker.process.poll() is not None:
+            # Died while idle (or a placeholder after a failed respawn).
+            worker = self._spawn()
+        return worker
+
+    def _release(self, worker: _Worker, replace: bool) -> None:
+        if replace or worker.process.poll() is not None:
+            worker.kill()
+            with self._lock:
+                self._recycled += 1
+            try:
+                worker = self._spawn() if not self._closed else None
+            except OSError:
+                worker = None
+        self._idle.put(worker)
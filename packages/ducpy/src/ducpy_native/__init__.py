@@ -7,7 +7,8 @@ package root so existing imports like ``import ducpy_native`` continue to work.
 """
 
 from .ducpy_native import (list_external_files, parse_duc,  # type: ignore[attr-defined]
-                           serialize_duc, stream_external_file_revision_to_path,
+                           serialize_duc, serialize_duc_to_bytes,
+                           stream_external_file_revision_to_path,
                            stream_checkpoint_data_to_path,
                            stream_delta_changeset_to_path,
                            get_schema_version,
@@ -18,6 +19,7 @@ from .ducpy_native import (list_external_files, parse_duc,  # type: ignore[attr-
 __all__ = [
     "parse_duc",
     "serialize_duc",
+    "serialize_duc_to_bytes",
     "list_external_files",
     "stream_external_file_revision_to_path",
     "stream_checkpoint_data_to_path",
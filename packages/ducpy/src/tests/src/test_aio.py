@@ -0,0 +1,61 @@
+"""Tests for the asyncio wrappers in ``ducpy.aio``."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import ducpy as duc
+import pytest
+
+
+def _element(x):
+    return (
+        duc.ElementBuilder()
+        .at_position(x, 0.0)
+        .with_size(10.0, 10.0)
+        .build_rectangle()
+        .build()
+    )
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="duc-test")
+    duc.aio.set_executor(pool)
+    yield pool
+    duc.aio.set_executor(None)
+    pool.shutdown(wait=True)
+
+
+def test_round_trip_on_configured_executor(executor, tmp_path):
+    async def scenario():
+        path = await duc.aio.serialize_duc_async(
+            "Async", output_path=tmp_path / "async.duc", elements=[_element(1.0)]
+        )
+        content = await duc.aio.serialize_duc_to_bytes_async("Async", elements=[_element(2.0)])
+        from_path, from_bytes, files = await asyncio.gather(
+            duc.aio.parse_duc_async(path),
+            duc.aio.parse_duc_async(content, include="elements"),
+            duc.aio.list_external_files_async(path),
+        )
+        return from_path, from_bytes, files
+
+    from_path, from_bytes, files = asyncio.run(scenario())
+    assert duc.aio.get_executor() is executor
+    assert from_path.elements[0].x == 1.0
+    assert from_bytes.elements[0].x == 2.0
+    assert files == []
+
+
+def test_per_call_executor_and_errors(tmp_path):
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            content = await duc.aio.serialize_duc_to_bytes_async(
+                "Async", elements=[_element(3.0)], executor=pool
+            )
+            data = await duc.aio.parse_duc_async(content, lazy=True, executor=pool)
+            with pytest.raises(TypeError):
+                await duc.aio.parse_duc_async(object(), executor=pool)
+            return data
+
+    data = asyncio.run(scenario())
+    assert isinstance(data, duc.LazyDucData)
+    assert data.elements[0].x == 3.0
@@ -0,0 +1,136 @@
+"""Tests for the vectorized element bounds engine."""
+import math
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+np = pytest.importorskip("numpy")
+
+
+def _insert(db, element_id, x, y, w, h, angle=0.0, element_type="rectangle"):
+    db.sql(
+        "INSERT INTO elements (id, element_type, x, y, width, height, angle) "
+        "VALUES (?,?,?,?,?,?,?)",
+        element_id, element_type, x, y, w, h, angle,
+    )
+
+
+def _insert_points(db, table, element_id, points):
+    for order, (x, y) in enumerate(points):
+        db.sql(
+            f"INSERT INTO {table} (element_id, sort_order, x, y) VALUES (?,?,?,?)",
+            element_id, order, x, y,
+        )
+
+
+@pytest.fixture
+def shapes_db():
+    db = DucSQL.new()
+    _insert(db, "rect", 0, 0, 100, 20)
+    _insert(db, "turned", 0, 0, 100, 20, angle=math.pi / 2)
+    _insert(db, "ellipse", 0, 0, 100, 20, angle=math.pi / 2, element_type="ellipse")
+    # Cubic arch from (0,0) to (100,0) peaking at y=75, anchored at (10, 10).
+    _insert(db, "curve", 10, 10, 100, 75, element_type="line")
+    db.sql("INSERT INTO element_linear (element_id) VALUES (?)", "curve")
+    _insert_points(db, "linear_element_points", "curve", [(0, 0), (100, 0)])
+    db.sql(
+        "INSERT INTO linear_element_lines (element_id, sort_order, start_index, "
+        "start_handle_x, start_handle_y, end_index, end_handle_x, end_handle_y) "
+        "VALUES (?,?,?,?,?,?,?,?)",
+        "curve", 0, 0, 0.0, 100.0, 1, 100.0, 100.0,
+    )
+    _insert(db, "ink", 5, 5, 0, 0, element_type="freedraw")
+    db.sql("INSERT INTO element_freedraw (element_id) VALUES (?)", "ink")
+    _insert_points(db, "freedraw_element_points", "ink", [(0, 0), (10, 4), (-2, 8)])
+    _insert(db, "gone", 0, 0, 1e6, 1e6)
+    db.sql("UPDATE elements SET is_deleted = 1 WHERE id = ?", "gone")
+    yield db
+    db.close()
+
+
+def test_rect_and_ellipse_kernels():
+    boxes = duc.rect_bounds([0, 0], [0, 0], [100, -100], [20, 20], [0.0, math.pi / 2])
+    assert boxes[0] == pytest.approx([0, 0, 100, 20])
+    assert boxes[1] == pytest.approx([-60, -40, -40, 60])
+
+    (box,) = duc.ellipse_bounds([0], [0], [100], [20], [math.pi / 4])
+    half = math.sqrt((50**2 + 10**2) / 2)
+    assert box == pytest.approx([50 - half, 10 - half, 50 + half, 10 + half])
+
+
+def test_compute_bounds_from_sql(shapes_db):
+    result = duc.compute_bounds(shapes_db)
+    boxes = result.as_dict()
+
+    assert set(boxes) == {"rect", "turned", "ellipse", "curve", "ink"}
+    assert boxes["rect"] == pytest.approx((0, 0, 100, 20))
+    assert boxes["turned"] == pytest.approx((40, -40, 60, 60))
+    assert boxes["ellipse"] == pytest.approx((40, -40, 60, 60))
+    assert boxes["curve"] == pytest.approx((10, 10, 110, 85))
+    assert boxes["ink"] == pytest.approx((3, 5, 15, 13))
+    assert result.bounds.shape == (5, 4)
+
+
+def test_rotated_curve_uses_exact_extrema(shapes_db):
+    shapes_db.sql("UPDATE elements SET angle = ? WHERE id = ?", math.pi, "curve")
+    boxes = duc.compute_bounds(shapes_db, types="line").as_dict()
+
+    # Rotating 180° about the unrotated extent's centre keeps the same box.
+    assert boxes == {"curve": pytest.approx((10, 10, 110, 85))}
+
+
+def test_parsed_elements_match_sql(shapes_db):
+    elements = [
+        {"id": "turned", "type": "rectangle", "x": 0, "y": 0, "width": 100, "height": 20,
+         "angle": math.pi / 2},
+        {"id": "curve", "type": "line", "x": 10, "y": 10, "width": 100, "height": 75,
+         "angle": 0.0, "points": [{"x": 0, "y": 0}, {"x": 100, "y": 0}],
+         "lines": [{"start": {"index": 0, "handle": {"x": 0, "y": 100}},
+                    "end": {"index": 1, "handle": {"x": 100, "y": 100}}}]},
+        {"id": "ink", "type": "freedraw", "x": 5, "y": 5, "width": 0, "height": 0,
+         "angle": 0.0, "points": [{"x": 0, "y": 0}, {"x": 10, "y": 4}, {"x": -2, "y": 8}]},
+        {"id": "gone", "type": "rectangle", "x": 0, "y": 0, "width": 1, "height": 1,
+         "angle": 0.0, "is_deleted": True},
+    ]
+    parsed = duc.compute_bounds(duc.DucData(elements=elements)).as_dict()
+    from_sql = duc.compute_bounds(shapes_db).as_dict()
+
+    assert set(parsed) == {"turned", "curve", "ink"}
+    for element_id, box in parsed.items():
+        assert box == pytest.approx(from_sql[element_id])
+
+
+def test_small_batches_match_single_batch(shapes_db):
+    whole = duc.compute_bounds(shapes_db)
+    batched = duc.compute_bounds(shapes_db, batch_size=2)
+
+    assert batched.ids == whole.ids
+    assert np.allclose(batched.bounds, whole.bounds)
+
+
+def test_write_bounds_refines_spatial_index(shapes_db):
+    duc.ensure_spatial_index(shapes_db)
+    # The trigger box for the curve only covers its stored width/height.
+    assert duc.query_elements_in_rect(shapes_db, 0, 86, 200, 200) == []
+
+    assert duc.write_bounds(shapes_db) == 5
+    (hit,) = duc.query_elements_in_rect(shapes_db, 14, 80, 16, 200, types="line")
+    assert hit.id == "curve"
+    assert hit.max_y == pytest.approx(85, abs=1e-3)
+    turned = duc.query_elements_in_rect(shapes_db, 39, -41, 61, 61, contained=True)
+    assert {h.id for h in turned} >= {"turned", "ellipse"}
+
+
+def test_type_filter_reaches_point_queries(shapes_db):
+    statements = []
+    shapes_db.conn.set_trace_callback(statements.append)
+    try:
+        boxes = duc.compute_bounds(shapes_db, types="freedraw").as_dict()
+    finally:
+        shapes_db.conn.set_trace_callback(None)
+
+    assert boxes == {"ink": pytest.approx((3, 5, 15, 13))}
+    point_queries = [s for s in statements if s.startswith("SELECT e.rowid")]
+    assert point_queries
+    assert all("element_type IN ('freedraw')" in s for s in point_queries)
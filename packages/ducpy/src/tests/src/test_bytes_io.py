@@ -0,0 +1,75 @@
+"""Tests for parsing and serializing ``.duc`` content in memory."""
+import io
+import mmap
+
+import ducpy as duc
+import pytest
+
+
+def _elements():
+    return [
+        duc.ElementBuilder()
+        .at_position(float(i * 20), 5.0)
+        .with_size(10.0, 10.0)
+        .build_rectangle()
+        .build()
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def duc_bytes():
+    return duc.serialize_duc_to_bytes(name="InMemory", elements=_elements())
+
+
+def test_serialize_to_bytes_round_trips(duc_bytes, tmp_path):
+    assert isinstance(duc_bytes, bytes)
+    assert duc_bytes[:2] == b"\x1f\x8b"
+
+    data = duc.parse_duc(duc_bytes)
+    assert [e.x for e in data.elements] == [0.0, 20.0, 40.0]
+
+    path = duc.serialize_duc(name="InMemory", output_path=tmp_path / "same.duc", elements=_elements())
+    assert len(duc.parse_duc(path).elements) == len(data.elements)
+
+
+@pytest.mark.parametrize("wrap", [bytearray, memoryview, lambda b: memoryview(b"xx" + b)[2:]])
+def test_parse_buffer_types(duc_bytes, wrap):
+    data = duc.parse_duc(wrap(duc_bytes), include="elements")
+    assert len(data.elements) == 3
+
+
+def test_parse_mmap(duc_bytes, tmp_path):
+    path = tmp_path / "mapped.duc"
+    path.write_bytes(duc_bytes)
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = duc.parse_duc(mapped, lazy=True)
+        assert len(data.elements) == 3
+    assert duc.list_external_files(duc_bytes) == []
+
+
+def test_rejects_non_buffer_objects(duc_bytes):
+    with pytest.raises(TypeError):
+        duc.parse_duc(io.BytesIO(duc_bytes))
+    with pytest.raises(TypeError):
+        duc.list_external_files(42)
+
+
+def test_serialize_write_options(tmp_path):
+    raw = duc.serialize_duc_to_bytes(name="Raw", elements=_elements(), compression_level=0,
+                                     page_size=16384)
+    assert raw[:16] == b"SQLite format 3\x00"
+    assert int.from_bytes(raw[16:18], "big") == 16384
+    assert raw[18:20] == b"\x01\x01"  # no WAL: the raw image opens read-only on its own
+    assert len(duc.parse_duc(raw).elements) == 3
+
+    fast = duc.serialize_duc_to_bytes(name="Fast", elements=_elements(), compression_level=1)
+    small = duc.serialize_duc(name="Small", output_path=tmp_path / "small.duc",
+                              elements=_elements(), compression_level=9)
+    assert fast[:2] == b"\x1f\x8b"
+    assert len(duc.parse_duc(small).elements) == 3
+
+    with pytest.raises(ValueError):
+        duc.serialize_duc_to_bytes(name="Bad", elements=_elements(), compression_level=10)
+    with pytest.raises(ValueError):
+        duc.serialize_duc_to_bytes(name="Bad", elements=_elements(), page_size=1000)
@@ -0,0 +1,80 @@
+"""Tests for the columnar NumPy export."""
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+np = pytest.importorskip("numpy")
+
+
+def _insert(db, element_id, element_type, x=0.0, y=0.0, deleted=0):
+    db.sql(
+        "INSERT INTO elements (id, element_type, x, y, width, height, is_deleted) "
+        "VALUES (?,?,?,?,?,?,?)",
+        element_id, element_type, x, y, 10.0, 10.0, deleted,
+    )
+
+
+def _insert_points(db, table, element_id, points, mirroring=None):
+    for order, (x, y) in enumerate(points):
+        db.sql(
+            f"INSERT INTO {table} (element_id, sort_order, x, y, mirroring) VALUES (?,?,?,?,?)",
+            element_id, order, x, y, mirroring,
+        )
+
+
+@pytest.fixture
+def markup_db():
+    db = DucSQL.new()
+    _insert(db, "ink1", "freedraw", x=100.0)
+    _insert_points(db, "freedraw_element_points", "ink1", [(0, 0), (1, 1), (2, 4)])
+    _insert(db, "box", "rectangle")
+    _insert(db, "wire", "line", y=5.0)
+    _insert_points(db, "linear_element_points", "wire", [(0, 0), (10, 0)], mirroring=11)
+    _insert(db, "ink2", "freedraw")
+    _insert_points(db, "freedraw_element_points", "ink2", [(5, 5)])
+    _insert(db, "old", "freedraw", deleted=1)
+    _insert_points(db, "freedraw_element_points", "old", [(9, 9)])
+    yield db
+    db.close()
+
+
+def test_to_columns_layout(markup_db):
+    cols = duc.to_columns(markup_db)
+
+    assert list(cols.elements["id"]) == ["ink1", "box", "wire", "ink2"]
+    assert list(cols.elements["type"]) == ["freedraw", "rectangle", "line", "freedraw"]
+    assert cols.elements["x"].dtype == np.float64
+    assert cols.elements["is_visible"].all()
+
+    ink = cols.freedraw_points
+    assert list(ink.offsets) == [0, 3, 3, 3, 4]
+    assert list(ink.points_of(0)["y"]) == [0, 1, 4]
+    assert list(ink.owners()) == [0, 0, 0, 3]
+    assert list(ink.values["mirroring"]) == [-1, -1, -1, -1]
+
+    wire = cols.linear_points
+    assert list(wire.offsets) == [0, 0, 0, 2, 2]
+    assert list(wire.points_of(2)["x"]) == [0, 10]
+    assert list(wire.values["mirroring"]) == [11, 11]
+
+
+def test_to_columns_filters(markup_db):
+    cols = duc.to_columns(markup_db, types="freedraw", include_deleted=True)
+
+    assert list(cols.elements["id"]) == ["ink1", "ink2", "old"]
+    assert list(cols.freedraw_points.offsets) == [0, 3, 4, 5]
+    assert len(cols.linear_points) == 0
+    absolute_x = cols.freedraw_points.values["x"] + np.repeat(
+        cols.elements["x"], np.diff(cols.freedraw_points.offsets)
+    )
+    assert list(absolute_x) == [100, 101, 102, 5, 9]
+
+
+def test_to_columns_from_path(markup_db, tmp_path):
+    path = tmp_path / "markup.duc"
+    markup_db.save(str(path))
+
+    cols = duc.to_columns(str(path), types=("line",))
+    assert list(cols.elements["id"]) == ["wire"]
+    assert cols.elements["y"][0] == 5.0
+    assert len(cols.linear_points) == 2
@@ -0,0 +1,65 @@
+"""Tests for the precompiled dataclass-to-camelCase converters."""
+from dataclasses import asdict
+
+import ducpy as duc
+from ducpy.serialize import _element_to_camel
+from ducpy.utils.convert import (_flatten_dict, dataclass_converter,
+                                 deep_snake_to_camel, to_serializable)
+
+
+def _legacy(obj, flatten=True):
+    d = asdict(obj)
+    return deep_snake_to_camel(_flatten_dict(d) if flatten else d)
+
+
+def _elements():
+    builder = lambda: duc.ElementBuilder().at_position(5, 10).with_size(40, 20)
+    return [
+        builder().with_label("Rect").with_bound_element("t1", "text").build_rectangle().build(),
+        builder().build_ellipse().with_ratio(0.5).build(),
+        builder().build_polygon().with_sides(6).build(),
+        builder().build_linear_element().with_points([(0, 0), (50, 50), (80, 10)]).build(),
+        builder().build_arrow_element().with_points([(0, 0), (30, 30)]).build(),
+        builder().build_text_element().with_text("Hello")
+        .with_text_style(duc.create_text_style(font_family="Arial", font_size=18)).build(),
+        builder().build_doc_element().with_text("= Doc").build(),
+        builder().build_frame_element().build(),
+        builder().build_freedraw_element().build(),
+    ]
+
+
+def test_element_conversion_matches_asdict_pipeline():
+    for wrapper in _elements():
+        element = wrapper.element
+        expected = _legacy(element)
+        expected["type"] = _element_to_camel(wrapper)["type"]
+        assert _element_to_camel(wrapper) == expected
+
+
+def test_state_conversion_matches_asdict_pipeline():
+    states = [
+        duc.StateBuilder().build_global_state().build(),
+        duc.StateBuilder().build_local_state().build(),
+        duc.StateBuilder().with_id("l1").build_layer().with_label("Layer").build(),
+        duc.StateBuilder().with_id("g1").build_group().with_label("Group").build(),
+        duc.StateBuilder().with_id("r1").build_region()
+        .with_boolean_operation(duc.BOOLEAN_OPERATION.UNION).build(),
+    ]
+    for state in states:
+        assert to_serializable(state) == _legacy(state)
+        assert deep_snake_to_camel(state) == _legacy(state, flatten=False)
+        assert to_serializable({"nested_state": state}) == {
+            "nestedState": _legacy(state, flatten=False)
+        }
+
+
+def test_converters_are_cached_and_do_not_alias_input():
+    wrapper = _elements()[3]
+    element = wrapper.element
+    converter = dataclass_converter(type(element))
+    assert converter is dataclass_converter(type(element))
+    assert converter is not dataclass_converter(type(element), flatten=False)
+
+    first = converter(element)
+    first["points"].clear()
+    assert converter(element)["points"]
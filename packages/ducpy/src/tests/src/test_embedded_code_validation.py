@@ -1,6 +1,9 @@
 """Tests to verify embedded code validation during DUC serialization for Document and Model elements."""
 
+import io
 import os
+import threading
+
 import pytest
 
 from _dev.dev_utils import download_fixture_from_cdn
@@ -370,3 +373,112 @@ def test_python_validation_fallback_reports_runtime_failure(monkeypatch):
 
     assert "Python validation failed" in str(excinfo.value)
     assert "embedded boom" in str(excinfo.value)
+
+
+def _model(element_id, code):
+    return (
+        duc.ElementBuilder()
+        .with_id(element_id)
+        .build_model_element()
+        .with_code(code)
+        .build()
+    )
+
+
+def test_parallel_validation_keeps_element_order():
+    elements = [
+        _model("slow_fail", "import time\ntime.sleep(0.5)\nraise RuntimeError('slow boom')"),
+        _model("ok", "value = 1 + 1"),
+        _model("fast_fail", "raise RuntimeError('fast boom')"),
+    ]
+
+    with pytest.raises(duc.DucSerializationValidationError) as excinfo:
+        duc.serialize_duc(
+            name="ParallelValidationOrderTest",
+            elements=elements,
+            validation_workers=3,
+        )
+
+    failures = excinfo.value.failures
+    assert len(failures) == 2
+    assert failures[0].startswith("model slow_fail:") and "slow boom" in failures[0]
+    assert failures[1].startswith("model fast_fail:") and "fast boom" in failures[1]
+
+
+def test_parallel_validation_overlaps_elements():
+    import time
+
+    elements = [_model(f"m{i}", "import time\ntime.sleep(0.5)") for i in range(4)]
+
+    started = time.perf_counter()
+    serialized_path = duc.serialize_duc(
+        name="ParallelValidationTest",
+        elements=elements,
+        validation_workers=4,
+    )
+    assert serialized_path
+    assert time.perf_counter() - started < 1.8
+
+    with pytest.raises(ValueError):
+        duc.serialize_duc(name="BadWorkers", elements=elements, validation_workers=0)
+
+
+def test_external_files_are_shared_and_limited_to_references():
+    files = [
+        duc.StateBuilder().with_id(file_id).build_external_file().with_data(data).build()
+        for file_id, data in (("step_part", b"STEP-DATA"), ("unused_pdf", b"%PDF-1.7"))
+    ]
+    reads_file = "\n".join([
+        "import os",
+        "path = resolve_external_file('step_part')",
+        "assert open(path, 'rb').read() == b'STEP-DATA'",
+        # Hard-linked from the shared copy rather than written again.
+        "assert os.stat(path).st_nlink >= 2 or os.path.islink(path)",
+        "assert not os.stat(path).st_mode & 0o222",
+        "assert sorted(os.listdir('scopture-files')) == ['step_part']",
+    ])
+    declares_file = "import os\nassert os.listdir('scopture-files') == ['step_part']"
+    no_files = "import os\nassert not os.path.exists('scopture-files')"
+
+    elements = [
+        _model("reads", reads_file),
+        duc.ElementBuilder().with_id("declares").build_model_element()
+        .with_code(declares_file).with_file_ids(["step_part"]).build(),
+        _model("none", no_files),
+    ]
+    serialized_path = duc.serialize_duc(
+        name="SharedSandboxFilesTest",
+        elements=elements,
+        external_files=files,
+        validation_workers=3,
+    )
+    assert serialized_path
+
+
+def test_sandbox_files_stream_each_file_under_its_own_lock():
+    release = threading.Event()
+
+    class _BlockingStream(io.BytesIO):
+        def read(self, size=-1):
+            release.wait(5)
+            return super().read(size)
+
+    meta = {
+        file_id: {"activeRevisionId": f"{file_id}-rev", "revisions": {f"{file_id}-rev": {"sourceName": "f.bin"}}}
+        for file_id in ("slow", "fast")
+    }
+    data = {"slow-rev": _BlockingStream(b"SLOW"), "fast-rev": b"FAST"}
+    files = duc_serialize._SandboxFiles(meta, data)
+    try:
+        worker = threading.Thread(target=files._materialize, args=("slow",))
+        worker.start()
+        # Another file is written and hashed while "slow" is still streaming.
+        assert files._materialize("fast").read_bytes() == b"FAST"
+        assert files.digest(["fast"])
+        assert worker.is_alive()
+        release.set()
+        worker.join()
+        assert files._materialize("slow").read_bytes() == b"SLOW"
+    finally:
+        release.set()
+        files.close()
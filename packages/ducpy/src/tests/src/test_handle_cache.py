@@ -0,0 +1,121 @@
+"""Tests for DucHandleCache — cached, refcounted DucSQL handles."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+
+def _write(path, element_ids, compression_level=6):
+    with DucSQL.new() as db:
+        for element_id in element_ids:
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", element_id, "text")
+        db.save(path, compression_level=compression_level)
+
+
+def _ids(db):
+    return [row["id"] for row in db.sql("SELECT id FROM elements ORDER BY id")]
+
+
+def test_reuses_handles_and_reopens_changed_files(tmp_path):
+    path = tmp_path / "project.duc"
+    _write(path, ["a"])
+    with duc.DucHandleCache(max_open=4) as cache:
+        with cache.checkout(path) as db:
+            first, temp = db, db._temp
+            assert _ids(db) == ["a"]
+        with cache.checkout(str(path)) as db:
+            assert db is first
+        assert os.path.exists(temp)
+        assert cache.stats.temp_bytes == os.path.getsize(temp)
+
+        _write(path, ["a", "b"])
+        os.utime(path, ns=(0, 0))  # a different mtime even on coarse clocks
+        with cache.checkout(path) as db:
+            assert db is not first and _ids(db) == ["a", "b"]
+        assert first._closed and not os.path.exists(temp)
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.invalidations, stats.open) == (1, 2, 1, 1)
+    assert path not in cache and db._closed
+
+
+def test_lru_eviction_spares_checked_out_handles(tmp_path):
+    paths = [tmp_path / f"p{i}.duc" for i in range(4)]
+    for i, path in enumerate(paths):
+        _write(path, [f"e{i}"])
+
+    cache = duc.DucHandleCache(max_open=2)
+    with cache.checkout(paths[0]) as pinned:
+        for path in paths[1:]:
+            with cache.checkout(path):
+                pass
+        assert not pinned._closed and paths[0] in cache
+        assert _ids(pinned) == ["e0"]
+    assert len(cache) == 2 and paths[-1] in cache
+    assert cache.stats.evictions == 2
+
+    # A byte budget smaller than one temp file keeps only in-use handles.
+    tight = duc.DucHandleCache(max_temp_bytes=1)
+    with tight.checkout(paths[0]) as db:
+        with tight.checkout(paths[1]):
+            assert len(tight) == 2
+    assert len(tight) == 0 and db._closed
+    cache.close()
+
+
+def test_shared_across_threads_and_own_writes(tmp_path):
+    path = tmp_path / "raw.duc"
+    _write(path, ["a"], compression_level=0)
+    cache = duc.DucHandleCache()
+    lock = threading.Lock()
+
+    def read(_):
+        with cache.checkout(path) as db:
+            with lock:
+                return _ids(db)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(read, range(8))) == [["a"]] * 8
+    with cache.checkout(path) as db:
+        db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "b", "text")
+    with pytest.raises(RuntimeError):
+        with cache.checkout(path) as db:
+            db.sql("DELETE FROM elements")
+            raise RuntimeError("abort")
+    with cache.checkout(path) as again:
+        assert again is db and _ids(again) == ["a", "b"]
+    assert cache.stats.invalidations == 0 and len(cache) == 1
+    cache.close()
+
+
+def test_overlapping_checkouts_are_serialized(tmp_path):
+    path = tmp_path / "raw.duc"
+    _write(path, ["a"], compression_level=0)
+    cache = duc.DucHandleCache()
+    entered = threading.Event()
+
+    def other():
+        with cache.checkout(path) as db:
+            entered.set()
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "c", "text")
+
+    with pytest.raises(RuntimeError):
+        with cache.checkout(path) as db:
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "b", "text")
+            worker = threading.Thread(target=other)
+            worker.start()
+            # The second checkout must not start (or commit our insert) yet.
+            assert not entered.wait(0.2)
+            with cache.checkout(path) as nested:
+                assert nested is db and _ids(nested) == ["a", "b"]
+            raise RuntimeError("abort")
+    worker.join()
+
+    assert entered.is_set()
+    with cache.checkout(path) as db:
+        assert _ids(db) == ["a", "c"]
+    assert cache.stats.invalidations == 0
+    cache.close()
@@ -0,0 +1,73 @@
+"""Tests for the per-phase timing spans in ``ducpy.instrumentation``."""
+import ducpy as duc
+import pytest
+from ducpy import instrumentation
+
+
+def _element(x):
+    return (
+        duc.ElementBuilder()
+        .at_position(x, 0.0)
+        .with_size(10.0, 10.0)
+        .build_rectangle()
+        .build()
+    )
+
+
+@pytest.fixture
+def hooked():
+    spans = []
+    instrumentation.set_hook(spans.append)
+    yield spans
+    instrumentation.set_hook(None)
+
+
+def test_serialize_and_parse_emit_phase_spans(hooked, tmp_path):
+    with instrumentation.record() as recorded:
+        path = duc.serialize_duc("Spans", tmp_path / "spans.duc", elements=[_element(1.0)])
+        duc.parse_duc(path)
+
+    assert recorded == hooked
+    assert [span.name for span in recorded] == [
+        "serialize_duc.convert",
+        "serialize_duc.validate",
+        "serialize_duc.write",
+        "serialize_duc.total",
+        "parse_duc.read",
+        "parse_duc.convert",
+        "parse_duc.total",
+    ]
+    size = (tmp_path / "spans.duc").stat().st_size
+    by_name = {span.name: span for span in recorded}
+    assert by_name["serialize_duc.write"].bytes == size
+    assert by_name["parse_duc.read"].bytes == size
+    assert all(span.ok and span.seconds >= 0 for span in recorded)
+
+    content = duc.serialize_duc_to_bytes("Spans", elements=[_element(2.0)], validate_embedded_code=False)
+    assert [span.name for span in hooked[-2:]] == ["serialize_duc_to_bytes.write", "serialize_duc_to_bytes.total"]
+    assert hooked[-1].bytes == len(content)
+
+
+def test_failures_are_reported_and_hook_errors_ignored(tmp_path):
+    def broken_hook(span):
+        raise RuntimeError("metrics backend down")
+
+    instrumentation.set_hook(broken_hook)
+    try:
+        with instrumentation.record() as recorded:
+            with pytest.raises(TypeError):
+                duc.parse_duc(object())
+            assert duc.parse_duc(duc.serialize_duc_to_bytes("Spans", elements=[_element(3.0)]))
+    finally:
+        instrumentation.set_hook(None)
+
+    failed = [span.name for span in recorded if not span.ok]
+    assert failed == ["parse_duc.read", "parse_duc.total"]
+    assert instrumentation.get_hook() is None
+
+
+def test_no_spans_without_hook_or_recorder(tmp_path):
+    with instrumentation.record() as outer:
+        pass
+    duc.serialize_duc_to_bytes("Quiet", elements=[_element(4.0)])
+    assert outer == []
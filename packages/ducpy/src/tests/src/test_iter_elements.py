@@ -0,0 +1,90 @@
+"""Tests for streaming elements straight from the SQLite tables."""
+import sqlite3
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+
+@pytest.fixture
+def drawing(tmp_path):
+    path = tmp_path / "stream.duc"
+    with DucSQL.new(path) as db:
+        for i in range(25):
+            db.sql(
+                "INSERT INTO elements (id, element_type, x, y, width, height, z_index) "
+                "VALUES (?,?,?,?,?,?,?)",
+                f"r{i}", "rectangle", i, i, 10, 10, i,
+            )
+        db.sql("INSERT INTO elements (id, element_type, z_index) VALUES (?,?,?)", "t1", "text", 100)
+        db.sql("INSERT INTO element_text (element_id, text, original_text) VALUES (?,?,?)",
+               "t1", "Hello", "Hello")
+        db.sql("INSERT INTO elements (id, element_type, z_index) VALUES (?,?,?)", "l1", "line", 101)
+        for order, (x, y) in enumerate([(0, 0), (5, 5), (10, 0)]):
+            db.sql("INSERT INTO linear_element_points (element_id, sort_order, x, y) VALUES (?,?,?,?)",
+                   "l1", order, x, y)
+    return path
+
+
+def test_iter_elements_yields_all_in_z_order(drawing):
+    ids = [element.id for element in duc.iter_elements(drawing, batch_size=7)]
+
+    assert len(ids) == 27
+    assert ids[:3] == ["r0", "r1", "r2"]
+    assert ids[-2:] == ["t1", "l1"]
+
+
+def test_batches_respect_batch_size(drawing):
+    sizes = [len(batch) for batch in duc.iter_element_batches(drawing, batch_size=10)]
+
+    assert sizes == [10, 10, 7]
+
+
+def test_where_filter_and_details(drawing):
+    texts = list(duc.iter_elements(drawing, where="element_type = ?", params=("text",)))
+
+    assert len(texts) == 1
+    assert texts[0].type == "text"
+    assert texts[0].text == "Hello"
+    assert texts[0].is_deleted is False
+
+
+def test_linear_points_are_ordered(drawing):
+    (line,) = duc.iter_elements(drawing, where="id = ?", params=("l1",))
+
+    assert [(p.x, p.y) for p in line.points] == [(0, 0), (5, 5), (10, 0)]
+
+
+def test_without_details_only_base_columns(drawing):
+    (line,) = duc.iter_elements(drawing, where="id = ?", params=("l1",), details=False)
+
+    assert "points" not in line
+    assert line.z_index == 101
+
+
+def test_accepts_open_ducsql(drawing):
+    with DucSQL(drawing) as db:
+        count = sum(1 for _ in duc.iter_elements(db, batch_size=5))
+        assert count == 27
+        assert db.sql("SELECT COUNT(*) AS n FROM elements")[0]["n"] == 27
+
+
+def test_reading_a_path_leaves_the_file_untouched(drawing):
+    conn = sqlite3.connect(drawing)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.close()
+    before = drawing.read_bytes()
+    assert before[18:20] == b"\x01\x01"
+
+    assert sum(1 for _ in duc.iter_elements(drawing)) == 27
+    assert len(duc.compute_bounds(drawing)) == 27
+    assert len(duc.to_columns(drawing)["elements"]) == 27
+    assert len(duc.query_elements_in_rect(drawing, 0, 0, 5, 5)) > 0
+
+    assert drawing.read_bytes() == before
+    assert not drawing.with_name(drawing.name + "-wal").exists()
+
+
+def test_invalid_batch_size(drawing):
+    with pytest.raises(ValueError):
+        next(duc.iter_elements(drawing, batch_size=0))
@@ -0,0 +1,82 @@
+"""Tests for the lazy ``parse_duc(..., lazy=True)`` view."""
+import ducpy as duc
+import pytest
+from ducpy.parse import LazyDucList
+
+
+@pytest.fixture
+def rectangles_duc(tmp_path):
+    elements = [
+        duc.ElementBuilder()
+        .at_position(10.0 * i, 20.0)
+        .with_size(100.0, 50.0)
+        .with_label(f"Rect {i}")
+        .build_rectangle()
+        .build()
+        for i in range(3)
+    ]
+    path = tmp_path / "lazy.duc"
+    duc.serialize_duc(name="LazyParse", output_path=path, elements=elements)
+    return path
+
+
+def test_lazy_matches_eager(rectangles_duc):
+    eager = duc.parse_duc(rectangles_duc)
+    lazy = duc.parse_duc(rectangles_duc, lazy=True)
+
+    assert isinstance(lazy, duc.LazyDucData)
+    assert set(lazy.keys()) == set(eager.keys())
+    assert len(lazy.elements) == len(eager.elements)
+    assert lazy.elements[0].id == eager.elements[0].id
+    assert lazy.elements[-1]["x"] == eager.elements[-1]["x"]
+    assert lazy.materialize() == eager
+
+
+def test_lazy_converts_on_access(rectangles_duc):
+    lazy = duc.parse_duc(rectangles_duc, lazy=True)
+
+    assert lazy._values == {}
+    first = lazy.elements[0]
+    assert set(lazy._values) == {"elements"}
+    assert first is lazy.elements[0]
+    assert "is_deleted" in first
+
+
+def test_lazy_view_is_mutable(rectangles_duc):
+    lazy = duc.parse_duc(rectangles_duc, lazy=True)
+
+    lazy.elements[0].label = "Renamed"
+    lazy.extra = 1
+    del lazy["groups"]
+
+    data = lazy.materialize()
+    assert data.elements[0].label == "Renamed"
+    assert data.extra == 1
+    assert "groups" not in data
+    with pytest.raises(AttributeError):
+        lazy.groups
+
+
+def test_lazy_edits_without_reads_survive_materialize():
+    deleted = duc.LazyDucData({"elements": [], "groups": [1]})
+    del deleted["groups"]
+    assert "groups" not in deleted.materialize()
+
+    added = duc.LazyDucData({"elements": []})
+    added["extra"] = 1
+    assert added.materialize() == {"elements": [], "extra": 1}
+
+    untouched = duc.LazyDucData({"blockInstances": [{"blockId": "b"}]})
+    assert untouched.materialize().block_instances[0].block_id == "b"
+
+
+def test_lazy_list_negative_indexes():
+    els = LazyDucList([{"id": "a"}, {"id": "b"}])
+
+    assert els[-1] is els[1]
+    assert els[-2].id == "a"
+    assert set(els._items) == {0, 1}
+    for index in (2, -3):
+        with pytest.raises(IndexError):
+            els[index]
+    assert list(els)[-1].id == "b"
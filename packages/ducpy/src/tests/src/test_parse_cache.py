@@ -0,0 +1,126 @@
+"""Tests for the opt-in ``parse_duc`` cache."""
+import os
+import shutil
+
+import ducpy as duc
+import pytest
+
+
+def _write_duc(path, count=1):
+    elements = [
+        duc.ElementBuilder()
+        .at_position(float(i * 20), 0.0)
+        .with_size(10.0, 10.0)
+        .build_rectangle()
+        .build()
+        for i in range(count)
+    ]
+    duc.serialize_duc(name="Cached", output_path=path, elements=elements)
+    return path
+
+
+@pytest.fixture
+def doc_path(tmp_path):
+    return _write_duc(tmp_path / "cached.duc")
+
+
+def test_repeat_parses_hit_the_cache(doc_path):
+    cache = duc.cache.ParseCache()
+    first = cache.parse(doc_path)
+    second = cache.parse(str(doc_path))
+
+    assert len(first.elements) == len(second.elements) == 1
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.current_bytes > 0
+    assert stats.hit_rate == pytest.approx(0.5)
+    assert doc_path in cache
+
+
+def test_views_cannot_corrupt_the_entry(doc_path):
+    cache = duc.ParseCache()
+    view = cache.parse(doc_path)
+    view.elements[0].x = 999.0
+    view.extra = "mine"
+
+    fresh = cache.parse(doc_path)
+    assert fresh.elements[0].x == 0.0
+    assert "extra" not in fresh
+
+    copying = duc.ParseCache(copy=True)
+    data = copying.parse(doc_path)
+    data.elements.clear()
+    assert isinstance(data, duc.DucData)
+    assert len(copying.parse(doc_path).elements) == 1
+
+
+def test_file_changes_invalidate(doc_path):
+    cache = duc.ParseCache()
+    cache.parse(doc_path)
+    _write_duc(doc_path, count=3)
+    stat = os.stat(doc_path)
+    os.utime(doc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert len(cache.parse(doc_path).elements) == 3
+    assert cache.stats.misses == 2
+    assert len(cache) == 1
+    assert cache.invalidate(doc_path) == 1
+    assert len(cache) == 0
+
+
+def test_sections_are_separate_entries(doc_path):
+    cache = duc.ParseCache()
+    partial = cache.parse(doc_path, include="elements")
+    full = cache.parse(doc_path)
+
+    assert "layers" not in partial
+    assert "layers" in full
+    assert cache.stats.entries == 2
+
+
+def test_byte_budget_evicts_least_recent(tmp_path):
+    paths = [_write_duc(tmp_path / f"doc{i}.duc", count=5) for i in range(3)]
+    probe = duc.ParseCache()
+    probe.parse(paths[0])
+    entry_bytes = probe.stats.current_bytes
+
+    cache = duc.ParseCache(max_bytes=int(entry_bytes * 2.5))
+    cache.parse(paths[0])
+    cache.parse(paths[1])
+    cache.parse(paths[0])
+    cache.parse(paths[2])
+
+    assert paths[0] in cache and paths[2] in cache
+    assert paths[1] not in cache
+    assert cache.stats.evictions == 1
+
+    tiny = duc.ParseCache(max_bytes=1)
+    assert len(tiny.parse(paths[0]).elements) == 5
+    assert len(tiny) == 0
+
+
+def test_content_identity_shares_copies(doc_path, tmp_path):
+    copy_path = tmp_path / "copy.duc"
+    shutil.copyfile(doc_path, copy_path)
+    cache = duc.ParseCache(identity="content")
+    cache.parse(doc_path)
+    cache.parse(copy_path)
+
+    assert cache.stats.hits == 1
+    with pytest.raises(ValueError):
+        duc.ParseCache(identity="hash")
+
+
+def test_failed_parses_leave_no_in_flight_locks(tmp_path):
+    bad = tmp_path / "corrupt.duc"
+    bad.write_bytes(b"not a duc file")
+    cache = duc.cache.ParseCache()
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            cache.parse(bad)
+    with pytest.raises(FileNotFoundError):
+        cache.parse(tmp_path / "missing.duc")
+
+    assert cache._in_flight == {}
+    assert len(cache) == 0
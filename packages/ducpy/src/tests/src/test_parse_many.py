@@ -0,0 +1,76 @@
+"""Tests for concurrent multi-file parsing."""
+import ducpy as duc
+import pytest
+
+
+def _write(path, count):
+    elements = [
+        duc.ElementBuilder()
+        .at_position(float(i), 0.0)
+        .with_size(1.0, 1.0)
+        .build_rectangle()
+        .build()
+        for i in range(count)
+    ]
+    duc.serialize_duc(name=path.stem, output_path=path, elements=elements)
+    return path
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    return [_write(tmp_path / f"doc{i}.duc", i + 1) for i in range(6)]
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_parse_many_yields_every_file(corpus, use_processes):
+    outcomes = list(
+        duc.parse_many(corpus, workers=2, include="elements", use_processes=use_processes)
+    )
+
+    assert sorted(o.index for o in outcomes) == list(range(len(corpus)))
+    for outcome in outcomes:
+        assert outcome.ok
+        assert outcome.seconds >= 0.0
+        assert len(outcome.data.elements) == outcome.index + 1
+        assert outcome.path == str(corpus[outcome.index])
+
+
+def test_lazy_results_over_processes(corpus):
+    outcomes = list(duc.parse_many(corpus[:2], workers=2, lazy=True, use_processes=True))
+    assert all(isinstance(o.data, duc.LazyDucData) for o in outcomes)
+
+
+def test_error_policies(corpus, tmp_path):
+    broken = tmp_path / "broken.duc"
+    broken.write_bytes(b"not a duc file")
+    paths = [corpus[0], broken, corpus[1]]
+
+    yielded = list(duc.parse_many(paths, workers=2, on_error="yield"))
+    failed = [o for o in yielded if not o.ok]
+    assert len(yielded) == 3 and [o.path for o in failed] == [str(broken)]
+    assert failed[0].data is None
+
+    assert len(list(duc.parse_many(paths, workers=2, on_error="skip"))) == 2
+
+    seen = []
+    list(duc.parse_many(paths, workers=1, on_error=lambda path, exc: seen.append(path)))
+    assert seen == [str(broken)]
+
+    with pytest.raises(Exception):
+        list(duc.parse_many(paths, workers=1))
+    with pytest.raises(ValueError):
+        list(duc.parse_many(paths, on_error="ignore"))
+
+
+def test_backpressure_reads_paths_lazily(corpus):
+    pulled = []
+
+    def paths():
+        for path in corpus:
+            pulled.append(path)
+            yield path
+
+    results = duc.parse_many(paths(), workers=1, max_pending=2)
+    next(results)
+    assert len(pulled) <= 3
+    assert len(list(results)) == len(corpus) - 1
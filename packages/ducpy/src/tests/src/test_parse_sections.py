@@ -0,0 +1,57 @@
+"""Tests for selective section loading in ``parse_duc``."""
+import ducpy as duc
+import pytest
+
+
+@pytest.fixture
+def layered_duc(tmp_path):
+    layer = duc.StateBuilder().with_id("layer-1").build_layer().with_label("Walls").build()
+    element = (
+        duc.ElementBuilder()
+        .at_position(0.0, 0.0)
+        .with_size(10.0, 10.0)
+        .build_rectangle()
+        .build()
+    )
+    path = tmp_path / "sections.duc"
+    duc.serialize_duc(name="Sections", output_path=path, elements=[element], layers=[layer])
+    return path
+
+
+def test_include_only_returns_selected_sections(layered_duc):
+    data = duc.parse_duc(layered_duc, include=("elements", "layers"))
+
+    assert len(data.elements) == 1
+    assert len(data.layers) == 1
+    for skipped in ("thumbnail", "version_graph", "charter", "issues", "dictionary", "files"):
+        assert skipped not in data
+    assert data.version == duc.DUC_SCHEMA_VERSION
+
+
+def test_exclude_drops_sections(layered_duc):
+    data = duc.parse_duc(layered_duc, exclude=["thumbnail", "version_graph", "block_instances"])
+
+    assert "thumbnail" not in data
+    assert "version_graph" not in data
+    assert "blocks" not in data and "block_collections" not in data
+    assert len(data.elements) == 1
+
+
+def test_sections_combine_with_lazy(layered_duc):
+    data = duc.parse_duc(layered_duc, lazy=True, include="elements")
+
+    assert set(data) >= {"elements", "version", "source"}
+    assert "layers" not in data
+    assert data.elements[0].width == 10.0
+
+
+def test_unknown_section_raises(layered_duc):
+    with pytest.raises(ValueError, match="Unknown .duc section"):
+        duc.parse_duc(layered_duc, include=["geometry"])
+
+
+def test_camel_case_section_names(layered_duc):
+    data = duc.parse_duc(layered_duc, include=["elements", "globalState"], exclude="versionGraph")
+
+    assert "elements" in data and "global_state" in data
+    assert "layers" not in data and "version_graph" not in data
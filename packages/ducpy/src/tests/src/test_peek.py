@@ -0,0 +1,74 @@
+"""Tests for the metadata-only ``peek_duc``."""
+import gzip
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+
+@pytest.fixture
+def peek_path(tmp_path):
+    layer = duc.StateBuilder().with_id("walls").build_layer().with_label("Walls").build()
+    elements = [
+        duc.ElementBuilder().at_position(float(i), 0.0).with_size(1.0, 1.0).build_rectangle().build()
+        for i in range(3)
+    ]
+    elements.append(
+        duc.ElementBuilder().at_position(0.0, 0.0).with_size(5.0, 5.0).build_ellipse().build()
+    )
+    path = tmp_path / "peek.duc"
+    duc.serialize_duc(name="Peek", output_path=path, elements=elements, layers=[layer],
+                      thumbnail=b"\x89PNG-thumb")
+    return path
+
+
+def test_peek_reads_document_metadata(peek_path):
+    info = duc.peek_duc(peek_path)
+
+    assert info.compressed is True
+    assert info.schema_version == duc.DUC_SCHEMA_VERSION
+    assert info.user_version // 1_000_000 == int(info.schema_version.split(".")[0])
+    assert info.source == "ducpy_Peek"
+    assert info.thumbnail == b"\x89PNG-thumb"
+    assert info.element_counts == {"ellipse": 1, "rectangle": 3}
+    assert info.element_total == 4
+    assert [(layer.id, layer.label) for layer in info.layers] == [("walls", "Walls")]
+    assert info.page_size > 0 and info.page_count > 0
+
+
+def test_peek_header_only_and_raw_sqlite(peek_path, tmp_path):
+    header = duc.peek_duc(peek_path, header_only=True)
+    assert set(header) == {"user_version", "schema_version", "page_size", "page_count", "compressed"}
+
+    raw_path = tmp_path / "raw.sqlite"
+    raw_path.write_bytes(gzip.decompress(peek_path.read_bytes()))
+    info = duc.peek_duc(raw_path, thumbnail=False)
+    assert info.compressed is False
+    assert info.thumbnail is None
+    assert info.element_total == 4
+
+
+def test_peek_reads_pending_wal(tmp_path):
+    path = tmp_path / "live.duc"
+    with DucSQL.new(path) as db:
+        db.sql("INSERT INTO elements (id, element_type) VALUES (?,?)", "e1", "rectangle")
+        db.commit()
+        # Still open: the schema and the row only live in the -wal file.
+        assert (tmp_path / "live.duc-wal").stat().st_size > 0
+        info = duc.peek_duc(path)
+    assert info.element_counts == {"rectangle": 1}
+
+
+def test_peek_open_db_skips_deleted(peek_path):
+    with DucSQL(str(peek_path)) as db:
+        db.sql("UPDATE elements SET is_deleted = 1 WHERE element_type = 'ellipse'")
+        info = duc.peek_duc(db)
+    assert info.element_counts == {"rectangle": 3}
+    assert info.layers[0].is_visible is True
+
+
+def test_peek_rejects_non_duc(tmp_path):
+    bogus = tmp_path / "bogus.duc"
+    bogus.write_bytes(gzip.compress(b"hello world" * 20))
+    with pytest.raises(ValueError):
+        duc.peek_duc(bogus)
@@ -0,0 +1,105 @@
+"""Tests for the R*Tree spatial index and viewport queries."""
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+
+def _insert(db, element_id, x, y, w, h, angle=0.0, element_type="rectangle", layer=None, z=0.0):
+    db.sql(
+        "INSERT INTO elements (id, element_type, x, y, width, height, angle, layer_id, z_index) "
+        "VALUES (?,?,?,?,?,?,?,?,?)",
+        element_id, element_type, x, y, w, h, angle, layer, z,
+    )
+
+
+@pytest.fixture
+def grid_db():
+    db = DucSQL.new()
+    db.sql("INSERT INTO stack_properties (id, label) VALUES (?, ?)", "walls", "Walls")
+    db.sql("INSERT INTO layers (id) VALUES (?)", "walls")
+    for i in range(10):
+        for j in range(10):
+            _insert(db, f"r{i}_{j}", i * 100, j * 100, 50, 50,
+                    layer="walls" if i % 2 == 0 else None, z=i * 10 + j)
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_query_rect_overlap(grid_db, indexed):
+    if indexed:
+        grid_db.ensure_spatial_index()
+    hits = grid_db.query_elements_in_rect(0, 0, 160, 60)
+
+    assert [hit.id for hit in hits] == ["r0_0", "r1_0"]
+    assert hits[0].max_x == pytest.approx(50.0)
+
+
+def test_index_matches_scan(grid_db):
+    scan = {hit.id for hit in duc.query_elements_in_rect(grid_db, 120, 120, 480, 330)}
+    duc.ensure_spatial_index(grid_db)
+    indexed = {hit.id for hit in duc.query_elements_in_rect(grid_db, 120, 120, 480, 330)}
+
+    assert duc.has_spatial_index(grid_db.conn)
+    assert indexed == scan
+    assert len(indexed) == 12
+
+
+def test_filters_and_contained(grid_db):
+    grid_db.ensure_spatial_index()
+    on_layer = grid_db.query_elements_in_rect(0, 0, 1000, 1000, layer="walls")
+    contained = grid_db.query_elements_in_rect(0, 0, 160, 160, contained=True)
+
+    assert len(on_layer) == 50
+    assert {hit.id for hit in contained} == {"r0_0", "r0_1", "r1_0", "r1_1"}
+    assert grid_db.query_elements_in_rect(0, 0, 1000, 1000, types=("text",)) == []
+
+
+def test_triggers_keep_index_in_sync(grid_db):
+    grid_db.ensure_spatial_index()
+    grid_db.sql("UPDATE elements SET x = 5000 WHERE id = ?", "r0_0")
+    grid_db.sql("UPDATE elements SET is_deleted = 1 WHERE id = ?", "r1_0")
+    grid_db.sql("DELETE FROM elements WHERE id = ?", "r0_1")
+    _insert(grid_db, "new", 10, 10, 5, 5)
+
+    hits = {hit.id for hit in grid_db.query_elements_in_rect(0, 0, 160, 160)}
+    assert hits == {"new", "r1_1"}
+    assert [hit.id for hit in grid_db.query_elements_in_rect(4990, 0, 5100, 60)] == ["r0_0"]
+
+
+def test_rotated_bounds_are_conservative():
+    with DucSQL.new() as db:
+        _insert(db, "rot", 0, 0, 100, 10, angle=0.7)
+        db.ensure_spatial_index()
+        (hit,) = db.query_elements_in_rect(40, -40, 60, 50)
+        assert hit.min_y <= -30 and hit.max_y >= 40
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_nearest_elements(grid_db, indexed):
+    if indexed:
+        grid_db.ensure_spatial_index()
+    nearest = grid_db.nearest_elements(275, 275, k=3)
+
+    assert [hit.id for hit in nearest][:1] == ["r2_2"]
+    assert len(nearest) == 3
+    assert nearest[0].distance == pytest.approx(25 * 2 ** 0.5)
+    assert all(a.distance <= b.distance for a, b in zip(nearest, nearest[1:]))
+
+
+def test_nearest_returns_all_when_k_exceeds_count():
+    with DucSQL.new() as db:
+        _insert(db, "a", 0, 0, 1, 1)
+        _insert(db, "b", 1000, 1000, 1, 1)
+        db.ensure_spatial_index()
+        assert [hit.id for hit in db.nearest_elements(0, 0, k=5)] == ["a", "b"]
+        db.sql("DELETE FROM elements")
+        assert db.nearest_elements(0, 0, k=1) == []
+
+
+def test_drop_spatial_index(grid_db):
+    grid_db.ensure_spatial_index()
+    duc.drop_spatial_index(grid_db)
+
+    assert not duc.has_spatial_index(grid_db.conn)
+    _insert(grid_db, "after_drop", 0, 0, 1, 1)
@@ -1,5 +1,6 @@
 """Tests for DucSQL — raw SQL access to .duc databases."""
 import os
+import sqlite3
 from pathlib import Path
 
 import ducpy as duc
@@ -103,6 +104,31 @@ class TestLifecycle:
         assert len(rows) == len(duc_files)
         assert sum(row["text_count"] for row in rows) > 0
 
+    def test_open_readonly(self, tmp_path):
+        raw_path = tmp_path / "viewer.duc"
+        with DucSQL.new(raw_path) as db:
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "e1", "text")
+        gz_path = tmp_path / "viewer.gz.duc"
+        with DucSQL(raw_path) as db:
+            db.save(gz_path, compression_level=6)
+
+        readers = [DucSQL.open_readonly(raw_path) for _ in range(3)]
+        try:
+            for db in readers:
+                assert db.sql("SELECT id FROM elements")[0]["id"] == "e1"
+                assert db.sql("PRAGMA mmap_size")[0][0] > 0
+                with pytest.raises(sqlite3.OperationalError):
+                    db.sql("DELETE FROM elements")
+        finally:
+            for db in readers:
+                db.close()
+
+        db = DucSQL.open_readonly(gz_path, mmap_size=0)
+        temp = db._temp
+        assert db.sql("SELECT COUNT(*) FROM elements")[0][0] == 1
+        db.close()
+        assert not os.path.exists(temp)
+
     def test_context_manager_commits(self, tmp_path):
         path = tmp_path / "cm.duc"
         with DucSQL.new(path) as db:
@@ -110,6 +136,30 @@ class TestLifecycle:
         with DucSQL(path) as db:
             assert len(db.sql("SELECT * FROM elements")) == 1
 
+    def test_in_memory_mode_touches_no_temp_files(self, tmp_path, monkeypatch):
+        path = tmp_path / "mem.duc"
+        with DucSQL.new() as db:
+            db.sql("INSERT INTO elements (id, element_type, x) VALUES (?,?,?)", "r1", "rectangle", 5)
+            db.save(path, compression_level=6)
+        raw = path.read_bytes()
+
+        def no_temp_files(*args, **kwargs):
+            raise AssertionError("in-memory DucSQL created a temp file")
+
+        monkeypatch.setattr("tempfile.NamedTemporaryFile", no_temp_files)
+        monkeypatch.setattr("tempfile.mkstemp", no_temp_files)
+        with DucSQL(path, in_memory=True) as db:
+            assert db._path is None and db._temp is None
+            db.sql("UPDATE elements SET x = ? WHERE id = ?", 7, "r1")
+            db.save(tmp_path / "copy.duc", compression_level=9)
+            out = db.to_bytes(compressed=True)
+        with DucSQL.from_bytes(out, in_memory=True) as db:
+            assert db.sql("SELECT x FROM elements")[0]["x"] == 7.0
+            with pytest.raises(ValueError, match="No path"):
+                db.save()
+        with DucSQL(tmp_path / "copy.duc", in_memory=True) as db:
+            assert db.sql("SELECT x FROM elements")[0]["x"] == 7.0
+
     def test_close_cleans_temp(self):
         with DucSQL.new() as db:
             raw = db.to_bytes()
@@ -184,6 +234,59 @@ class TestRawSQL:
             assert t in tables
 
 
+class TestMaintenance:
+    def _add_revision(self, db, revision_id, data):
+        db.sql(
+            "INSERT INTO external_file_revisions (id, file_id, size_bytes, mime_type, created) "
+            "VALUES (?,?,?,?,?)",
+            revision_id, "logo", len(data), "image/png", 0,
+        )
+        db.sql(
+            "INSERT INTO external_file_revision_chunks (revision_id, chunk_index, offset_bytes, size_bytes, data) "
+            "VALUES (?,?,?,?,?)",
+            revision_id, 0, 0, len(data), data,
+        )
+
+    def test_dedupe_external_files(self, db):
+        db.sql("INSERT INTO external_files (id, active_revision_id, updated) VALUES (?,?,?)", "logo", "r1", 0)
+        for revision_id, data in (("r1", b"LOGO"), ("r2", b"LOGO"), ("r3", b"LOGO"), ("r4", b"LOG0")):
+            self._add_revision(db, revision_id, data)
+
+        stats = db.dedupe_external_files()
+        assert stats == duc.ExternalFileDedupeStats(revisions=2, bytes_saved=8)
+        owners = [row[0] for row in db.sql("SELECT DISTINCT revision_id FROM external_file_revision_chunks ORDER BY 1")]
+        assert owners == ["r1", "r4"]
+        assert db.dedupe_external_files().revisions == 0
+
+        # Deleting the revision that holds the bytes hands them to a sharer.
+        db.sql("DELETE FROM external_file_revisions WHERE id = ?", "r1")
+        links = dict(db.sql("SELECT id, content_revision_id FROM external_file_revisions ORDER BY id"))
+        assert links == {"r2": None, "r3": "r2", "r4": None}
+        assert db.sql("SELECT data FROM external_file_revision_chunks WHERE revision_id = ?", "r2")[0][0] == b"LOGO"
+
+    def test_dedupe_after_upgrading_from_4000000(self, tmp_path):
+        path = tmp_path / "v4000000.duc"
+        with DucSQL.new(path) as db:
+            db.sql("INSERT INTO external_files (id, active_revision_id, updated) VALUES (?,?,?)", "logo", "r1", 0)
+            for revision_id in ("r1", "r2"):
+                self._add_revision(db, revision_id, b"LOGO")
+            # Turn the file back into schema 4000000.
+            db.conn.executescript(
+                "DROP TRIGGER external_file_revisions_rehome_content;"
+                "DROP INDEX idx_external_file_revisions_content;"
+                "ALTER TABLE external_file_revisions DROP COLUMN content_revision_id;"
+                "PRAGMA user_version = 4000000;"
+            )
+
+        with DucSQL(path) as db:
+            assert db.sql("PRAGMA user_version")[0][0] == 4000001
+            assert db.dedupe_external_files().revisions == 1
+            # Deleting a revision that only links to the bytes leaves them alone.
+            db.sql("DELETE FROM external_file_revisions WHERE id = ?", "r2")
+            owners = [row[0] for row in db.sql("SELECT DISTINCT revision_id FROM external_file_revision_chunks")]
+            assert owners == ["r1"]
+
+
 class TestExport:
     def test_to_bytes(self, db):
         db.sql("INSERT INTO elements (id, element_type) VALUES (?,?)", "e1", "rectangle")
@@ -201,6 +304,51 @@ class TestExport:
         with pytest.raises(ValueError):
             db.save()
 
+    def test_export_compression_and_page_size(self, db, tmp_path):
+        db.sql("INSERT INTO elements (id, element_type) VALUES (?,?)", "e1", "rectangle")
+        raw = db.to_bytes(page_size=16384)
+        assert raw[:6] == b"SQLite"
+        assert int.from_bytes(raw[16:18], "big") == 16384
+        assert db.to_bytes(compression_level=9)[:2] == b"\x1f\x8b"
+        assert db.to_bytes(compressed=True, compression_level=0)[:6] == b"SQLite"
+
+        path = tmp_path / "archive.duc"
+        db.save(path, compression_level=9, page_size=8192)
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+        with DucSQL(path) as db2:
+            assert db2.sql("PRAGMA page_size")[0][0] == 8192
+            assert len(db2.sql("SELECT * FROM elements")) == 1
+
+        with pytest.raises(ValueError):
+            db.to_bytes(compression_level=10)
+        with pytest.raises(ValueError):
+            db.save(path, page_size=1000)
+
+    def test_write_back_to_compressed_file(self, tmp_path):
+        path = tmp_path / "write_back.duc"
+        with DucSQL.new() as db:
+            db.save(path, compression_level=6)
+        original = path.read_bytes()
+        inode = path.stat().st_ino
+
+        with DucSQL(path, write_back=True) as db:
+            db.sql("SELECT COUNT(*) FROM elements")
+        assert path.read_bytes() == original and path.stat().st_ino == inode
+
+        with DucSQL(path, write_back=True, compression_level=1, compression_threads=2) as db:
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "e1", "text")
+            db.save()
+            with pytest.raises(ValueError, match="Write-back"):
+                db.save(compression_level=9)
+            db.sql("INSERT INTO elements (id, element_type) VALUES (?, ?)", "e2", "text")
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+        assert [p.name for p in tmp_path.iterdir()] == ["write_back.duc"]
+        with DucSQL(path, in_memory=True, write_back=True) as db:
+            assert [r["id"] for r in db.sql("SELECT id FROM elements ORDER BY id")] == ["e1", "e2"]
+            db.sql("DELETE FROM elements WHERE id = ?", "e1")
+        with DucSQL(path) as db:
+            assert [r["id"] for r in db.sql("SELECT id FROM elements")] == ["e2"]
+
     def test_full_roundtrip(self):
         with DucSQL.new() as db:
             db.sql("INSERT INTO duc_global_state (id, view_background_color, main_scope) VALUES (?,?,?)",
@@ -0,0 +1,96 @@
+"""Tests for DucSQLPool — thread-safe DucSQL connections."""
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+
+@pytest.fixture
+def duc_path(tmp_path):
+    path = tmp_path / "pool.duc"
+    with DucSQL.new(path) as db:
+        db.sql("INSERT INTO elements (id, element_type, x) VALUES (?,?,?)", "e0", "text", 0)
+    return path
+
+
+def test_concurrent_readers_and_serialized_writer(duc_path):
+    with duc.DucSQLPool(duc_path, max_readers=4) as pool:
+        def work(i):
+            with pool.writer() as db:
+                db.sql("INSERT INTO elements (id, element_type, x) VALUES (?,?,?)", f"e{i + 1}", "text", i)
+            with pool.reader() as db:
+                return db.sql("SELECT COUNT(*) FROM elements")[0][0], threading.get_ident()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(work, range(30)))
+
+        assert all(count >= 2 for count, _ in results)
+        with pool.reader() as db:
+            assert db.sql("SELECT COUNT(*) FROM elements")[0][0] == 31
+            with pytest.raises(sqlite3.OperationalError):
+                db.sql("DELETE FROM elements")
+
+        stats = pool.stats
+        assert stats.writer_checkouts == 30 and stats.reader_checkouts == 31
+        # Readers come from a free list shared by all threads.
+        assert 1 <= stats.readers_open <= 4
+        assert stats.reader_wait_seconds >= 0 and stats.writer_wait_seconds >= 0
+
+
+def test_readers_outlive_recycled_threads(duc_path):
+    with duc.DucSQLPool(duc_path, writer=0, max_readers=2) as pool:
+        def read():
+            with pool.reader() as db:
+                return db.sql("SELECT COUNT(*) FROM elements")[0][0]
+
+        for _ in range(10):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+
+        assert pool.stats.readers_open == 1
+        assert pool.stats.reader_checkouts == 10
+
+
+def test_writer_rollback_retry_and_health_checks(duc_path):
+    with duc.DucSQLPool(duc_path, busy_timeout=0.01, retry_backoff=0.01, health_check_interval=0) as pool:
+        with pytest.raises(RuntimeError):
+            with pool.writer() as db:
+                db.sql("DELETE FROM elements")
+                raise RuntimeError("abort")
+
+        # Another process holds the write lock for a moment.
+        other = sqlite3.connect(str(duc_path), isolation_level=None, check_same_thread=False)
+        other.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.05, other.execute, ("COMMIT",)).start()
+        with pool.writer() as db:
+            db.sql("UPDATE elements SET x = ?", 5)
+        other.close()
+        assert pool.stats.write_retries > 0
+
+        with pool.reader() as db:
+            assert db.sql("SELECT x FROM elements")[0]["x"] == 5.0
+            db.close()  # broken by the caller
+        with pool.reader() as db:
+            assert db.sql("SELECT COUNT(*) FROM elements")[0][0] == 1
+        assert pool.stats.replaced == 1
+
+    with pytest.raises(RuntimeError, match="closed"):
+        with pool.reader():
+            pass
+
+
+def test_read_only_pool_and_validation(duc_path):
+    with pytest.raises(ValueError):
+        duc.DucSQLPool(duc_path, writer=2)
+    with duc.DucSQLPool(duc_path, writer=0, max_readers=1) as pool:
+        with pytest.raises(RuntimeError, match="writer=0"):
+            with pool.writer():
+                pass
+        with pool.reader():
+            with pytest.raises(TimeoutError):
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(lambda: pool.reader(timeout=0.01).__enter__()).result()
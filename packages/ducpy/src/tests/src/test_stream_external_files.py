@@ -0,0 +1,146 @@
+"""Tests for streaming external file blobs from paths and readers into ``.duc`` files."""
+import io
+
+import ducpy as duc
+import pytest
+from ducpy.builders.sql_builder import DucSQL
+
+_PAYLOAD = bytes(range(256)) * 64
+
+
+def _stored(path, revision_id):
+    with DucSQL(path) as db:
+        size = db.conn.execute(
+            "SELECT size_bytes FROM external_file_revisions WHERE id = ?", (revision_id,)
+        ).fetchone()[0]
+        # Deduplicated revisions read the chunks of their content revision.
+        chunks = db.conn.execute(
+            "SELECT data FROM external_file_revision_chunks WHERE revision_id = "
+            "(SELECT coalesce(content_revision_id, id) FROM external_file_revisions WHERE id = ?) "
+            "ORDER BY chunk_index",
+            (revision_id,),
+        ).fetchall()
+    return size, b"".join(row[0] for row in chunks)
+
+
+def test_external_file_from_path(tmp_path):
+    source = tmp_path / "scan.bin"
+    source.write_bytes(_PAYLOAD)
+    external_file = (duc.StateBuilder()
+        .build_external_file()
+        .with_key("scan")
+        .with_mime_type("application/octet-stream")
+        .with_data_path(source)
+        .build())
+
+    revision = external_file.revisions[external_file.active_revision_id]
+    assert revision.size_bytes == len(_PAYLOAD)
+    assert revision.source_name == "scan.bin"
+
+    out = duc.serialize_duc(name="Paths", output_path=tmp_path / "paths.duc",
+                            external_files=[external_file])
+    assert _stored(out, revision.id) == (len(_PAYLOAD), _PAYLOAD)
+
+
+class _TrickleStream(io.RawIOBase):
+    """Binary stream whose ``read`` returns at most 1000 bytes, like a pipe."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._data.read(1000 if size < 0 else min(size, 1000))
+
+
+def test_path_source_size_is_rewritten_to_real_size(tmp_path):
+    source = tmp_path / "growing.bin"
+    source.write_bytes(b"draft")
+    external_file = (duc.StateBuilder()
+        .build_external_file()
+        .with_key("growing")
+        .with_mime_type("application/octet-stream")
+        .with_data_path(source)
+        .build())
+    # The file changes after the builder recorded its size.
+    source.write_bytes(_PAYLOAD)
+
+    out = duc.serialize_duc(name="Growing", output_path=tmp_path / "growing.duc",
+                            external_files=[external_file])
+    assert _stored(out, external_file.active_revision_id) == (len(_PAYLOAD), _PAYLOAD)
+
+
+def test_short_reads_still_fill_chunks(tmp_path):
+    external_file = (duc.StateBuilder()
+        .build_external_file()
+        .with_key("trickle")
+        .with_mime_type("application/octet-stream")
+        .with_data_stream(_TrickleStream(_PAYLOAD))
+        .build())
+
+    out = duc.serialize_duc(name="Trickle", output_path=tmp_path / "trickle.duc",
+                            external_files=[external_file])
+    assert _stored(out, external_file.active_revision_id) == (len(_PAYLOAD), _PAYLOAD)
+    with DucSQL(out) as db:
+        chunks = db.conn.execute("SELECT count(*) FROM external_file_revision_chunks").fetchone()[0]
+    assert chunks == 1
+
+
+def test_external_file_from_stream_and_explicit_sources(tmp_path):
+    stream = io.BytesIO(b"header" + _PAYLOAD)
+    stream.seek(len(b"header"))
+    external_file = (duc.StateBuilder()
+        .build_external_file()
+        .with_key("stream")
+        .with_mime_type("application/octet-stream")
+        .with_data_stream(stream)
+        .build())
+
+    out = duc.serialize_duc(name="Streams", output_path=tmp_path / "streams.duc",
+                            external_files=[external_file])
+    assert _stored(out, external_file.active_revision_id) == (len(_PAYLOAD), _PAYLOAD)
+
+    # Sources can also be given by revision id for files built with metadata only.
+    placeholder = (duc.StateBuilder()
+        .build_external_file()
+        .with_key("late")
+        .with_mime_type("application/octet-stream")
+        .build())
+    (tmp_path / "late.bin").write_bytes(b"late data")
+    content = duc.serialize_duc_to_bytes(
+        name="Explicit",
+        external_files=[placeholder],
+        external_file_sources={placeholder.active_revision_id: tmp_path / "late.bin"},
+    )
+    (tmp_path / "explicit.duc").write_bytes(content)
+    assert _stored(tmp_path / "explicit.duc", placeholder.active_revision_id) == (9, b"late data")
+
+    with pytest.raises(TypeError, match="path or a binary file object"):
+        duc.serialize_duc_to_bytes(name="Bad", external_files=[placeholder],
+                                   external_file_sources={placeholder.active_revision_id: 42})
+
+
+def test_identical_external_files_are_stored_once(tmp_path):
+    files = [
+        duc.StateBuilder()
+        .build_external_file()
+        .with_key(key)
+        .with_mime_type("application/octet-stream")
+        .with_data(_PAYLOAD)
+        .build()
+        for key in ("logo", "logo-copy")
+    ]
+    out = duc.serialize_duc(name="Dedupe", output_path=tmp_path / "dedupe.duc", external_files=files)
+
+    for external_file in files:
+        assert _stored(out, external_file.active_revision_id) == (len(_PAYLOAD), _PAYLOAD)
+    with DucSQL(out) as db:
+        owners = db.conn.execute(
+            "SELECT count(DISTINCT revision_id) FROM external_file_revision_chunks"
+        ).fetchone()[0]
+    assert owners == 1
+
+    parsed = duc.parse_duc(out)
+    assert [len(blob) for blob in parsed.files_data.values()] == [len(_PAYLOAD)] * 2
@@ -0,0 +1,74 @@
+"""Tests for the persistent embedded-code validation cache."""
+import ducpy as duc
+import pytest
+
+
+def _model(element_id, code):
+    return duc.ElementBuilder().with_id(element_id).build_model_element().with_code(code).build()
+
+
+def _counting_code(marker, extra=""):
+    return f"open({str(marker)!r}, 'a').write('x')\n{extra}"
+
+
+def test_passed_validation_is_skipped_on_repeat(tmp_path):
+    marker = tmp_path / "runs.txt"
+    cache = duc.ValidationCache(tmp_path / "cache")
+    elements = [_model("m1", _counting_code(marker))]
+
+    duc.serialize_duc_to_bytes("first", elements=elements, validation_cache=cache)
+    duc.serialize_duc_to_bytes("second", elements=elements, validation_cache=cache)
+    assert marker.read_text() == "x"
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == pytest.approx(0.5)
+
+    # Persisted: a fresh instance over the same directory hits too.
+    reopened = duc.ValidationCache(tmp_path / "cache")
+    duc.serialize_duc_to_bytes("third", elements=elements, validation_cache=str(tmp_path / "cache"))
+    assert marker.read_text() == "x"
+    assert len(reopened) == 1
+
+    changed = [_model("m1", _counting_code(marker, "value = 2"))]
+    duc.serialize_duc_to_bytes("fourth", elements=changed, validation_cache=cache)
+    assert marker.read_text() == "xx"
+
+
+def test_failures_are_not_cached(tmp_path):
+    marker = tmp_path / "runs.txt"
+    cache = duc.ValidationCache(tmp_path / "cache")
+    elements = [_model("bad", _counting_code(marker, "raise RuntimeError('boom')"))]
+
+    for _ in range(2):
+        with pytest.raises(duc.DucSerializationValidationError):
+            duc.serialize_duc_to_bytes("bad", elements=elements, validation_cache=cache)
+    assert marker.read_text() == "xx"
+    assert len(cache) == 0
+
+
+def test_key_covers_files_and_engine():
+    key = duc.validation_key("python", "x = 1")
+    assert key == duc.validation_key("python", "x = 1")
+    assert key != duc.validation_key("python", "x = 1", files_digest="abc")
+    assert key != duc.validation_key("typst", "x = 1")
+    with pytest.raises(ValueError):
+        duc.validation_key("lua", "x = 1")
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    probe = duc.ValidationCache(tmp_path / "probe")
+    probe.put(duc.validation_key("python", "a"), "python")
+    entry_bytes = probe.stats.current_bytes
+
+    cache = duc.ValidationCache(tmp_path / "cache", max_bytes=int(entry_bytes * 2.5))
+    keys = [duc.validation_key("python", code) for code in ("a", "b", "c")]
+    cache.put(keys[0], "python")
+    cache.put(keys[1], "python")
+    assert cache.get(keys[0])
+    cache.put(keys[2], "python")
+
+    assert keys[0] in cache and keys[2] in cache
+    assert keys[1] not in cache
+    assert cache.stats.evictions == 1
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,63 @@
+"""Tests for the warm model-code validation worker pool."""
+
+import ducpy as duc
+import pytest
+
+
+@pytest.fixture
+def pool():
+    with duc.ValidationWorkerPool(size=2, preload=("decimal",), max_runs=3) as workers:
+        yield workers
+
+
+def test_runs_code_with_preloaded_modules(pool, tmp_path):
+    assert pool.run("import sys\nassert 'decimal' in sys.modules", tmp_path) == ("ok", None)
+
+    status, detail = pool.run("print('noise')\nraise RuntimeError('pool boom')", tmp_path)
+    assert status == "failed"
+    assert "pool boom" in detail and "noise" not in detail
+
+    (tmp_path / "data.txt").write_text("42")
+    code = "assert open(resolve_external_file('f1')).read() == '42'"
+    assert pool.run(code, tmp_path, {"f1": str(tmp_path / "data.txt")}) == ("ok", None)
+    # Each job gets a fresh namespace.
+    assert pool.run("assert 'code' not in globals()\ncode = 1", tmp_path)[0] == "ok"
+    assert pool.run("assert 'code' not in globals()", tmp_path)[0] == "ok"
+
+
+def test_timeout_kills_and_replaces_worker(pool, tmp_path):
+    assert pool.run("import time\ntime.sleep(30)", tmp_path, timeout_seconds=0.5) == ("timeout", None)
+    status, _ = pool.run("import os\nos._exit(3)", tmp_path)
+    assert status == "crashed"
+    assert pool.run("x = 1", tmp_path) == ("ok", None)
+
+    stats = pool.stats
+    assert (stats.timeouts, stats.crashes) == (1, 1)
+    assert stats.started >= 4
+
+
+def test_workers_are_recycled_after_max_runs(tmp_path):
+    with duc.ValidationWorkerPool(size=1, max_runs=2) as pool:
+        marker = tmp_path / "pids.txt"
+        code = f"import os\nopen({str(marker)!r}, 'a').write(f'{{os.getpid()}}\\n')"
+        for _ in range(3):
+            assert pool.run(code, tmp_path)[0] == "ok"
+        pids = marker.read_text().split()
+        assert pids[0] == pids[1] != pids[2]
+        assert pool.stats.recycled == 1
+
+
+def test_serialize_duc_uses_pool(pool):
+    model = (
+        duc.ElementBuilder()
+        .with_id("warm")
+        .build_model_element()
+        .with_code("raise ValueError('from the pool')")
+        .build()
+    )
+    started = pool.stats.runs
+    with pytest.raises(duc.DucSerializationValidationError) as excinfo:
+        duc.serialize_duc_to_bytes("pooled", elements=[model], validation_pool=pool)
+    assert excinfo.value.failures[0].startswith("model warm: Python validation failed")
+    assert "from the pool" in excinfo.value.failures[0]
+    assert pool.stats.runs == started + 1
@@ -0,0 +1,56 @@
+"""Size/time tradeoffs of ``.duc`` write options (compression level, page size)."""
+import os
+import time
+
+import ducpy as duc
+import pytest
+
+
+def _elements(count):
+    return [
+        duc.ElementBuilder()
+        .at_position(float(i % 100) * 15.0, float(i // 100) * 15.0)
+        .with_size(10.0, 10.0)
+        .with_label(f"Element {i}")
+        .build_rectangle()
+        .build()
+        for i in range(count)
+    ]
+
+
+def _timed_write(path, elements, **options):
+    start = time.perf_counter()
+    duc.serialize_duc(
+        name="WriteOptionsBenchmark",
+        output_path=path,
+        elements=elements,
+        validate_embedded_code=False,
+        **options,
+    )
+    return (time.perf_counter() - start) * 1000, os.path.getsize(path)
+
+
+@pytest.mark.slow
+def test_write_options_benchmark(tmp_path):
+    elements = _elements(2000)
+    presets = {
+        "scratch (level 0)": {"compression_level": 0},
+        "fast (level 1)": {"compression_level": 1},
+        "default (level 6)": {},
+        "archive (level 9)": {"compression_level": 9},
+        "archive (level 9, 64 KiB pages)": {"compression_level": 9, "page_size": 65536},
+        "archive (level 9, 1 KiB pages)": {"compression_level": 9, "page_size": 1024},
+    }
+
+    results = {}
+    for label, options in presets.items():
+        path = tmp_path / f"{len(results)}.duc"
+        results[label] = _timed_write(path, elements, **options)
+        assert len(duc.parse_duc(path).elements) == len(elements)
+
+    for label, (elapsed_ms, size) in results.items():
+        print(f"write options benchmark: {label}: {elapsed_ms:.1f} ms, {size / 1024:.1f} KiB")
+
+    raw_size = results["scratch (level 0)"][1]
+    assert results["fast (level 1)"][1] < raw_size
+    assert results["archive (level 9)"][1] <= results["fast (level 1)"][1]
@@ -227,6 +227,17 @@ impl DucDocument {
         })
     }
 
+    /// Make external file revisions with identical bytes share one set of
+    /// chunks. Returns `(revisions_deduplicated, bytes_saved)`.
+    pub fn dedupe_external_files(&mut self) -> SerializeResult<(u64, u64)> {
+        self.conn.with_mut(|conn| {
+            let tx = conn.transaction()?;
+            let result = external_file_chunks::dedupe_revisions(&tx)?;
+            tx.commit()?;
+            Ok(result)
+        })
+    }
+
     /// Clear existing chunks for a checkpoint before streaming replacements.
     pub fn clear_checkpoint_data_chunks(&mut self, checkpoint_id: &str) -> SerializeResult<()> {
         self.conn.with_mut(|conn| {
@@ -399,7 +399,7 @@ fn migrates_legacy_payloads_losslessly_into_bounded_chunks() {
     assert_eq!(
         conn.pragma_query_value::<i64, _>(None, "user_version", |row| row.get(0))
             .expect("read user_version"),
-        4_000_000
+        current_schema_version_int()
     );
     let expected_layout = vec![(0, 0, 8_388_608), (1, 8_388_608, 17)];
     assert_eq!(
@@ -481,3 +481,96 @@ fn migrates_legacy_payloads_losslessly_into_bounded_chunks() {
         .expect("check foreign keys");
     assert_eq!(foreign_key_errors, 0);
 }
+
+#[test]
+fn migrates_4000000_to_shared_external_file_content() {
+    let conn = Connection::open_in_memory().expect("open database");
+    conn.execute_batch(LEGACY_SCHEMA)
+        .expect("apply legacy schema");
+    for (from, _, sql) in MIGRATIONS.iter().filter(|(from, _, _)| *from < 4_000_000) {
+        conn.execute_batch(sql)
+            .unwrap_or_else(|error| panic!("apply migration from {from}: {error}"));
+    }
+    assert_eq!(
+        conn.pragma_query_value::<i64, _>(None, "user_version", |row| row.get(0))
+            .expect("read user_version"),
+        4_000_000
+    );
+
+    conn.execute(
+        "INSERT INTO external_files (id, active_revision_id, updated)
+         VALUES ('file-1', 'revision-a', 1)",
+        [],
+    )
+    .expect("insert external file");
+    for revision_id in ["revision-a", "revision-b", "revision-c"] {
+        conn.execute(
+            "INSERT INTO external_file_revisions
+             (id, file_id, size_bytes, mime_type, created)
+             VALUES (?1, 'file-1', 4, 'image/png', 1)",
+            [revision_id],
+        )
+        .expect("insert external revision");
+    }
+    conn.execute(
+        "INSERT INTO external_file_revision_chunks
+         (revision_id, chunk_index, offset_bytes, size_bytes, data)
+         VALUES ('revision-a', 0, 0, 4, ?1)",
+        [&[1u8, 2, 3, 4][..]],
+    )
+    .expect("insert chunk");
+
+    bootstrap(&conn).expect("migrate 4000000 database");
+
+    assert_eq!(
+        conn.pragma_query_value::<i64, _>(None, "user_version", |row| row.get(0))
+            .expect("read user_version"),
+        4_000_001
+    );
+    let has_column: i64 = conn
+        .query_row(
+            "SELECT count(*) FROM pragma_table_info('external_file_revisions')
+             WHERE name = 'content_revision_id'",
+            [],
+            |row| row.get(0),
+        )
+        .expect("inspect external_file_revisions");
+    assert_eq!(has_column, 1);
+
+    // b and c share a's chunks; deleting a hands them to b.
+    conn.execute(
+        "UPDATE external_file_revisions SET content_revision_id = 'revision-a'
+         WHERE id IN ('revision-b', 'revision-c')",
+        [],
+    )
+    .expect("link revisions");
+    conn.execute(
+        "DELETE FROM external_file_revisions WHERE id = 'revision-a'",
+        [],
+    )
+    .expect("delete content owner");
+
+    assert_eq!(
+        read_chunks(
+            &conn,
+            "external_file_revision_chunks",
+            "revision_id",
+            "revision-b"
+        ),
+        vec![1, 2, 3, 4]
+    );
+    let links: Vec<(String, Option<String>)> = conn
+        .prepare("SELECT id, content_revision_id FROM external_file_revisions ORDER BY id")
+        .expect("prepare link query")
+        .query_map([], |row| Ok((row.get(0)?, row.get(1)?)))
+        .expect("query links")
+        .collect::<rusqlite::Result<Vec<_>>>()
+        .expect("read links");
+    assert_eq!(
+        links,
+        vec![
+            ("revision-b".to_string(), None),
+            ("revision-c".to_string(), Some("revision-b".to_string())),
+        ]
+    );
+}
@@ -1,4 +1,4 @@
-use rusqlite::{params, Connection, Transaction};
+use rusqlite::{params, Connection, OptionalExtension, Transaction};
 use std::io::{Read, Write};
 
 pub const DEFAULT_EXTERNAL_FILE_CHUNK_SIZE: usize = 8 * 1024 * 1024;
@@ -89,6 +89,168 @@ pub fn column_exists(
         .map(|count| count > 0)
 }
 
+fn has_content_revisions(conn: &Connection) -> rusqlite::Result<bool> {
+    column_exists(conn, "external_file_revisions", "content_revision_id")
+}
+
+/// Revision whose chunks hold the bytes of `revision_id`: the revision it was
+/// deduplicated against, or itself.
+pub fn content_revision_id(
+    conn: &Connection,
+    revision_id: &str,
+) -> ExternalFileChunkResult<String> {
+    if !has_content_revisions(conn)? {
+        return Ok(revision_id.to_string());
+    }
+    let target: Option<String> = conn
+        .prepare_cached("SELECT content_revision_id FROM external_file_revisions WHERE id = ?1")?
+        .query_row(params![revision_id], |row| row.get::<_, Option<String>>(0))
+        .optional()?
+        .flatten();
+    Ok(target.unwrap_or_else(|| revision_id.to_string()))
+}
+
+/// Mark `revision_id` as sharing the chunks of `content_revision_id`.
+pub fn link_revision_content(
+    conn: &Connection,
+    revision_id: &str,
+    content_revision_id: &str,
+) -> ExternalFileChunkResult<()> {
+    let linked = conn.execute(
+        "UPDATE external_file_revisions SET content_revision_id = ?1
+         WHERE id = ?2 OR content_revision_id = ?2",
+        params![content_revision_id, revision_id],
+    )?;
+    if linked == 0 {
+        // Without its row the revision could never find the shared chunks.
+        return Err(ExternalFileChunkError::InvalidData(format!(
+            "no external file revision {revision_id} to link to {content_revision_id}"
+        )));
+    }
+    delete_chunks_on_connection(conn, EXTERNAL_FILE_REVISION_CHUNKS, revision_id)?;
+    Ok(())
+}
+
+/// Give `revision_id` back its own (empty) chunk list before it is rewritten.
+/// Revisions that shared its chunks keep them: they move to the first of them.
+fn release_revision_content(conn: &Connection, revision_id: &str) -> ExternalFileChunkResult<()> {
+    if !has_content_revisions(conn)? {
+        return Ok(());
+    }
+    let heir: Option<String> = conn
+        .prepare_cached(
+            "SELECT id FROM external_file_revisions
+             WHERE content_revision_id = ?1 ORDER BY id LIMIT 1",
+        )?
+        .query_row(params![revision_id], |row| row.get(0))
+        .optional()?;
+    if let Some(heir) = heir {
+        conn.execute(
+            "UPDATE external_file_revision_chunks SET revision_id = ?1 WHERE revision_id = ?2",
+            params![heir, revision_id],
+        )?;
+        conn.execute(
+            "UPDATE external_file_revisions
+             SET content_revision_id = CASE WHEN id = ?1 THEN NULL ELSE ?1 END
+             WHERE content_revision_id = ?2",
+            params![heir, revision_id],
+        )?;
+    }
+    conn.execute(
+        "UPDATE external_file_revisions SET content_revision_id = NULL WHERE id = ?1",
+        params![revision_id],
+    )?;
+    Ok(())
+}
+
+/// If another revision already stores byte-identical chunks, make
+/// `revision_id` share them and drop its own copy. Returns the revision it
+/// now shares content with.
+pub fn dedupe_revision(
+    conn: &Connection,
+    revision_id: &str,
+) -> ExternalFileChunkResult<Option<String>> {
+    if !has_content_revisions(conn)? {
+        return Ok(None);
+    }
+    let target: Option<String> = conn
+        .prepare_cached(
+            "SELECT other.id
+             FROM external_file_revisions AS rev
+             JOIN external_file_revisions AS other
+               ON other.size_bytes = rev.size_bytes
+              AND other.id <> rev.id
+              AND other.content_revision_id IS NULL
+             WHERE rev.id = ?1
+               AND rev.content_revision_id IS NULL
+               AND EXISTS (SELECT 1 FROM external_file_revision_chunks WHERE revision_id = rev.id)
+               AND (SELECT count(*) FROM external_file_revision_chunks WHERE revision_id = other.id)
+                 = (SELECT count(*) FROM external_file_revision_chunks WHERE revision_id = rev.id)
+               AND NOT EXISTS (
+                   SELECT 1
+                   FROM external_file_revision_chunks AS mine
+                   LEFT JOIN external_file_revision_chunks AS theirs
+                     ON theirs.revision_id = other.id
+                    AND theirs.chunk_index = mine.chunk_index
+                   WHERE mine.revision_id = rev.id
+                     AND (theirs.data IS NULL OR theirs.data <> mine.data)
+               )
+             ORDER BY other.id
+             LIMIT 1",
+        )?
+        .query_row(params![revision_id], |row| row.get(0))
+        .optional()?;
+    if let Some(target) = &target {
+        link_revision_content(conn, revision_id, target)?;
+    }
+    Ok(target)
+}
+
+/// Deduplicate every external file revision in the database. Returns the
+/// number of revisions that now share another revision's chunks and the
+/// bytes of chunk data this removed.
+pub fn dedupe_revisions(conn: &Connection) -> ExternalFileChunkResult<(u64, u64)> {
+    if !has_content_revisions(conn)? {
+        return Ok((0, 0));
+    }
+    let revisions = conn
+        .prepare(
+            "SELECT id, size_bytes FROM external_file_revisions
+             WHERE content_revision_id IS NULL
+             ORDER BY id DESC",
+        )?
+        .query_map([], |row| {
+            Ok((row.get::<_, String>(0)?, row.get::<_, i64>(1)?))
+        })?
+        .collect::<Result<Vec<_>, _>>()?;
+
+    let mut deduped = 0u64;
+    let mut saved = 0u64;
+    for (revision_id, size_bytes) in revisions {
+        if dedupe_revision(conn, &revision_id)?.is_some() {
+            deduped += 1;
+            saved += size_bytes.max(0) as u64;
+        }
+    }
+    Ok((deduped, saved))
+}
+
+/// Fill `buffer` from `reader`, stopping early only at end of input, so
+/// readers that return short reads (pipes, sockets, Python streams) still
+/// produce full-size chunks.
+fn read_chunk<R: Read>(reader: &mut R, buffer: &mut [u8]) -> std::io::Result<usize> {
+    let mut filled = 0;
+    while filled < buffer.len() {
+        match reader.read(&mut buffer[filled..]) {
+            Ok(0) => break,
+            Ok(n) => filled += n,
+            Err(e) if e.kind() == std::io::ErrorKind::Interrupted => {}
+            Err(e) => return Err(e),
+        }
+    }
+    Ok(filled)
+}
+
 pub fn write_blob_chunks(
     tx: &Transaction,
     revision_id: &str,
@@ -218,6 +380,7 @@ pub fn write_reader_chunks<R: Read>(
     expected_size: Option<i64>,
 ) -> ExternalFileChunkResult<u64> {
     validate_chunk_size(chunk_size)?;
+    release_revision_content(tx, revision_id)?;
     delete_chunks(tx, EXTERNAL_FILE_REVISION_CHUNKS, revision_id)?;
 
     let mut stmt = tx.prepare_cached(
@@ -231,7 +394,7 @@ pub fn write_reader_chunks<R: Read>(
     let mut offset = 0usize;
 
     loop {
-        let bytes_read = reader.read(&mut buffer)?;
+        let bytes_read = read_chunk(reader, &mut buffer)?;
         if bytes_read == 0 {
             break;
         }
@@ -322,7 +485,7 @@ fn write_reader_chunks_for_table<R: Read>(
     let mut offset = 0usize;
 
     loop {
-        let bytes_read = reader.read(&mut buffer)?;
+        let bytes_read = read_chunk(reader, &mut buffer)?;
         if bytes_read == 0 {
             break;
         }
@@ -387,6 +550,7 @@ pub fn delete_revision_chunks_on_connection(
     conn: &Connection,
     revision_id: &str,
 ) -> ExternalFileChunkResult<()> {
+    release_revision_content(conn, revision_id)?;
     delete_chunks_on_connection(conn, EXTERNAL_FILE_REVISION_CHUNKS, revision_id)
 }
 
@@ -525,13 +689,14 @@ pub fn read_revision_chunk(
     revision_id: &str,
     chunk_index: i64,
 ) -> ExternalFileChunkResult<Option<Vec<u8>>> {
+    let owner_id = content_revision_id(conn, revision_id)?;
     let result = conn
         .prepare_cached(
             "SELECT data
          FROM external_file_revision_chunks
          WHERE revision_id = ?1 AND chunk_index = ?2",
         )?
-        .query_row(params![revision_id, chunk_index], |row| {
+        .query_row(params![owner_id, chunk_index], |row| {
             row.get::<_, Vec<u8>>(0)
         });
 
@@ -559,6 +724,7 @@ pub fn read_revision_chunk_batch(
         )));
     }
 
+    let owner_id = content_revision_id(conn, revision_id)?;
     let mut stmt = conn.prepare_cached(
         "SELECT data
          FROM external_file_revision_chunks
@@ -567,7 +733,7 @@ pub fn read_revision_chunk_batch(
          LIMIT ?3",
     )?;
     let chunks = stmt
-        .query_map(params![revision_id, start_chunk_index, max_chunks], |row| {
+        .query_map(params![owner_id, start_chunk_index, max_chunks], |row| {
             row.get::<_, Vec<u8>>(0)
         })?
         .collect::<Result<Vec<_>, _>>()?;
@@ -611,7 +777,8 @@ pub fn read_revision_range(
            AND offset_bytes + size_bytes > ?2
          ORDER BY offset_bytes",
     )?;
-    let mut rows = stmt.query(params![revision_id, offset_bytes, end_bytes])?;
+    let owner_id = content_revision_id(conn, revision_id)?;
+    let mut rows = stmt.query(params![owner_id, offset_bytes, end_bytes])?;
     let mut output = Vec::with_capacity(length_bytes as usize);
     let mut cursor = offset_bytes;
 
@@ -688,7 +855,8 @@ pub fn stream_revision_chunks_to_writer<W: Write>(
          WHERE revision_id = ?1
          ORDER BY chunk_index",
     )?;
-    let mut rows = stmt.query(params![revision_id])?;
+    let owner_id = content_revision_id(conn, revision_id)?;
+    let mut rows = stmt.query(params![owner_id])?;
     let mut total = 0u64;
 
     while let Some(row) = rows.next()? {
@@ -52,31 +52,211 @@ impl From<ExternalFileChunkError> for ParseError {
 }
 
 pub type ParseResult<T> = Result<T, ParseError>;
+
+/// Top-level sections of an [`ExportedDataState`] that can be read selectively.
+///
+/// Sections that are not selected are never queried; they come back as `None`
+/// or as an empty list. The document header (`id`, `version`, `source`, `type`)
+/// is always read.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct DocumentSections {
+    pub thumbnail: bool,
+    pub dictionary: bool,
+    pub charter: bool,
+    pub issues: bool,
+    pub global_state: bool,
+    pub local_state: bool,
+    pub layers: bool,
+    pub groups: bool,
+    pub regions: bool,
+    pub blocks: bool,
+    pub elements: bool,
+    pub version_graph: bool,
+    pub files: bool,
+}
+
+impl Default for DocumentSections {
+    fn default() -> Self {
+        Self::all()
+    }
+}
+
+impl DocumentSections {
+    /// Canonical section names, matching the snake_case keys of the parsed state.
+    pub const NAMES: &'static [&'static str] = &[
+        "thumbnail",
+        "dictionary",
+        "charter",
+        "issues",
+        "global_state",
+        "local_state",
+        "layers",
+        "groups",
+        "regions",
+        "blocks",
+        "elements",
+        "version_graph",
+        "files",
+    ];
+
+    pub fn all() -> Self {
+        Self::with_all(true)
+    }
+
+    pub fn none() -> Self {
+        Self::with_all(false)
+    }
+
+    fn with_all(enabled: bool) -> Self {
+        Self {
+            thumbnail: enabled,
+            dictionary: enabled,
+            charter: enabled,
+            issues: enabled,
+            global_state: enabled,
+            local_state: enabled,
+            layers: enabled,
+            groups: enabled,
+            regions: enabled,
+            blocks: enabled,
+            elements: enabled,
+            version_graph: enabled,
+            files: enabled,
+        }
+    }
+
+    /// Enable or disable a section by name. Accepts the canonical names in
+    /// [`Self::NAMES`] plus the aliases used by the Python/TypeScript APIs.
+    pub fn set(&mut self, name: &str, enabled: bool) -> ParseResult<()> {
+        let slot = match name {
+            "thumbnail" => &mut self.thumbnail,
+            "dictionary" => &mut self.dictionary,
+            "charter" => &mut self.charter,
+            "issues" => &mut self.issues,
+            "global_state" | "duc_global_state" | "globalState" => &mut self.global_state,
+            "local_state" | "duc_local_state" | "localState" => &mut self.local_state,
+            "layers" => &mut self.layers,
+            "groups" => &mut self.groups,
+            "regions" => &mut self.regions,
+            "blocks" | "block_instances" | "block_collections" | "blockInstances"
+            | "blockCollections" => &mut self.blocks,
+            "elements" => &mut self.elements,
+            "version_graph" | "versionGraph" => &mut self.version_graph,
+            "files" | "external_files" | "externalFiles" => &mut self.files,
+            _ => {
+                return Err(ParseError::InvalidData(format!(
+                    "unknown document section '{name}' (expected one of: {})",
+                    Self::NAMES.join(", ")
+                )))
+            }
+        };
+        *slot = enabled;
+        Ok(())
+    }
+
+    /// Build a selection from optional include/exclude name lists.
+    ///
+    /// With no `include`, every section starts selected; `exclude` is applied last.
+    pub fn from_selection<S: AsRef<str>>(
+        include: Option<&[S]>,
+        exclude: Option<&[S]>,
+    ) -> ParseResult<Self> {
+        let mut sections = match include {
+            Some(names) => {
+                let mut sections = Self::none();
+                for name in names {
+                    sections.set(name.as_ref(), true)?;
+                }
+                sections
+            }
+            None => Self::all(),
+        };
+        for name in exclude.unwrap_or(&[]) {
+            sections.set(name.as_ref(), false)?;
+        }
+        Ok(sections)
+    }
+}
+
 pub(crate) fn read_document_state_from_connection(
     conn: &Connection,
 ) -> ParseResult<ExportedDataState> {
-    let mut state = read_state_from_connection(conn, false)?;
-    state.external_files = read_external_file_metadata(conn)?;
+    read_document_sections_from_connection(conn, &DocumentSections::all())
+}
+
+pub(crate) fn read_document_sections_from_connection(
+    conn: &Connection,
+    sections: &DocumentSections,
+) -> ParseResult<ExportedDataState> {
+    let mut state = read_state_from_connection(conn, false, sections)?;
+    if sections.files {
+        state.external_files = read_external_file_metadata(conn)?;
+    }
     Ok(state)
 }
 
 fn read_state_from_connection(
     conn: &Connection,
     include_external_files: bool,
+    sections: &DocumentSections,
 ) -> ParseResult<ExportedDataState> {
-    let (id, version, source, data_type, thumbnail) = read_document(&conn)?;
-    let charter = read_charter(&conn)?;
-    let issues = read_issues(&conn)?;
-    let duc_global_state = read_global_state(&conn)?;
-    let duc_local_state = read_local_state(&conn)?;
-    let dictionary = read_dictionary(&conn)?;
-    let layers = read_layers(&conn)?;
-    let groups = read_groups(&conn)?;
-    let regions = read_regions(&conn)?;
-    let (blocks, block_instances, block_collections) = read_blocks(&conn)?;
-    let elements = read_elements(&conn)?;
-    let version_graph = read_version_graph(&conn)?;
-    let (external_files, external_files_data) = if include_external_files {
+    let (id, version, source, data_type, thumbnail) = read_document(&conn, sections.thumbnail)?;
+    let charter = if sections.charter {
+        read_charter(&conn)?
+    } else {
+        None
+    };
+    let issues = if sections.issues {
+        read_issues(&conn)?
+    } else {
+        Vec::new()
+    };
+    let duc_global_state = if sections.global_state {
+        read_global_state(&conn)?
+    } else {
+        None
+    };
+    let duc_local_state = if sections.local_state {
+        read_local_state(&conn)?
+    } else {
+        None
+    };
+    let dictionary = if sections.dictionary {
+        read_dictionary(&conn)?
+    } else {
+        None
+    };
+    let layers = if sections.layers {
+        read_layers(&conn)?
+    } else {
+        Vec::new()
+    };
+    let groups = if sections.groups {
+        read_groups(&conn)?
+    } else {
+        Vec::new()
+    };
+    let regions = if sections.regions {
+        read_regions(&conn)?
+    } else {
+        Vec::new()
+    };
+    let (blocks, block_instances, block_collections) = if sections.blocks {
+        read_blocks(&conn)?
+    } else {
+        (Vec::new(), Vec::new(), Vec::new())
+    };
+    let elements = if sections.elements {
+        read_elements(&conn)?
+    } else {
+        Vec::new()
+    };
+    let version_graph = if sections.version_graph {
+        read_version_graph(&conn)?
+    } else {
+        None
+    };
+    let (external_files, external_files_data) = if include_external_files && sections.files {
         read_external_files(&conn)?
     } else {
         (None, None)
@@ -316,9 +496,14 @@ fn blob_to_f32_vec(blob: &[u8]) -> Vec<f32> {
 
 fn read_document(
     conn: &Connection,
+    include_thumbnail: bool,
 ) -> ParseResult<(Option<String>, String, String, String, Option<Vec<u8>>)> {
-    let mut stmt =
-        conn.prepare("SELECT id, version, source, data_type, thumbnail FROM duc_document LIMIT 1")?;
+    let sql = if include_thumbnail {
+        "SELECT id, version, source, data_type, thumbnail FROM duc_document LIMIT 1"
+    } else {
+        "SELECT id, version, source, data_type, NULL FROM duc_document LIMIT 1"
+    };
+    let mut stmt = conn.prepare(sql)?;
     let result = stmt.query_row([], |row| {
         let id: String = row.get(0)?;
         let version: String = row.get(1)?;
@@ -2273,6 +2458,28 @@ fn read_external_files_v4(conn: &Connection) -> ParseResult<ExternalFilesResult>
             .extend_from_slice(&blob);
     }
 
+    // Deduplicated revisions have no chunks of their own.
+    if external_file_chunks::column_exists(conn, "external_file_revisions", "content_revision_id")?
+    {
+        let mut shared_stmt = conn.prepare(
+            "SELECT id, content_revision_id
+             FROM external_file_revisions
+             WHERE content_revision_id IS NOT NULL",
+        )?;
+        let shared = shared_stmt
+            .query_map([], |row| {
+                Ok((row.get::<_, String>(0)?, row.get::<_, String>(1)?))
+            })?
+            .collect::<Result<Vec<_>, _>>()?;
+        for (rev_id, content_rev_id) in shared {
+            let data = data_buffers
+                .get(&content_rev_id)
+                .cloned()
+                .unwrap_or_default();
+            data_buffers.insert(rev_id, data);
+        }
+    }
+
     let mut file_stmt =
         conn.prepare("SELECT id, active_revision_id, updated, version FROM external_files")?;
     let mut map: HashMap<String, DucExternalFile> = HashMap::new();
@@ -2586,7 +2793,7 @@ pub fn parse_duc_bytes(buf: &[u8]) -> ParseResult<ExportedDataState> {
 /// or [`list_external_files_from_bytes`] for on-demand file access.
 pub fn parse_duc_bytes_lazy(buf: &[u8]) -> ParseResult<ExportedDataState> {
     let conn = open_duc_bytes_connection(buf)?;
-    let state = read_state_from_connection(&conn, false)?;
+    let state = read_state_from_connection(&conn, false, &DocumentSections::all())?;
     Ok(state)
 }
 
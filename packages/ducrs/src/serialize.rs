@@ -4,6 +4,9 @@
 //! the OPFS document APIs exposed by the WASM bindings.
 
 use rusqlite::{params, Connection, Transaction};
+use std::collections::hash_map::DefaultHasher;
+use std::collections::{HashMap, HashSet};
+use std::hash::{Hash, Hasher};
 
 use crate::db;
 use crate::external_file_chunks::{self, ExternalFileChunkError};
@@ -1625,6 +1628,7 @@ fn write_external_files(
             (id, file_id, size_bytes, checksum, source_name, mime_type, message, created, last_retrieved)
          VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)"
     )?;
+    let mut revision_ids: HashSet<&str> = HashSet::new();
     for (_key, file) in files {
         file_stmt.execute(params![
             file.id,
@@ -1644,11 +1648,40 @@ fn write_external_files(
                 rev.created,
                 rev.last_retrieved,
             ])?;
+            revision_ids.insert(rev.id.as_str());
         }
     }
     if let Some(data_map) = files_data {
-        for (rev_id, blob) in data_map {
-            external_file_chunks::write_blob_chunks(tx, rev_id, blob.as_ref(), chunk_size)?;
+        // Identical blobs (the same logo or PDF under several files or
+        // revisions) are stored once; the other revisions point at it.
+        let mut rev_ids: Vec<&String> = data_map.keys().collect();
+        rev_ids.sort();
+        let mut stored: HashMap<(usize, u64), Vec<&String>> = HashMap::new();
+        for rev_id in rev_ids {
+            let blob: &[u8] = data_map[rev_id].as_ref();
+            let mut hasher = DefaultHasher::new();
+            blob.hash(&mut hasher);
+            let same_hash = stored.entry((blob.len(), hasher.finish())).or_default();
+            // Data without a revision row keeps its own chunks: a link could
+            // never be resolved.
+            let existing = if blob.is_empty() || !revision_ids.contains(rev_id.as_str()) {
+                None
+            } else {
+                same_hash
+                    .iter()
+                    .find(|other| AsRef::<[u8]>::as_ref(&data_map[**other]) == blob)
+            };
+            match existing {
+                Some(content_rev_id) => {
+                    external_file_chunks::link_revision_content(tx, rev_id, content_rev_id)?;
+                }
+                None => {
+                    external_file_chunks::write_blob_chunks(tx, rev_id, blob, chunk_size)?;
+                    if revision_ids.contains(rev_id.as_str()) {
+                        same_hash.push(rev_id);
+                    }
+                }
+            }
         }
     }
     Ok(())
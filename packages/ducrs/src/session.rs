@@ -14,7 +14,7 @@ use crate::external_file_chunks::{
     self, DEFAULT_EXTERNAL_FILE_CHUNK_SIZE, MAX_EXTERNAL_FILE_CHUNK_SIZE,
     MIN_EXTERNAL_FILE_CHUNK_SIZE,
 };
-use crate::parse::{self, ParseError, ParseResult};
+use crate::parse::{self, DocumentSections, ParseError, ParseResult};
 use crate::serialize::{self, SerializeError, SerializeResult};
 use crate::types::{
     DucExternalFile, ExportedDataState, ExternalFileMeta, ExternalFileRevisionMeta,
@@ -31,15 +31,27 @@ enum DucSessionMode {
     Read,
 }
 
+/// gzip level used when none is given (flate2's default).
+pub const DEFAULT_COMPRESSION_LEVEL: u32 = 6;
+/// Highest gzip level; `0` writes the raw SQLite image without gzip.
+pub const MAX_COMPRESSION_LEVEL: u32 = 9;
+
 #[derive(Debug, Clone)]
 pub struct DucSessionOptions {
     pub chunk_size: usize,
+    /// `0` stores the raw SQLite image (fastest to write, largest);
+    /// `1..=9` gzip it, trading write time for size.
+    pub compression_level: u32,
+    /// SQLite page size of exported databases; `None` keeps SQLite's default.
+    pub page_size: Option<u32>,
 }
 
 impl Default for DucSessionOptions {
     fn default() -> Self {
         Self {
             chunk_size: DEFAULT_EXTERNAL_FILE_CHUNK_SIZE,
+            compression_level: DEFAULT_COMPRESSION_LEVEL,
+            page_size: None,
         }
     }
 }
@@ -47,8 +59,39 @@ impl Default for DucSessionOptions {
 impl DucSessionOptions {
     pub fn with_chunk_size(chunk_size: usize) -> SerializeResult<Self> {
         external_file_chunks::validate_chunk_size(chunk_size)?;
-        Ok(Self { chunk_size })
+        Ok(Self {
+            chunk_size,
+            ..Self::default()
+        })
+    }
+
+    pub fn compression_level(mut self, level: u32) -> SerializeResult<Self> {
+        self.compression_level = validate_compression_level(level)?;
+        Ok(self)
+    }
+
+    pub fn page_size(mut self, page_size: u32) -> SerializeResult<Self> {
+        self.page_size = Some(validate_page_size(page_size)?);
+        Ok(self)
+    }
+}
+
+pub fn validate_compression_level(level: u32) -> SerializeResult<u32> {
+    if level > MAX_COMPRESSION_LEVEL {
+        return Err(SerializeError::InvalidData(format!(
+            "compression level must be between 0 and {MAX_COMPRESSION_LEVEL}, got {level}"
+        )));
     }
+    Ok(level)
+}
+
+pub fn validate_page_size(page_size: u32) -> SerializeResult<u32> {
+    if !(512..=65536).contains(&page_size) || !page_size.is_power_of_two() {
+        return Err(SerializeError::InvalidData(format!(
+            "page size must be a power of two between 512 and 65536 bytes, got {page_size}"
+        )));
+    }
+    Ok(page_size)
 }
 
 #[derive(Debug, Clone, PartialEq, Eq)]
@@ -64,6 +107,7 @@ pub struct DucSession {
     conn: Option<Connection>,
     raw_sqlite_path: PathBuf,
     chunk_size: usize,
+    compression_level: u32,
     mode: DucSessionMode,
 }
 
@@ -74,11 +118,15 @@ impl DucSession {
 
     pub fn create_export_session_with_options(options: DucSessionOptions) -> SerializeResult<Self> {
         external_file_chunks::validate_chunk_size(options.chunk_size)?;
+        validate_compression_level(options.compression_level)?;
+        if let Some(page_size) = options.page_size {
+            validate_page_size(page_size)?;
+        }
         let (path, file) = create_temp_sqlite_file("duc-export").map_err(SerializeError::from)?;
         drop(file);
 
-        let conn = match db::open_file(&path) {
-            Ok(conn) => conn.into_inner(),
+        let conn = match open_export_connection(&path, options.page_size) {
+            Ok(conn) => conn,
             Err(e) => {
                 remove_sqlite_temp_files(&path);
                 return Err(e.into());
@@ -94,6 +142,7 @@ impl DucSession {
             conn: Some(conn),
             raw_sqlite_path: path,
             chunk_size: options.chunk_size,
+            compression_level: options.compression_level,
             mode: DucSessionMode::Export,
         })
     }
@@ -126,6 +175,7 @@ impl DucSession {
             conn: Some(conn),
             raw_sqlite_path: path,
             chunk_size: options.chunk_size,
+            compression_level: options.compression_level,
             mode: DucSessionMode::Read,
         })
     }
@@ -190,10 +240,49 @@ impl DucSession {
             chunk_size,
             Some(revision.size_bytes),
         )?;
+        external_file_chunks::dedupe_revision(&tx, &revision.id)?;
+        tx.commit()?;
+        Ok(written)
+    }
+
+    /// Stream the bytes of a revision whose metadata is already in the
+    /// session (e.g. written by `write_document_state`), replacing any
+    /// existing chunks. The revision's `size_bytes` is set to the number of
+    /// bytes read, so callers need not know the size up front.
+    pub fn write_external_file_revision_data<R: Read>(
+        &mut self,
+        revision_id: &str,
+        reader: &mut R,
+    ) -> SerializeResult<u64> {
+        let chunk_size = self.chunk_size;
+        let conn = self.export_conn_mut()?;
+        let tx = conn.transaction()?;
+        let written =
+            external_file_chunks::write_reader_chunks(&tx, revision_id, reader, chunk_size, None)?;
+        let updated = tx.execute(
+            "UPDATE external_file_revisions SET size_bytes = ?1 WHERE id = ?2",
+            params![written as i64, revision_id],
+        )?;
+        if updated == 0 {
+            return Err(SerializeError::InvalidData(format!(
+                "no external file revision {revision_id} to write data for"
+            )));
+        }
+        external_file_chunks::dedupe_revision(&tx, revision_id)?;
         tx.commit()?;
         Ok(written)
     }
 
+    /// Make external file revisions with identical bytes share one set of
+    /// chunks. Returns `(revisions_deduplicated, bytes_saved)`.
+    pub fn dedupe_external_files(&mut self) -> SerializeResult<(u64, u64)> {
+        let conn = self.export_conn_mut()?;
+        let tx = conn.transaction()?;
+        let result = external_file_chunks::dedupe_revisions(&tx)?;
+        tx.commit()?;
+        Ok(result)
+    }
+
     pub fn write_checkpoint_data<R: Read>(
         &mut self,
         checkpoint_id: &str,
@@ -245,20 +334,28 @@ impl DucSession {
         self.ensure_mode(DucSessionMode::Export)?;
 
         if let Some(conn) = self.conn.take() {
+            // Leave WAL mode so the finished image is self-contained: a raw
+            // (level 0) file then opens read-only without -wal/-shm files.
             conn.execute_batch(
                 "PRAGMA foreign_keys = ON;
                  PRAGMA wal_checkpoint(TRUNCATE);
-                 PRAGMA optimize;",
+                 PRAGMA optimize;
+                 PRAGMA journal_mode = DELETE;",
             )?;
             drop(conn);
         }
 
         let raw = File::open(&self.raw_sqlite_path).map_err(SerializeError::from)?;
         let mut reader = BufReader::with_capacity(self.chunk_size, raw);
-        let mut encoder = GzEncoder::new(writer, Compression::default());
-        copy_with_buffer(&mut reader, &mut encoder, self.chunk_size)
-            .map_err(SerializeError::from)?;
-        encoder.finish().map_err(SerializeError::from)?;
+        if self.compression_level == 0 {
+            // Readers accept the bare SQLite image as well as gzip.
+            copy_with_buffer(&mut reader, writer, self.chunk_size).map_err(SerializeError::from)?;
+        } else {
+            let mut encoder = GzEncoder::new(writer, Compression::new(self.compression_level));
+            copy_with_buffer(&mut reader, &mut encoder, self.chunk_size)
+                .map_err(SerializeError::from)?;
+            encoder.finish().map_err(SerializeError::from)?;
+        }
         remove_sqlite_temp_files(&self.raw_sqlite_path);
         Ok(())
     }
@@ -268,6 +365,15 @@ impl DucSession {
         parse::read_document_state_from_connection(self.conn_ref()?)
     }
 
+    /// Read only the selected top-level sections; unselected tables are never queried.
+    pub fn read_document_sections(
+        &self,
+        sections: &DocumentSections,
+    ) -> ParseResult<ExportedDataState> {
+        self.ensure_read_mode()?;
+        parse::read_document_sections_from_connection(self.conn_ref()?, sections)
+    }
+
     pub fn list_external_files(&self) -> ParseResult<Vec<ExternalFileMeta>> {
         self.ensure_read_mode()?;
         parse::list_external_files_from_connection(self.conn_ref()?)
@@ -309,20 +415,21 @@ impl DucSession {
         ensure_revision_exists(conn, revision_id)?;
 
         if external_file_chunks::table_exists(conn, "external_file_revision_chunks")? {
+            let owner_id = external_file_chunks::content_revision_id(conn, revision_id)?;
             let mut stmt = conn.prepare_cached(
-                "SELECT revision_id, chunk_index, offset_bytes, size_bytes, data
+                "SELECT chunk_index, offset_bytes, size_bytes, data
                  FROM external_file_revision_chunks
                  WHERE revision_id = ?1
                  ORDER BY chunk_index",
             )?;
-            let mut rows = stmt.query(params![revision_id])?;
+            let mut rows = stmt.query(params![owner_id])?;
             while let Some(row) = rows.next()? {
                 on_chunk(ExternalFileChunk {
-                    revision_id: row.get(0)?,
-                    chunk_index: row.get(1)?,
-                    offset_bytes: row.get(2)?,
-                    size_bytes: row.get(3)?,
-                    data: row.get(4)?,
+                    revision_id: revision_id.to_string(),
+                    chunk_index: row.get(0)?,
+                    offset_bytes: row.get(1)?,
+                    size_bytes: row.get(2)?,
+                    data: row.get(3)?,
                 })?;
             }
             return Ok(());
@@ -514,6 +621,17 @@ impl Drop for DucSession {
     }
 }
 
+/// Open and bootstrap an export database, fixing its page size first: SQLite
+/// only honours `page_size` before the first table is created.
+fn open_export_connection(path: &Path, page_size: Option<u32>) -> db::DbResult<Connection> {
+    let conn = Connection::open(path)?;
+    if let Some(page_size) = page_size {
+        conn.pragma_update(None, "page_size", page_size)?;
+    }
+    db::bootstrap::bootstrap(&conn)?;
+    Ok(conn)
+}
+
 fn create_temp_sqlite_file(prefix: &str) -> io::Result<(PathBuf, File)> {
     let temp_dir = std::env::temp_dir();
     for _ in 0..100 {
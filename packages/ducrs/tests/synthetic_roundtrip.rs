@@ -179,3 +179,260 @@ fn session_export_streams_version_graph_payload_chunks() {
     assert!(parsed_graph.deltas[0].payload.is_empty());
     let _ = fs::remove_file(path);
 }
+
+#[test]
+fn session_export_honours_compression_level_and_page_size() {
+    let state = common::synthetic_roundtrip_state();
+    let export = |options: DucSessionOptions| {
+        let mut session =
+            DucSession::create_export_session_with_options(options).expect("create export session");
+        session
+            .write_document_state(&state)
+            .expect("write document state");
+        let mut out = Vec::new();
+        session.finish_to_writer(&mut out).expect("finish export");
+        out
+    };
+
+    let raw = export(
+        DucSessionOptions::default()
+            .compression_level(0)
+            .and_then(|options| options.page_size(16384))
+            .expect("valid options"),
+    );
+    assert!(raw.starts_with(b"SQLite format 3\0"));
+    assert_eq!(u16::from_be_bytes([raw[16], raw[17]]), 16384);
+    // Rollback-journal header: the raw image needs no -wal/-shm companions.
+    assert_eq!(&raw[18..20], &[1, 1]);
+
+    let fast = export(
+        DucSessionOptions::default()
+            .compression_level(1)
+            .expect("level"),
+    );
+    let small = export(
+        DucSessionOptions::default()
+            .compression_level(9)
+            .expect("level"),
+    );
+    assert_eq!(&fast[..2], &[0x1f, 0x8b]);
+    assert!(small.len() <= fast.len());
+
+    for bytes in [&raw, &fast, &small] {
+        let session = DucSession::open_reader(bytes.as_slice()).expect("open export");
+        session.read_document_state().expect("read document state");
+    }
+
+    assert!(DucSessionOptions::default().compression_level(10).is_err());
+    assert!(DucSessionOptions::default().page_size(1000).is_err());
+}
+
+/// Export the synthetic state with "file-model-rev-1" holding the same bytes
+/// as "file-image-rev-1", uncompressed so the raw SQLite can be inspected.
+fn export_with_shared_content(label: &str) -> (std::path::PathBuf, Vec<u8>) {
+    let mut state = common::synthetic_roundtrip_state();
+    let shared = vec![1u8, 2, 3, 4];
+    state
+        .external_files_data
+        .as_mut()
+        .expect("synthetic files data")
+        .insert(
+            "file-model-rev-1".to_string(),
+            serde_bytes::ByteBuf::from(shared.clone()),
+        );
+
+    let options = DucSessionOptions::default()
+        .compression_level(0)
+        .expect("valid level");
+    let mut export_session =
+        DucSession::create_export_session_with_options(options).expect("create export session");
+    export_session
+        .write_document_state(&state)
+        .expect("write document state");
+    (finish_session_to_temp_path(export_session, label), shared)
+}
+
+fn chunk_owners(conn: &rusqlite::Connection) -> Vec<String> {
+    let mut stmt = conn
+        .prepare("SELECT DISTINCT revision_id FROM external_file_revision_chunks ORDER BY 1")
+        .expect("prepare chunk owners");
+    let owners = stmt
+        .query_map([], |row| row.get(0))
+        .expect("query chunk owners")
+        .collect::<Result<Vec<String>, _>>()
+        .expect("read chunk owners");
+    owners
+}
+
+fn stream_revision(path: &std::path::Path, revision_id: &str) -> Vec<u8> {
+    let read_session = DucSession::open_path(path).expect("open read session");
+    let mut streamed = Vec::new();
+    read_session
+        .stream_external_file_revision_to_writer(revision_id, &mut streamed)
+        .expect("stream revision");
+    streamed
+}
+
+#[test]
+fn session_export_stores_identical_external_files_once() {
+    let (path, shared) = export_with_shared_content("dedupe");
+
+    let conn = rusqlite::Connection::open(&path).expect("open raw export");
+    assert_eq!(
+        chunk_owners(&conn),
+        vec![
+            "file-image-rev-1".to_string(),
+            "file-image-rev-2".to_string()
+        ]
+    );
+    drop(conn);
+
+    for revision_id in ["file-image-rev-1", "file-model-rev-1"] {
+        assert_eq!(stream_revision(&path, revision_id), shared);
+    }
+    let _ = fs::remove_file(path);
+}
+
+#[test]
+fn deleting_the_content_revision_hands_its_chunks_on() {
+    let (path, shared) = export_with_shared_content("dedupe-delete-owner");
+
+    let conn = rusqlite::Connection::open(&path).expect("open raw export");
+    conn.execute_batch("PRAGMA foreign_keys = ON")
+        .expect("enable foreign keys");
+    let content_owner: Option<String> = conn
+        .query_row(
+            "SELECT content_revision_id FROM external_file_revisions WHERE id = 'file-model-rev-1'",
+            [],
+            |row| row.get(0),
+        )
+        .expect("read content link");
+    assert_eq!(content_owner.as_deref(), Some("file-image-rev-1"));
+
+    conn.execute(
+        "DELETE FROM external_file_revisions WHERE id = 'file-image-rev-1'",
+        [],
+    )
+    .expect("delete content revision");
+    let content_owner: Option<String> = conn
+        .query_row(
+            "SELECT content_revision_id FROM external_file_revisions WHERE id = 'file-model-rev-1'",
+            [],
+            |row| row.get(0),
+        )
+        .expect("read content link");
+    assert_eq!(content_owner, None);
+    assert_eq!(
+        chunk_owners(&conn),
+        vec![
+            "file-image-rev-2".to_string(),
+            "file-model-rev-1".to_string()
+        ]
+    );
+    drop(conn);
+
+    assert_eq!(stream_revision(&path, "file-model-rev-1"), shared);
+    let _ = fs::remove_file(path);
+}
+
+#[test]
+fn deleting_a_linked_revision_keeps_the_shared_chunks() {
+    let (path, shared) = export_with_shared_content("dedupe-delete-link");
+
+    let conn = rusqlite::Connection::open(&path).expect("open raw export");
+    conn.execute_batch("PRAGMA foreign_keys = ON")
+        .expect("enable foreign keys");
+    // Cascades to "file-model-rev-1", which only links to the image's chunks.
+    conn.execute("DELETE FROM external_files WHERE id = 'file-model'", [])
+        .expect("delete linked file");
+    let remaining: i64 = conn
+        .query_row(
+            "SELECT count(*) FROM external_file_revisions WHERE file_id = 'file-model'",
+            [],
+            |row| row.get(0),
+        )
+        .expect("count linked revisions");
+    assert_eq!(remaining, 0);
+    assert_eq!(
+        chunk_owners(&conn),
+        vec![
+            "file-image-rev-1".to_string(),
+            "file-image-rev-2".to_string()
+        ]
+    );
+    drop(conn);
+
+    assert_eq!(stream_revision(&path, "file-image-rev-1"), shared);
+    let _ = fs::remove_file(path);
+}
+
+/// Hands out at most `step` bytes per `read`, like a pipe or a Python stream.
+struct TrickleReader<'a> {
+    data: &'a [u8],
+    step: usize,
+}
+
+impl std::io::Read for TrickleReader<'_> {
+    fn read(&mut self, buf: &mut [u8]) -> std::io::Result<usize> {
+        let n = self.step.min(buf.len()).min(self.data.len());
+        buf[..n].copy_from_slice(&self.data[..n]);
+        self.data = &self.data[n..];
+        Ok(n)
+    }
+}
+
+#[test]
+fn streamed_revision_data_fills_chunks_and_records_real_size() {
+    let mut state = common::synthetic_roundtrip_state();
+    let revision_id = "file-model-rev-1";
+    // The metadata still carries the size of the in-memory blob it replaces.
+    state
+        .external_files_data
+        .as_mut()
+        .expect("synthetic files data")
+        .remove(revision_id);
+    let file_bytes: Vec<u8> = (0..(MIN_EXTERNAL_FILE_CHUNK_SIZE + 5))
+        .map(|i| (i % 241) as u8)
+        .collect();
+
+    let options = DucSessionOptions::with_chunk_size(MIN_EXTERNAL_FILE_CHUNK_SIZE)
+        .and_then(|options| options.compression_level(0))
+        .expect("valid options");
+    let mut export_session =
+        DucSession::create_export_session_with_options(options).expect("create export session");
+    export_session
+        .write_document_state(&state)
+        .expect("write document state");
+    let mut reader = TrickleReader {
+        data: &file_bytes,
+        step: 4096,
+    };
+    let written = export_session
+        .write_external_file_revision_data(revision_id, &mut reader)
+        .expect("stream revision data");
+    assert_eq!(written, file_bytes.len() as u64);
+    let path = finish_session_to_temp_path(export_session, "trickle");
+
+    let conn = rusqlite::Connection::open(&path).expect("open raw export");
+    let size_bytes: i64 = conn
+        .query_row(
+            "SELECT size_bytes FROM external_file_revisions WHERE id = ?1",
+            [revision_id],
+            |row| row.get(0),
+        )
+        .expect("read revision size");
+    assert_eq!(size_bytes, file_bytes.len() as i64);
+    drop(conn);
+
+    let read_session = DucSession::open_path(&path).expect("open read session");
+    let mut chunk_sizes = Vec::new();
+    read_session
+        .for_each_external_file_revision_chunk(revision_id, |chunk| {
+            chunk_sizes.push(chunk.data.len());
+            Ok(())
+        })
+        .expect("iterate chunks");
+    assert_eq!(chunk_sizes, vec![MIN_EXTERNAL_FILE_CHUNK_SIZE, 5]);
+    assert_eq!(stream_revision(&path, revision_id), file_bytes);
+    let _ = fs::remove_file(path);
+}
@@ -1,7 +1,7 @@
 -- "DUC_" in ASCII
 -- Apply in order: duc.sql → version_control.sql → search.sql
 PRAGMA application_id = 1146569567;
-PRAGMA user_version = 4000000;
+PRAGMA user_version = 4000001;
 PRAGMA journal_mode = WAL;
 PRAGMA foreign_keys = ON;
 PRAGMA synchronous = NORMAL;
@@ -990,10 +990,33 @@ CREATE TABLE external_file_revisions (
     mime_type       TEXT    NOT NULL,
     message         TEXT,                      -- optional note describing this revision
     created         INTEGER NOT NULL,          -- epoch ms
-    last_retrieved  INTEGER                    -- epoch ms; NULL if never loaded onto scene
+    last_retrieved  INTEGER,                   -- epoch ms; NULL if never loaded onto scene
+    content_revision_id TEXT                   -- identical content is stored under this revision; NULL = own chunks
 ) WITHOUT ROWID;
 
 CREATE INDEX idx_external_file_revisions_file ON external_file_revisions(file_id);
+CREATE INDEX idx_external_file_revisions_content ON external_file_revisions(content_revision_id)
+    WHERE content_revision_id IS NOT NULL;
+
+-- Deduplicated revisions share the chunks of their content revision. Before
+-- that revision goes away, hand its chunks to the first revision sharing them.
+CREATE TRIGGER external_file_revisions_rehome_content
+BEFORE DELETE ON external_file_revisions
+WHEN EXISTS (SELECT 1 FROM external_file_revisions WHERE content_revision_id = OLD.id)
+BEGIN
+    UPDATE external_file_revision_chunks
+    SET revision_id = (SELECT id FROM external_file_revisions
+                       WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1)
+    WHERE revision_id = OLD.id;
+    UPDATE external_file_revisions
+    SET content_revision_id = (SELECT id FROM external_file_revisions
+                               WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1)
+    WHERE content_revision_id = OLD.id
+      AND id <> (SELECT id FROM external_file_revisions
+                 WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1);
+    UPDATE external_file_revisions SET content_revision_id = NULL
+    WHERE content_revision_id = OLD.id;
+END;
 
 -- Actual binary content for each revision, separated from metadata
 -- and chunked so large files can be streamed without loading one BLOB.
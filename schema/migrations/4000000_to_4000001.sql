@@ -0,0 +1,30 @@
+-- Migration: 4000000 -> 4000001
+-- Let external file revisions with identical content share one set of chunks.
+
+BEGIN IMMEDIATE;
+
+ALTER TABLE external_file_revisions ADD COLUMN content_revision_id TEXT;
+
+CREATE INDEX idx_external_file_revisions_content ON external_file_revisions(content_revision_id)
+    WHERE content_revision_id IS NOT NULL;
+
+CREATE TRIGGER external_file_revisions_rehome_content
+BEFORE DELETE ON external_file_revisions
+WHEN EXISTS (SELECT 1 FROM external_file_revisions WHERE content_revision_id = OLD.id)
+BEGIN
+    UPDATE external_file_revision_chunks
+    SET revision_id = (SELECT id FROM external_file_revisions
+                       WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1)
+    WHERE revision_id = OLD.id;
+    UPDATE external_file_revisions
+    SET content_revision_id = (SELECT id FROM external_file_revisions
+                               WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1)
+    WHERE content_revision_id = OLD.id
+      AND id <> (SELECT id FROM external_file_revisions
+                 WHERE content_revision_id = OLD.id ORDER BY id LIMIT 1);
+    UPDATE external_file_revisions SET content_revision_id = NULL
+    WHERE content_revision_id = OLD.id;
+END;
+
+PRAGMA user_version = 4000001;
+COMMIT;